@@ -0,0 +1,645 @@
+"""
+In-process stand-in for the parts of the Word object model main.py drives
+(Application, Documents, Sections, PageSetup, Borders, Headers/Footers,
+Styles, OrganizerCopy), so the COM code paths run on machines without Word.
+
+Documents are loaded from the real .docx: page setup, page borders,
+header/footer text and style names come from the package. Edits live in
+memory only; Save/SaveAs2/SaveAs copy the file as it was opened, so the
+OpenXML stages still see a valid package.
+
+Every COM member access (PascalCase names) is metered as one round trip:
+property gets, property sets and method calls are counted per member and
+charged a configurable latency, either slept for real or only added to the
+simulated time.
+
+    word = FakeWord(latency=0.0005)
+    with WordPool(factory=lambda: word) as pool:
+        transfer_layout(src, tgt, out, pool=pool)
+    print(word.stats())
+
+    python fake_word.py template.docx report.docx --latency 0.0005
+"""
+import argparse
+import collections
+import inspect
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import main
+from main import W_NS, DocxPackage
+
+# Word constants used below
+WD_ORIENT_PORTRAIT, WD_ORIENT_LANDSCAPE = 0, 1
+WD_SECTION_DIRECTION_RTL, WD_SECTION_DIRECTION_LTR = 0, 1
+WD_GUTTER_POS_LEFT, WD_GUTTER_POS_TOP, WD_GUTTER_POS_RIGHT = 0, 1, 2
+WD_HEADER_FOOTER_PRIMARY, WD_HEADER_FOOTER_FIRST, WD_HEADER_FOOTER_EVEN = 1, 2, 3
+WD_COLOR_AUTOMATIC = -16777216
+WD_ORGANIZER_OBJECT_STYLES = 3
+HF_TYPE_NAMES = {WD_HEADER_FOOTER_PRIMARY: "default", WD_HEADER_FOOTER_FIRST: "first", WD_HEADER_FOOTER_EVEN: "even"}
+BORDER_SIDES = {1: "top", 2: "left", 3: "bottom", 4: "right"}  # wdBorderTop/Left/Bottom/Right
+LINE_STYLES = {"none": 0, "nil": 0, "single": 1, "dotted": 2, "dashSmallGap": 3, "dashed": 4,
+               "dotDash": 5, "dotDotDash": 6, "double": 7, "triple": 8}
+TRUE = -1  # Word reports booleans as -1/0
+
+# HRESULTs of the failures the stand-in reproduces
+DISP_E_MEMBERNOTFOUND = -2147352573
+DISP_E_EXCEPTION = -2147352567
+
+class FakeComError(Exception):
+    """Shaped like pywintypes.com_error: (hresult, strerror, excepinfo, argerror)."""
+
+    def __init__(self, message, hresult=DISP_E_EXCEPTION):
+        super().__init__(hresult, message, (0, "Microsoft Word", message, None, 0, 0), None)
+        self.hresult = hresult
+        self.strerror = message
+
+# ---------- round-trip meter ----------
+class Meter:
+    """
+    Counts and prices round trips. latency is seconds per round trip, or a
+    dict of {member name: seconds} with an optional "default" entry.
+    """
+
+    def __init__(self, latency=0.0, sleep=False):
+        self.latency = latency
+        self.sleep = sleep
+        self.reset()
+
+    def reset(self):
+        self.counts = collections.Counter()      # "get"/"set"/"call" -> n
+        self.members = collections.Counter()     # "kind Member" -> n
+        self.simulated_seconds = 0.0
+
+    def cost(self, name):
+        if isinstance(self.latency, dict):
+            return self.latency.get(name, self.latency.get("default", 0.0))
+        return self.latency
+
+    def charge(self, kind, name):
+        self.counts[kind] += 1
+        self.members[f"{kind} {name}"] += 1
+        cost = self.cost(name)
+        self.simulated_seconds += cost
+        if self.sleep and cost:
+            time.sleep(cost)
+
+    def stats(self):
+        return {
+            "round_trips": sum(self.counts.values()),
+            "gets": self.counts["get"],
+            "sets": self.counts["set"],
+            "calls": self.counts["call"],
+            "simulated_seconds": round(self.simulated_seconds, 6),
+            "by_member": dict(self.members.most_common()),
+        }
+
+def _is_member(name):
+    return name[:1].isupper()
+
+class _ComObject:
+    """Base for fake automation objects: PascalCase attributes are metered COM members."""
+    _readonly = frozenset()
+
+    def __init__(self, meter):
+        object.__setattr__(self, "_meter", meter)
+
+    def __getattribute__(self, name):
+        if not _is_member(name):
+            return object.__getattribute__(self, name)
+        meter = object.__getattribute__(self, "_meter")
+        try:
+            value = object.__getattribute__(self, name)
+        except AttributeError:
+            meter.charge("get", name)  # unknown members still cost the round trip that fails
+            raise
+        if inspect.ismethod(value):
+            def invoke(*args, **kwargs):
+                meter.charge("call", name)
+                return value(*args, **kwargs)
+            return invoke
+        meter.charge("get", name)
+        return value
+
+    def __setattr__(self, name, value):
+        if _is_member(name):
+            self._meter.charge("set", name)
+            if name in self._readonly:
+                raise FakeComError(f"{name} is read-only")
+            if not hasattr(type(self), name) and name not in self.__dict__:
+                raise AttributeError(f"<unknown>.{name}")
+        object.__setattr__(self, name, value)
+
+class _Collection(_ComObject):
+    """1-based COM collection; calling it is Item(), iterating it enumerates."""
+
+    def __init__(self, meter, items):
+        super().__init__(meter)
+        self._items = items
+
+    @property
+    def Count(self):
+        return len(self._items)
+
+    def Item(self, index):
+        if not 1 <= index <= len(self._items):
+            raise FakeComError("The requested member of the collection does not exist.")
+        return self._items[index - 1]
+
+    def __call__(self, index):
+        return self.Item(index)
+
+    def __iter__(self):
+        for item in list(self._items):
+            self._meter.charge("call", "_NewEnum.Next")
+            yield item
+
+    def __len__(self):
+        return len(self._items)
+
+# ---------- Page setup / borders ----------
+def _twips_to_points(value, default=0.0):
+    try:
+        return int(value) / 20.0
+    except (TypeError, ValueError):
+        return default
+
+class _DocumentWide:
+    """Page setup flags that Word applies to the whole document whichever section sets them."""
+
+    def __init__(self, settings):
+        def flag(tag):
+            return TRUE if settings is not None and settings.find(f"{W_NS}{tag}") is not None else 0
+        self.odd_and_even = flag("evenAndOddHeaders")
+        self.mirror_margins = flag("mirrorMargins")
+        self.two_pages_on_one = flag("printTwoOnOne")
+        self.gutter_at_top = flag("gutterAtTop")
+
+def _child(el, tag):
+    return el.find(f"{W_NS}{tag}") if el is not None else None
+
+class PageSetup(_ComObject):
+
+    def __init__(self, meter, sectpr, doc_wide):
+        super().__init__(meter)
+        pg_sz = sectpr.find(f"{W_NS}pgSz") if sectpr is not None else None
+        pg_mar = sectpr.find(f"{W_NS}pgMar") if sectpr is not None else None
+        attr = lambda el, name: el.get(f"{W_NS}{name}") if el is not None else None
+        self.__dict__.update(
+            _doc_wide=doc_wide,
+            _orientation=WD_ORIENT_LANDSCAPE if attr(pg_sz, "orient") == "landscape" else WD_ORIENT_PORTRAIT,
+            PageWidth=_twips_to_points(attr(pg_sz, "w"), 612.0),
+            PageHeight=_twips_to_points(attr(pg_sz, "h"), 792.0),
+            TopMargin=_twips_to_points(attr(pg_mar, "top"), 72.0),
+            BottomMargin=_twips_to_points(attr(pg_mar, "bottom"), 72.0),
+            LeftMargin=_twips_to_points(attr(pg_mar, "left"), 90.0),
+            RightMargin=_twips_to_points(attr(pg_mar, "right"), 90.0),
+            Gutter=_twips_to_points(attr(pg_mar, "gutter")),
+            HeaderDistance=_twips_to_points(attr(pg_mar, "header"), 36.0),
+            FooterDistance=_twips_to_points(attr(pg_mar, "footer"), 36.0),
+            DifferentFirstPageHeaderFooter=TRUE if sectpr is not None and sectpr.find(f"{W_NS}titlePg") is not None else 0,
+            SectionDirection=WD_SECTION_DIRECTION_RTL if main._on(_child(sectpr, "bidi")) else WD_SECTION_DIRECTION_LTR,
+            _rtl_gutter=main._on(_child(sectpr, "rtlGutter")),
+        )
+
+    # Changing the orientation swaps the page dimensions, as in Word
+    @property
+    def Orientation(self):
+        return self._orientation
+
+    @Orientation.setter
+    def Orientation(self, value):
+        if value != self._orientation:
+            d = self.__dict__
+            d["PageWidth"], d["PageHeight"] = d["PageHeight"], d["PageWidth"]
+        self._orientation = value
+
+    @property
+    def OddAndEvenPagesHeaderFooter(self):
+        return self._doc_wide.odd_and_even
+
+    @OddAndEvenPagesHeaderFooter.setter
+    def OddAndEvenPagesHeaderFooter(self, value):
+        self._doc_wide.odd_and_even = TRUE if value else 0
+
+    @property
+    def MirrorMargins(self):
+        return self._doc_wide.mirror_margins
+
+    @MirrorMargins.setter
+    def MirrorMargins(self, value):
+        self._doc_wide.mirror_margins = TRUE if value else 0
+
+    # Top is document-wide (gutterAtTop); left/right is per section (rtlGutter)
+    @property
+    def GutterPos(self):
+        if self._doc_wide.gutter_at_top:
+            return WD_GUTTER_POS_TOP
+        return WD_GUTTER_POS_RIGHT if self._rtl_gutter else WD_GUTTER_POS_LEFT
+
+    @GutterPos.setter
+    def GutterPos(self, value):
+        self._doc_wide.gutter_at_top = TRUE if value == WD_GUTTER_POS_TOP else 0
+        if value != WD_GUTTER_POS_TOP:
+            self._rtl_gutter = value == WD_GUTTER_POS_RIGHT
+
+    @property
+    def TwoPagesOnOne(self):
+        return self._doc_wide.two_pages_on_one
+
+    @TwoPagesOnOne.setter
+    def TwoPagesOnOne(self, value):
+        self._doc_wide.two_pages_on_one = TRUE if value else 0
+
+class Border(_ComObject):
+
+    def __init__(self, meter, el):
+        super().__init__(meter)
+        val = el.get(f"{W_NS}val", "none") if el is not None else "none"
+        color = el.get(f"{W_NS}color", "auto") if el is not None else "auto"
+        if color == "auto" or len(color) != 6:
+            color_value = WD_COLOR_AUTOMATIC
+        else:
+            r, g, b = (int(color[i:i + 2], 16) for i in (0, 2, 4))
+            color_value = r + (g << 8) + (b << 16)
+        self.__dict__.update(
+            LineStyle=LINE_STYLES.get(val, 1),
+            LineWidth=int(el.get(f"{W_NS}sz", "4")) if el is not None else 4,
+            Color=color_value,
+        )
+
+def _border_space(pg_borders, side):
+    el = pg_borders.find(f"{W_NS}{side}") if pg_borders is not None else None
+    return float(el.get(f"{W_NS}space", "0")) if el is not None else 0.0
+
+class Borders(_ComObject):
+
+    def __init__(self, meter, pg_borders):
+        super().__init__(meter)
+        sides = {idx: Border(meter, pg_borders.find(f"{W_NS}{side}") if pg_borders is not None else None)
+                 for idx, side in BORDER_SIDES.items()}
+        get = lambda name: pg_borders.get(f"{W_NS}{name}") if pg_borders is not None else None
+        art = pg_borders is not None and any(el.get(f"{W_NS}val", "none") not in LINE_STYLES for el in pg_borders)
+        self.__dict__.update(
+            _sides=sides,
+            Enable=TRUE if any(b.__dict__["LineStyle"] for b in sides.values()) else 0,
+            DistanceFrom=1 if get("offsetFrom") == "page" else 0,
+            SurroundHeader=0 if get("display") == "notFirstPage" else TRUE,
+            SurroundFooter=TRUE,
+            JoinBorders=0,
+            AlwaysInFront=0 if get("zOrder") == "back" else TRUE,
+            ArtStyle=1 if art else 0,
+            ArtWidth=sides[1].__dict__["LineWidth"],
+            DistanceFromTop=_border_space(pg_borders, "top"),
+            DistanceFromLeft=_border_space(pg_borders, "left"),
+            DistanceFromBottom=_border_space(pg_borders, "bottom"),
+            DistanceFromRight=_border_space(pg_borders, "right"),
+        )
+
+    def Item(self, index):
+        return self._sides[index]
+
+    def __call__(self, index):
+        self._meter.charge("call", "Item")
+        return self._sides[index]
+
+# ---------- Headers / footers ----------
+class _Story:
+    def __init__(self, text=""):
+        self.text = text
+
+class Range(_ComObject):
+
+    def __init__(self, meter, story):
+        super().__init__(meter)
+        self._story = story
+
+    @property
+    def Text(self):
+        return self._story.text
+
+    @Text.setter
+    def Text(self, value):
+        self._story.text = value
+
+    @property
+    def FormattedText(self):
+        return Range(self._meter, _Story(self._story.text))
+
+    @FormattedText.setter
+    def FormattedText(self, value):
+        self._story.text = value._story.text
+
+    def Delete(self):
+        self._story.text = ""
+
+class HeaderFooter(_ComObject):
+    _readonly = frozenset({"Exists", "Index"})
+
+    def __init__(self, meter, section, kind, index):
+        super().__init__(meter)
+        self._section = section
+        self._kind = kind          # "header" / "footer"
+        self.__dict__["Index"] = index
+
+    def _story(self):
+        return self._section._stories[(self._kind, self.__dict__["Index"])]
+
+    @property
+    def Range(self):
+        return Range(self._meter, self._story())
+
+    @property
+    def Exists(self):
+        index, setup = self.__dict__["Index"], self._section._page_setup
+        if index == WD_HEADER_FOOTER_FIRST:
+            return TRUE if setup.__dict__["DifferentFirstPageHeaderFooter"] else 0
+        if index == WD_HEADER_FOOTER_EVEN:
+            return setup._doc_wide.odd_and_even
+        return TRUE
+
+    @property
+    def LinkToPrevious(self):
+        key = (self._kind, self.__dict__["Index"])
+        prev = self._section._previous()
+        return TRUE if prev is not None and prev._stories[key] is self._section._stories[key] else 0
+
+    @LinkToPrevious.setter
+    def LinkToPrevious(self, value):
+        key = (self._kind, self.__dict__["Index"])
+        prev = self._section._previous()
+        if prev is None:
+            return
+        if value:
+            self._section._stories[key] = prev._stories[key]
+        elif prev._stories[key] is self._section._stories[key]:
+            self._section._stories[key] = _Story(prev._stories[key].text)
+
+class Section(_ComObject):
+    _readonly = frozenset({"PageSetup", "Borders", "Index"})
+
+    def __init__(self, meter, document, index, sectpr, doc_wide, stories):
+        super().__init__(meter)
+        self._document = document
+        self._stories = stories
+        self.__dict__.update(
+            Index=index,
+            PageSetup=PageSetup(meter, sectpr, doc_wide),
+            Borders=Borders(meter, sectpr.find(f"{W_NS}pgBorders") if sectpr is not None else None),
+        )
+        self.__dict__["_page_setup"] = self.__dict__["PageSetup"]
+
+    def _previous(self):
+        index = self.__dict__["Index"]
+        return self._document._sections[index - 2] if index > 1 else None
+
+    def Headers(self, index):
+        return HeaderFooter(self._meter, self, "header", index)
+
+    def Footers(self, index):
+        return HeaderFooter(self._meter, self, "footer", index)
+
+# ---------- Styles / documents ----------
+STYLE_TYPES = {"paragraph": 1, "character": 2, "table": 3, "numbering": 4}
+
+class Style(_ComObject):
+    _readonly = frozenset({"Type", "BuiltIn"})
+
+    def __init__(self, meter, name, style_type=1, builtin=False, in_use=True):
+        super().__init__(meter)
+        self.__dict__.update(NameLocal=name, Name=name, Type=style_type,
+                             BuiltIn=TRUE if builtin else 0, InUse=TRUE if in_use else 0)
+
+def _read_styles(pkg, meter, local_names=None):
+    """The styles defined in styles.xml; local_names maps a w:name to the NameLocal Word shows for it."""
+    if main.STYLES_PART not in pkg:
+        return []
+    styles = []
+    for st in pkg.xml(main.STYLES_PART).findall(f"{W_NS}style"):
+        name_el = st.find(f"{W_NS}name")
+        name = name_el.get(f"{W_NS}val") if name_el is not None else st.get(f"{W_NS}styleId")
+        if name:
+            styles.append(Style(meter, (local_names or {}).get(name, name),
+                                STYLE_TYPES.get(st.get(f"{W_NS}type", "paragraph"), 1),
+                                builtin=st.get(f"{W_NS}customStyle") not in ("1", "true")))
+    return styles
+
+class Styles(_Collection):
+    """Styles collection: Item() also takes a style name, as Word's does."""
+
+    def Item(self, index):
+        if isinstance(index, str):
+            style = next((st for st in self._items if st.__dict__["NameLocal"].lower() == index.lower()), None)
+            if style is None:
+                raise FakeComError("The requested member of the collection does not exist.")
+            return style
+        return super().Item(index)
+
+def _story_text(pkg, part):
+    if part is None or part not in pkg:
+        return ""
+    return "\r".join("".join(t.text or "" for t in p.iter(f"{W_NS}t"))
+                     for p in pkg.xml(part).iter(f"{W_NS}p"))
+
+class Document(_ComObject):
+    _readonly = frozenset({"FullName", "Name", "Path", "ReadOnly", "Sections", "Styles", "Application"})
+
+    def __init__(self, meter, app, path, read_only):
+        super().__init__(meter)
+        path = os.path.abspath(path)
+        with DocxPackage(path) as pkg:
+            sectprs = pkg.section_properties() or [None]
+            settings = pkg.xml(main.SETTINGS_PART) if main.SETTINGS_PART in pkg else None
+            doc_wide = _DocumentWide(settings)
+            targets = pkg.related_parts(main.DOCUMENT_PART)
+            refs = main._effective_hf_references([s for s in sectprs if s is not None], targets) or [{}]
+            # Sections showing the same part share one story, i.e. are linked to previous
+            texts = {}
+            sections = []
+            for i, sectpr in enumerate(sectprs, 1):
+                stories = {}
+                for kind in ("header", "footer"):
+                    tag = f"{W_NS}{kind}Reference"
+                    for index, type_name in HF_TYPE_NAMES.items():
+                        part = refs[min(i, len(refs)) - 1].get((tag, type_name))
+                        key = part or (kind, index)
+                        if key not in texts:
+                            texts[key] = _Story(_story_text(pkg, part))
+                        stories[(kind, index)] = texts[key]
+                sections.append(Section(meter, self, i, sectpr, doc_wide, stories))
+            styles = _read_styles(pkg, meter, app._local_names)
+        # Built-in styles that styles.xml does not define are listed too, unused
+        styles += [Style(meter, name, builtin=True, in_use=False) for name in app._latent_styles
+                   if name not in {st.__dict__["NameLocal"] for st in styles}]
+        self.__dict__.update(
+            _sections=sections,
+            _source=path,
+            FullName=path,
+            Name=os.path.basename(path),
+            Path=os.path.dirname(path),
+            ReadOnly=TRUE if read_only else 0,
+            Application=app,
+            Sections=_Collection(meter, sections),
+            Styles=Styles(meter, styles),
+        )
+
+    def _style(self, name):
+        return next((st for st in self.__dict__["Styles"]._items if st.__dict__["NameLocal"] == name), None)
+
+    def _add_style(self, style):
+        if self._style(style.__dict__["NameLocal"]) is None:
+            d = style.__dict__
+            self.__dict__["Styles"]._items.append(
+                Style(self._meter, d["NameLocal"], d["Type"], d["BuiltIn"] == TRUE, d["InUse"] == TRUE))
+
+    def _copy_file(self, path):
+        path = os.path.abspath(path)
+        dir_ = os.path.dirname(path)
+        if not os.path.isdir(dir_):
+            raise FakeComError(f"Word cannot save to {dir_}: the folder does not exist.")
+        if os.path.normcase(path) != os.path.normcase(self._source):
+            shutil.copyfile(self._source, path)
+
+    def Save(self):
+        if self.__dict__["ReadOnly"]:
+            raise FakeComError("This document is read-only.")
+
+    def _save_as(self, FileName):
+        self._copy_file(FileName)
+        path = os.path.abspath(FileName)
+        self.__dict__.update(_source=path, FullName=path, Name=os.path.basename(path),
+                             Path=os.path.dirname(path), ReadOnly=0)
+
+    def SaveAs2(self, FileName, FileFormat=12, AddToRecentFiles=True, **kwargs):
+        self._save_as(FileName)
+
+    def SaveAs(self, FileName, FileFormat=12, AddToRecentFiles=True, **kwargs):
+        self._save_as(FileName)
+
+    def CopyStylesFromTemplate(self, Template):
+        if not os.path.isfile(Template):
+            raise FakeComError(f"Template not found: {Template}")
+        with DocxPackage(Template) as pkg:
+            for style in _read_styles(pkg, self._meter, self.__dict__["Application"]._local_names):
+                self._add_style(style)
+
+    def Close(self, SaveChanges=0, **kwargs):
+        self.__dict__["Application"]._documents._items.remove(self)
+
+class Documents(_Collection):
+
+    def __init__(self, meter, app):
+        super().__init__(meter, [])
+        self._app = app
+
+    def Open(self, FileName, ReadOnly=False, **kwargs):
+        if not os.path.isfile(FileName):
+            raise FakeComError(f"Sorry, we couldn't find your file: {FileName}")
+        doc = Document(self._meter, self._app, FileName, ReadOnly)
+        self._items.append(doc)
+        return doc
+
+class FakeWord(_ComObject):
+    """
+    Word.Application stand-in. latency/sleep: see Meter.
+    local_names: {w:name: NameLocal} for styles Word shows under another name
+    (a localized Word, or "Table Normal" for "Normal Table").
+    latent_styles: names of built-in styles Word lists in every document
+    although styles.xml does not define them.
+    """
+    _readonly = frozenset({"Documents", "Version", "Name"})
+
+    def __init__(self, latency=0.0, sleep=False, version="16.0", local_names=None, latent_styles=()):
+        meter = Meter(latency, sleep)
+        super().__init__(meter)
+        self.__dict__.update(
+            _local_names=dict(local_names or {}),
+            _latent_styles=tuple(latent_styles),
+            _documents=Documents(meter, self),
+            Version=version,
+            Name="Microsoft Word",
+            Visible=False,
+            DisplayAlerts=0,
+            ScreenUpdating=True,
+            EnableEvents=True,
+        )
+        self.__dict__["Documents"] = self.__dict__["_documents"]
+        self.quit_called = False
+
+    @property
+    def meter(self):
+        return self._meter
+
+    def stats(self):
+        return self._meter.stats()
+
+    def _open_document(self, path):
+        key = os.path.normcase(os.path.abspath(path))
+        return next((d for d in self._documents._items if os.path.normcase(d.__dict__["FullName"]) == key), None)
+
+    def OrganizerCopy(self, Source, Destination, Name, Object):
+        if Object != WD_ORGANIZER_OBJECT_STYLES:
+            raise FakeComError("Only styles are supported by the stand-in Organizer.")
+        src = self._open_document(Source)
+        if src is None:
+            if not os.path.isfile(Source):
+                raise FakeComError(f"Organizer source not found: {Source}")
+            with DocxPackage(Source) as pkg:
+                styles = {st.__dict__["NameLocal"]: st
+                          for st in _read_styles(pkg, self._meter, self._local_names)}
+            style = styles.get(Name)
+        else:
+            style = src._style(Name)
+        if style is None:
+            raise FakeComError(f"The style {Name!r} does not exist in {Source}.")
+        dst = self._open_document(Destination)
+        if dst is not None:
+            dst._add_style(style)
+        elif not os.path.isfile(Destination):
+            raise FakeComError(f"Organizer destination not found: {Destination}")
+
+    def Quit(self, SaveChanges=0, **kwargs):
+        self._documents._items.clear()
+        self.quit_called = True
+
+# ---------- benchmark entry ----------
+def benchmark(source_docx, target_docx, latency=0.0, sleep=False, log=lambda m: None, **options):
+    """Run transfer_layout against a FakeWord; returns its stats plus wall time."""
+    word = FakeWord(latency=latency, sleep=sleep)
+    out_dir = tempfile.mkdtemp(prefix="fake_word_")
+    try:
+        started = time.perf_counter()
+        with main.WordPool(factory=lambda: word) as pool:
+            main.transfer_layout(source_docx, target_docx, os.path.join(out_dir, "out.docx"),
+                                 log=log, pool=pool, **options)
+        stats = word.stats()
+        stats["wall_seconds"] = round(time.perf_counter() - started, 6)
+        return stats
+    finally:
+        shutil.rmtree(out_dir, ignore_errors=True)
+
+def _cli(argv=None):
+    ap = argparse.ArgumentParser(description="Run a transfer against the fake Word object model and report COM round trips.")
+    ap.add_argument("template")
+    ap.add_argument("report")
+    ap.add_argument("--latency", type=float, default=0.0, help="seconds charged per round trip (default: %(default)s)")
+    ap.add_argument("--sleep", action="store_true", help="actually sleep the latency instead of only simulating it")
+    ap.add_argument("--section-map", action="store_true")
+    ap.add_argument("--style-engine", choices=main.STYLE_ENGINES, default="organizer")
+    ap.add_argument("--page-setup-engine", choices=main.PAGE_SETUP_ENGINES, default="com")
+    ap.add_argument("--hf-engine", choices=main.HF_ENGINES, default="com")
+    ap.add_argument("-v", "--verbose", action="store_true", help="print the transfer log")
+    args = ap.parse_args(argv)
+    stats = benchmark(args.template, args.report, latency=args.latency, sleep=args.sleep,
+                      log=print if args.verbose else (lambda m: None), section_map=args.section_map,
+                      style_engine=args.style_engine, page_setup_engine=args.page_setup_engine,
+                      hf_engine=args.hf_engine)
+    json.dump(stats, sys.stdout, indent=2)
+    print()
+
+if __name__ == "__main__":
+    _cli()
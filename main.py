@@ -3,80 +3,278 @@
 # Features: Template/Report pickers, Save As…, live log, progress bar, Help, section-map & Show Word UI toggles.
 # Stable: Fusion style applied AFTER QApplication creation, no deprecated HDPI attribute, dark dialogs.
 
+import argparse
+import atexit
+import collections
+import bisect
+import concurrent.futures
+import contextlib
+import functools
+import glob
+import hashlib
+import io
+import json
+import multiprocessing
 import os
+import posixpath
+import re
 import sys
 import tempfile
+import time
 import shutil
+import struct
 import zipfile
+import zlib
+import threading
 import traceback
+import types
 
 from PySide6 import QtCore, QtGui, QtWidgets
 
 # ---------- Word/COM + OpenXML logic ----------
-import pythoncom
-from win32com.client import Dispatch
+try:
+    import pythoncom
+    from win32com.client import Dispatch, DispatchEx
+except ImportError:  # non-Windows: only the OpenXML engines are available
+    pythoncom = None
+    Dispatch = DispatchEx = None
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
 import xml.etree.ElementTree as ET
 
 ET.register_namespace('w', 'http://schemas.openxmlformats.org/wordprocessingml/2006/main')
 W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+R_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+PR_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+CT_NS = "{http://schemas.openxmlformats.org/package/2006/content-types}"
+
+def _parse_part(data):
+    """Parse an XML part, returning (root, [(prefix, uri), ...]) of its declared namespaces."""
+    nsdecls = []
+    for _, ns in ET.iterparse(io.BytesIO(data), events=("start-ns",)):
+        if ns not in nsdecls:
+            nsdecls.append(ns)
+    return ET.fromstring(data), nsdecls
+
+def _serialize_part(root, nsdecls):
+    """
+    Serialize a part parsed by _parse_part, keeping the original prefixes.
+    ElementTree drops unused declarations, but mc:Ignorable may still name
+    them, so any that went missing are re-added on the root element.
+    """
+    for prefix, uri in nsdecls:
+        if not re.match(r"ns\d+$", prefix):
+            ET.register_namespace(prefix, uri)
+    xml = ET.tostring(root, encoding="utf-8", xml_declaration=True)
+    start = xml.index(b"<", xml.index(b"?>") + 2)
+    end = xml.index(b">", start)
+    head = xml[start:end]
+    missing = b"".join(
+        b' xmlns:%s="%s"' % (prefix.encode(), uri.encode())
+        for prefix, uri in nsdecls
+        if prefix and b"xmlns:%s=" % prefix.encode() not in head
+    )
+    if head.endswith(b"/"):
+        end -= 1
+    return xml[:end] + missing + xml[end:]
 
 # ---- Helpers ----
-def save_docx(doc, path):
-    """Save a Document to .docx, trying SaveCopyAs -> SaveAs2 -> SaveAs (Word 2013-safe)."""
+WD_FORMAT_DOCX, WD_FORMAT_DOTX = 12, 16
+DISP_E_UNKNOWNNAME = -2147352570
+DISP_E_MEMBERNOTFOUND = -2147352573
+
+def _com_hresult(exc):
+    """HRESULT of a com_error-shaped exception (its own, else the one in excepinfo), or None."""
+    args = getattr(exc, "args", ())
+    codes = [getattr(exc, "hresult", None)]
+    if args:
+        codes.append(args[0])
+    if len(args) > 2 and isinstance(args[2], tuple) and len(args[2]) > 5:
+        codes.append(args[2][5])
+    return next((c for c in codes if c in (DISP_E_UNKNOWNNAME, DISP_E_MEMBERNOTFOUND)),
+                next((c for c in codes if isinstance(c, int)), None))
+
+def _is_missing_member(exc):
+    return isinstance(exc, AttributeError) or _com_hresult(exc) in (DISP_E_UNKNOWNNAME, DISP_E_MEMBERNOTFOUND)
+
+class SaveMethods:
+    """
+    Which save entry point works on one Word instance, learned on first use:
+    SaveCopyAs -> SaveAs2 -> SaveAs (Word 2013-safe). An entry point is only
+    written off when Word says it does not exist (AttributeError,
+    DISP_E_UNKNOWNNAME/DISP_E_MEMBERNOTFOUND); other failures, like a locked
+    file, just fall through to the next one for that save. The one that worked
+    is tried first next time, per file format.
+    """
+    ORDER = ("SaveCopyAs", "SaveAs2", "SaveAs")
+
+    def __init__(self):
+        self.missing = set()
+        self.working = {}   # file format -> entry point
+
+    def save(self, doc, path, file_format=WD_FORMAT_DOCX):
+        order = list(self.ORDER)
+        if file_format in self.working:
+            order.remove(self.working[file_format])
+            order.insert(0, self.working[file_format])
+        error = None
+        for name in order:
+            if name in self.missing:
+                continue
+            kwargs = {"FileName": path, "FileFormat": file_format}
+            if name != "SaveCopyAs":
+                kwargs["AddToRecentFiles"] = False
+            try:
+                getattr(doc, name)(**kwargs)
+            except Exception as e:
+                if _is_missing_member(e):
+                    self.missing.add(name)
+                error = e
+                continue
+            self.working[file_format] = name
+            return name
+        raise error or RuntimeError("Word offers no save method")
+
+def save_docx(doc, path, saves=None):
+    """Save a Document to .docx. saves: the Word instance's SaveMethods, so repeated saves skip failing entry points."""
     dir_ = os.path.dirname(path)
     if dir_ and not os.path.isdir(dir_):
         os.makedirs(dir_, exist_ok=True)
-    try:
-        doc.SaveCopyAs(FileName=path, FileFormat=12)  # .docx
-        return
-    except Exception:
-        pass
-    try:
-        doc.SaveAs2(FileName=path, FileFormat=12, AddToRecentFiles=False)
-        return
-    except Exception:
-        pass
-    doc.SaveAs(FileName=path, FileFormat=12, AddToRecentFiles=False)
-
-def copy_page_setup(src_sec, dst_sec):
-    sps, dps = src_sec.PageSetup, dst_sec.PageSetup
-    dps.TopMargin      = sps.TopMargin
-    dps.BottomMargin   = sps.BottomMargin
-    dps.LeftMargin     = sps.LeftMargin
-    dps.RightMargin    = sps.RightMargin
-    dps.Gutter         = sps.Gutter
-    dps.HeaderDistance = sps.HeaderDistance
-    dps.FooterDistance = sps.FooterDistance
-    dps.PageWidth      = sps.PageWidth
-    dps.PageHeight     = sps.PageHeight
-    dps.Orientation    = sps.Orientation
-    dps.DifferentFirstPageHeaderFooter = sps.DifferentFirstPageHeaderFooter
-    dps.OddAndEvenPagesHeaderFooter    = sps.OddAndEvenPagesHeaderFooter
-    for prop in ("MirrorMargins", "TwoPagesOnOne"):
-        try: setattr(dps, prop, getattr(sps, prop))
-        except Exception: pass
-
-def copy_page_borders_basic(src_sec, dst_sec):
-    """Basic line borders via COM. Artistic borders are patched via OpenXML later."""
-    sbd, dbd = src_sec.Borders, dst_sec.Borders
-    for prop in ("Enable", "DistanceFrom", "SurroundHeader", "SurroundFooter",
-                 "JoinBorders", "AlwaysInFront"):
-        try: setattr(dbd, prop, getattr(sbd, prop))
-        except Exception: pass
-    for prop in ("ArtStyle", "ArtWidth"):
-        try: setattr(dbd, prop, getattr(sbd, prop))
-        except Exception: pass
-    for idx in (1, 2, 3, 4):  # 1=Top, 2=Left, 3=Bottom, 4=Right
+    (saves or SaveMethods()).save(doc, path, WD_FORMAT_DOCX)
+
+# ---------- Section layout snapshots ----------
+PAGE_SETUP_PROPS = ("TopMargin", "BottomMargin", "LeftMargin", "RightMargin", "Gutter",
+                    "HeaderDistance", "FooterDistance", "PageWidth", "PageHeight", "Orientation",
+                    "DifferentFirstPageHeaderFooter", "OddAndEvenPagesHeaderFooter")
+PAGE_SETUP_OPTIONAL_PROPS = ("MirrorMargins", "TwoPagesOnOne", "SectionDirection", "GutterPos")
+BORDERS_PROPS = ("Enable", "DistanceFrom", "SurroundHeader", "SurroundFooter",
+                 "JoinBorders", "AlwaysInFront", "ArtStyle", "ArtWidth")
+BORDER_PROPS = ("LineStyle", "LineWidth", "Color",
+                "DistanceFromTop", "DistanceFromBottom", "DistanceFromLeft", "DistanceFromRight")
+BORDER_SIDES = (1, 2, 3, 4)  # 1=Top, 2=Left, 3=Bottom, 4=Right
+# Orientation first (it swaps the page size), then the size and direction, then
+# what is laid out within it (the gutter side before the gutter)
+PAGE_SETUP_APPLY_ORDER = ("Orientation", "PageWidth", "PageHeight", "SectionDirection",
+                          "TopMargin", "BottomMargin", "LeftMargin", "RightMargin", "GutterPos", "Gutter",
+                          "HeaderDistance", "FooterDistance", "DifferentFirstPageHeaderFooter",
+                          "OddAndEvenPagesHeaderFooter", "MirrorMargins", "TwoPagesOnOne")
+HF_STORIES = tuple((kind, t) for kind in ("Headers", "Footers") for t in (1, 2, 3))  # 1=Primary, 2=First, 3=Even
+
+def _read_props(obj, names):
+    """((name, value), ...) for the properties that could be read; floats rounded to Word's 0.05pt grid."""
+    values = []
+    for name in names:
         try:
-            sb, db = sbd(idx), dbd(idx)
-            db.LineStyle = sb.LineStyle
-            db.LineWidth = sb.LineWidth
-            db.Color     = sb.Color
-            for p in ("DistanceFromTop","DistanceFromBottom","DistanceFromLeft","DistanceFromRight"):
-                try: setattr(db, p, getattr(sb, p))
-                except Exception: pass
+            value = getattr(obj, name)
         except Exception:
-            pass
+            continue
+        values.append((name, round(value, 2) if isinstance(value, float) else value))
+    return tuple(values)
+
+class SectionLayout(collections.namedtuple("SectionLayout", "page_setup borders sides headers_footers")):
+    """
+    Immutable snapshot of what the COM path copies from a section, read in one
+    pass: page setup and borders as ((property, value), ...) tuples, plus the
+    header/footer identity - per story, the index of the section that owns it
+    after following LinkToPrevious. Equal snapshots mean equal layouts.
+    """
+    __slots__ = ()
+
+    @classmethod
+    def read(cls, section, page_setup=True, headers_footers=False, index=1, previous=None, borders=True):
+        """
+        headers_footers: also resolve story ownership; `index` is the section's
+        1-based index and `previous` the snapshot of section index-1, if read.
+        borders: read the page borders (an empty snapshot leaves them alone
+        when applied).
+        """
+        page = ()
+        if page_setup:
+            ps = section.PageSetup
+            page = _read_props(ps, PAGE_SETUP_PROPS + PAGE_SETUP_OPTIONAL_PROPS)
+        border_props, sides = (), []
+        if borders:
+            bd = section.Borders
+            border_props = _read_props(bd, BORDERS_PROPS)
+            for idx in BORDER_SIDES:
+                try:
+                    sides.append((idx, _read_props(bd(idx), BORDER_PROPS)))
+                except Exception:
+                    pass
+        owners = ()
+        if headers_footers:
+            owners = tuple(_story_owner(section, kind, t, k, index, previous)
+                           for k, (kind, t) in enumerate(HF_STORIES))
+        return cls(page, border_props, tuple(sides), owners)
+
+    def changes(self, current):
+        """
+        What has to be written to turn a section whose snapshot is `current`
+        into this layout: (page_setup, borders, sides) lists of (name, value),
+        page setup in PAGE_SETUP_APPLY_ORDER. Properties `current` could not
+        read count as different.
+        """
+        want, have = dict(self.page_setup), dict(current.page_setup)
+        if "Orientation" in want and "Orientation" in have and want["Orientation"] != have["Orientation"]:
+            # Word swaps the page dimensions when the orientation changes
+            have["PageWidth"], have["PageHeight"] = have.get("PageHeight"), have.get("PageWidth")
+        page = [(n, want[n]) for n in PAGE_SETUP_APPLY_ORDER if n in want and have.get(n, _MISSING) != want[n]]
+        have_bd = dict(current.borders)
+        borders = [(n, v) for n, v in self.borders if have_bd.get(n, _MISSING) != v]
+        have_sides = dict(current.sides)
+        sides = []
+        for idx, props in self.sides:
+            have_side = dict(have_sides.get(idx, ()))
+            diff = [(n, v) for n, v in props if have_side.get(n, _MISSING) != v]
+            if diff:
+                sides.append((idx, diff))
+        return page, borders, sides
+
+    def apply(self, dst_sec, current=None):
+        """
+        Write this layout to dst_sec - only what differs from `current` (the
+        section's snapshot) when given. Returns (applied, skipped) counts.
+        """
+        page, borders, sides = self.changes(current or _EMPTY_LAYOUT)
+        if page:
+            dps = dst_sec.PageSetup
+            for name, value in page:
+                if name in PAGE_SETUP_OPTIONAL_PROPS:
+                    try: setattr(dps, name, value)
+                    except Exception: pass
+                else:
+                    setattr(dps, name, value)
+        if borders or sides:
+            dbd = dst_sec.Borders
+            for name, value in borders:
+                try: setattr(dbd, name, value)
+                except Exception: pass
+            for idx, props in sides:
+                try:
+                    db = dbd(idx)
+                    for name, value in props:
+                        try: setattr(db, name, value)
+                        except Exception: pass
+                except Exception:
+                    pass
+        applied = len(page) + len(borders) + sum(len(props) for _, props in sides)
+        total = len(self.page_setup) + len(self.borders) + sum(len(props) for _, props in self.sides)
+        return applied, total - applied
+
+_MISSING = object()
+_EMPTY_LAYOUT = SectionLayout((), (), (), ())
+
+def _story_owner(section, kind, t, k, index, previous):
+    """Index of the section owning story k ((kind, t)) of `section`, following LinkToPrevious."""
+    try:
+        linked = getattr(section, kind)(t).LinkToPrevious
+    except Exception:
+        linked = False
+    if not linked or index <= 1:
+        return index
+    return previous.headers_footers[k] if previous is not None and previous.headers_footers else index - 1
 
 def _copy_single_hf(src_hf, dst_hf):
     try: dst_hf.LinkToPrevious = False
@@ -88,17 +286,33 @@ def _copy_single_hf(src_hf, dst_hf):
     except Exception:
         rng.Text = src_hf.Range.Text
 
-def copy_headers_footers(src_sec, dst_sec):
-    for t in (1, 2, 3):  # 1=Primary, 2=First, 3=Even
-        try: _copy_single_hf(src_sec.Headers(t), dst_sec.Headers(t))
-        except Exception: pass
-        try: _copy_single_hf(src_sec.Footers(t), dst_sec.Footers(t))
-        except Exception: pass
+def _clear_single_hf(dst_hf):
+    try: dst_hf.LinkToPrevious = False
+    except Exception: pass
+    dst_hf.Range.Delete()
 
-def try_organizer_copy_all_styles(src_doc, dst_doc_path):
-    WD_ORGANIZER_OBJECT_STYLES = 3
-    app = src_doc.Application
-    moved = 0
+def copy_headers_footers(src_sec, dst_sec, plan=None):
+    """
+    plan: the template section's actions from plan_headers_footers, so
+    unused stories are skipped and empty ones only cleared; without a plan
+    every story is pasted. Returns (copied, cleared, skipped).
+    """
+    done = {HF_COPY: 0, HF_CLEAR: 0, HF_SKIP: 0}
+    for k, (kind, t) in enumerate(HF_STORIES):
+        action = plan[k] if plan else HF_COPY
+        try:
+            if action == HF_CLEAR:
+                _clear_single_hf(getattr(dst_sec, kind)(t))
+            elif action == HF_COPY:
+                _copy_single_hf(getattr(src_sec, kind)(t), getattr(dst_sec, kind)(t))
+            done[action] += 1
+        except Exception:
+            pass
+    return done[HF_COPY], done[HF_CLEAR], done[HF_SKIP]
+
+def _style_names(src_doc):
+    """Names of every style in a Word document (NameLocal, else Name)."""
+    names = []
     for st in src_doc.Styles:
         name = None
         for attr in ("NameLocal","Name"):
@@ -107,7 +321,16 @@ def try_organizer_copy_all_styles(src_doc, dst_doc_path):
                 if name: break
             except Exception:
                 pass
-        if not name: continue
+        if name:
+            names.append(name)
+    return names
+
+def try_organizer_copy_all_styles(src_doc, dst_doc_path, names=None):
+    """names: style names already enumerated from src_doc (see _style_names)."""
+    WD_ORGANIZER_OBJECT_STYLES = 3
+    app = src_doc.Application
+    moved = 0
+    for name in (names if names is not None else _style_names(src_doc)):
         try:
             app.OrganizerCopy(Source=src_doc.FullName,
                               Destination=dst_doc_path,
@@ -118,17 +341,560 @@ def try_organizer_copy_all_styles(src_doc, dst_doc_path):
             pass
     return moved
 
-def copy_styles_via_template(work_doc, src_doc):
-    tmp_dotx = os.path.join(tempfile.gettempdir(), "style_source_tmp.dotx")
+def save_dotx(src_doc, path, saves=None):
+    saves = saves or SaveMethods()
     try:
+        saves.save(src_doc, path, WD_FORMAT_DOTX)
+    except Exception:
+        save_docx(src_doc, path, saves)  # ensure exists
+
+def copy_styles_via_template(work_doc, src_doc, dotx_path=None, saves=None):
+    """dotx_path: a .dotx already saved from src_doc; otherwise one is made and removed here."""
+    if dotx_path:
+        work_doc.CopyStylesFromTemplate(dotx_path)
+        return
+    with JobWorkspace() as scratch:
+        tmp_dotx = scratch.file("style_source.dotx")
+        save_dotx(src_doc, tmp_dotx, saves)
+        work_doc.CopyStylesFromTemplate(tmp_dotx)
+
+def link_headers_footers(src_sec, dst_sec, owners, previous, plan=None):
+    """
+    Header/footer dedup: each story of dst_sec is linked to the previous
+    output section when that one already shows the same template story,
+    and pasted (unlinked) otherwise. owners: the template section owning
+    each HF_STORIES story (SectionLayout.headers_footers); previous: what the
+    previous output section shows, as returned by the previous call (None for
+    the first section). plan: as for copy_headers_footers.
+    Returns (copied, cleared, linked, shown).
+    """
+    copied = cleared = linked = 0
+    shown = []
+    for k, (kind, t) in enumerate(HF_STORIES):
+        action = plan[k] if plan else HF_COPY
+        if action == HF_SKIP:
+            shown.append(None)
+            continue
+        dst_hf = getattr(dst_sec, kind)(t)
+        if previous is not None and previous[k] is not None and previous[k] == owners[k]:
+            try:
+                dst_hf.LinkToPrevious = True
+                linked += 1
+                shown.append(owners[k])
+                continue
+            except Exception:
+                pass
         try:
-            src_doc.SaveCopyAs(FileName=tmp_dotx, FileFormat=16)  # .dotx
+            if action == HF_CLEAR:
+                _clear_single_hf(dst_hf)
+                cleared += 1
+            else:
+                _copy_single_hf(getattr(src_sec, kind)(t), dst_hf)
+                copied += 1
+            shown.append(owners[k])
         except Exception:
-            save_docx(src_doc, tmp_dotx)  # ensure exists
-        work_doc.CopyStylesFromTemplate(tmp_dotx)
-    finally:
-        try: os.remove(tmp_dotx)
-        except Exception: pass
+            shown.append(None)
+    return copied, cleared, linked, shown
+
+# --- OpenXML package transaction ---
+CONTENT_TYPES_PART = "[Content_Types].xml"
+DOCUMENT_PART = "word/document.xml"
+STYLES_PART = "word/styles.xml"
+SETTINGS_PART = "word/settings.xml"
+REL_TYPE_HEADER = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/header"
+REL_TYPE_FOOTER = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/footer"
+REL_TYPE_NUMBERING = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/numbering"
+REL_TYPE_THEME = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/theme"
+REL_TYPE_FONT_TABLE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/fontTable"
+
+def _rels_name(part):
+    """word/document.xml -> word/_rels/document.xml.rels"""
+    head, tail = posixpath.split(part)
+    return posixpath.join(head, "_rels", tail + ".rels")
+
+def _rels_source(rels):
+    """word/_rels/document.xml.rels -> word/document.xml (_rels/.rels -> '', the package)"""
+    head, tail = posixpath.split(rels)
+    return posixpath.join(posixpath.dirname(head), tail[:-len(".rels")])
+
+def _resolve_target(part, target):
+    """Package part name a relationship Target of `part` points to."""
+    if target.startswith("/"):
+        return target.lstrip("/")
+    return posixpath.normpath(posixpath.join(posixpath.dirname(part), target))
+
+def _relative_target(part, name):
+    return posixpath.relpath(name, posixpath.dirname(part) or ".")
+
+def _content_type(ct_root, name):
+    for ov in ct_root.findall(f"{CT_NS}Override"):
+        if ov.get("PartName", "").lstrip("/").lower() == name.lower():
+            return ov.get("ContentType")
+    ext = posixpath.splitext(name)[1].lstrip(".").lower()
+    for df in ct_root.findall(f"{CT_NS}Default"):
+        if df.get("Extension", "").lower() == ext:
+            return df.get("ContentType")
+    return None
+
+def _ensure_content_type(ct_root, name, content_type):
+    """Register content_type for part `name`, preferring the extension Default when it already matches."""
+    if content_type is None or _content_type(ct_root, name) == content_type:
+        return
+    ext = posixpath.splitext(name)[1].lstrip(".").lower()
+    defaults = {d.get("Extension", "").lower() for d in ct_root.findall(f"{CT_NS}Default")}
+    if ext and ext not in defaults and ext not in ("xml", "rels"):
+        ET.SubElement(ct_root, f"{CT_NS}Default", {"Extension": ext, "ContentType": content_type})
+    else:
+        ET.SubElement(ct_root, f"{CT_NS}Override", {"PartName": "/" + name, "ContentType": content_type})
+
+def _remove_content_type_override(ct_root, name):
+    for ov in ct_root.findall(f"{CT_NS}Override"):
+        if ov.get("PartName", "").lstrip("/").lower() == name.lower():
+            ct_root.remove(ov)
+
+def _document_part(pkg, rel_type):
+    """Name of the main document's part of relationship type rel_type (numbering, theme…), or None."""
+    if _rels_name(DOCUMENT_PART) not in pkg:
+        return None
+    for rel in pkg.relationships(DOCUMENT_PART).findall(f"{PR_NS}Relationship"):
+        if rel.get("Type") == rel_type and rel.get("TargetMode") != "External":
+            part = _resolve_target(DOCUMENT_PART, rel.get("Target", ""))
+            return part if part in pkg else None
+    return None
+
+def _relate_document_part(pkg, rel_type, part):
+    """Point the main document's rel_type relationship at `part`, adding it if missing."""
+    doc_rels = pkg.relationships(DOCUMENT_PART)
+    rel = next((r for r in doc_rels.findall(f"{PR_NS}Relationship") if r.get("Type") == rel_type), None)
+    if rel is None:
+        rel = ET.SubElement(doc_rels, f"{PR_NS}Relationship", {"Id": _new_rel_id(doc_rels), "Type": rel_type})
+    rel.set("Target", _relative_target(DOCUMENT_PART, part))
+    pkg.touch(_rels_name(DOCUMENT_PART))
+
+def _new_rel_id(rels_root):
+    used = {rel.get("Id") for rel in rels_root.findall(f"{PR_NS}Relationship")}
+    n = len(used) + 1
+    while f"rId{n}" in used:
+        n += 1
+    return f"rId{n}"
+
+def _unique_part_name(existing, name):
+    """word/header1.xml -> word/header4.xml when header1..3 are already taken."""
+    if name not in existing:
+        return name
+    head, tail = posixpath.split(name)
+    stem, ext = posixpath.splitext(tail)
+    m = re.match(r"(.*?)(\d*)$", stem)
+    base, n = m.group(1), int(m.group(2) or 1)
+    while True:
+        n += 1
+        candidate = posixpath.join(head, f"{base}{n}{ext}")
+        if candidate not in existing:
+            return candidate
+
+def _empty_rels():
+    return ET.Element(f"{PR_NS}Relationships"), [("", PR_NS[1:-1])]
+
+def _clone_zipinfo(item):
+    """Fresh ZipInfo for re-writing `item` into another archive (zip64 extras are recomputed)."""
+    info = zipfile.ZipInfo(item.filename, item.date_time)
+    info.compress_type = item.compress_type
+    info.create_system = item.create_system
+    info.external_attr = item.external_attr
+    info.comment = item.comment
+    info.file_size = item.file_size
+    return info
+
+class _Zip64Required(Exception):
+    """Raised by _RawZipWriter when the archive outgrows classic (non-zip64) ZIP limits."""
+
+class _RawZipWriter:
+    """
+    Minimal ZIP writer used by DocxPackage.commit(). Unchanged entries are
+    copied as their compressed bytes verbatim (a local header rebuilt from the
+    central directory record, the data, the known CRC) - nothing is inflated
+    or deflated again. Only modified parts go through zlib.
+    """
+    _LOCAL = struct.Struct("<4s2B4HL2L2H")
+    _CENTRAL = struct.Struct("<4s4B4HL2L5H2L")
+    _END = struct.Struct("<4s4H2LH")
+    _LIMIT = 0xFFFFFFFF
+
+    def __init__(self, fp):
+        self.fp = fp
+        self._entries = []
+
+    @staticmethod
+    def _dos_datetime(date_time):
+        y, mo, d, h, mi, sec = date_time
+        return (h << 11) | (mi << 5) | (sec // 2), ((y - 1980) << 9) | (mo << 5) | d
+
+    @staticmethod
+    def _encode_name(name, flag_bits):
+        if flag_bits & 0x800:
+            return name.encode("utf-8"), flag_bits
+        try:
+            return name.encode("cp437"), flag_bits
+        except UnicodeEncodeError:
+            return name.encode("utf-8"), flag_bits | 0x800
+
+    def _write_entry(self, name, date_time, flag_bits, method, crc, csize, usize,
+                     extract_version, create_system, external_attr, data_chunks, computed=None):
+        """
+        Write one entry. When `computed` is given, crc/sizes are unknown up
+        front: data_chunks fills computed = [crc, csize, usize] while it is
+        consumed and the local header is patched afterwards.
+        """
+        offset = self.fp.tell()
+        if max(offset, csize, usize) >= self._LIMIT or len(self._entries) >= 0xFFFF:
+            raise _Zip64Required(name)
+        fname, flag_bits = self._encode_name(name, flag_bits & ~0x08)
+        dostime, dosdate = self._dos_datetime(date_time)
+        self.fp.write(self._LOCAL.pack(b"PK\x03\x04", extract_version, 0, flag_bits, method,
+                                       dostime, dosdate, crc, csize, usize, len(fname), 0))
+        self.fp.write(fname)
+        for chunk in data_chunks:
+            self.fp.write(chunk)
+        if computed is not None:
+            crc, csize, usize = computed
+            if max(csize, usize) >= self._LIMIT:
+                raise _Zip64Required(name)
+            end = self.fp.tell()
+            self.fp.seek(offset + 14)
+            self.fp.write(struct.pack("<3L", crc, csize, usize))
+            self.fp.seek(end)
+        self._entries.append((fname, flag_bits, method, dostime, dosdate, crc, csize, usize,
+                              extract_version, create_system, external_attr, offset))
+
+    def copy_raw(self, src_fp, info, chunk_size=1 << 20):
+        """Copy entry `info` of the archive open as src_fp without recompressing it."""
+        src_fp.seek(info.header_offset)
+        header = self._LOCAL.unpack(src_fp.read(self._LOCAL.size))
+        if header[0] != b"PK\x03\x04":
+            raise zipfile.BadZipFile(f"Bad local header for {info.filename}")
+        src_fp.seek(header[10] + header[11], os.SEEK_CUR)
+
+        def chunks(remaining=info.compress_size):
+            while remaining:
+                chunk = src_fp.read(min(chunk_size, remaining))
+                if not chunk:
+                    raise zipfile.BadZipFile(f"Truncated data for {info.filename}")
+                remaining -= len(chunk)
+                yield chunk
+
+        self._write_entry(info.filename, info.date_time, info.flag_bits, info.compress_type,
+                          info.CRC, info.compress_size, info.file_size, info.extract_version,
+                          info.create_system, info.external_attr, chunks())
+
+    def write(self, info, chunks):
+        """Write a new entry from an iterable of byte chunks, deflated (unless info says ZIP_STORED) on the fly."""
+        method = zipfile.ZIP_STORED if info.compress_type == zipfile.ZIP_STORED else zipfile.ZIP_DEFLATED
+        comp = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15) \
+            if method == zipfile.ZIP_DEFLATED else None
+        computed = [0, 0, 0]
+
+        def payload():
+            for chunk in chunks:
+                computed[0] = zlib.crc32(chunk, computed[0])
+                computed[2] += len(chunk)
+                out = comp.compress(chunk) if comp else chunk
+                computed[1] += len(out)
+                if out:
+                    yield out
+            if comp:
+                out = comp.flush()
+                computed[1] += len(out)
+                yield out
+
+        self._write_entry(info.filename, info.date_time, info.flag_bits, method, 0, 0, 0, 20,
+                          info.create_system, info.external_attr, payload(), computed)
+
+    def close(self):
+        cd_offset = self.fp.tell()
+        for (fname, flag_bits, method, dostime, dosdate, crc, csize, usize,
+             extract_version, create_system, external_attr, offset) in self._entries:
+            self.fp.write(self._CENTRAL.pack(b"PK\x01\x02", 20, create_system, extract_version, 0,
+                                             flag_bits, method, dostime, dosdate, crc, csize, usize,
+                                             len(fname), 0, 0, 0, 0, external_attr, offset))
+            self.fp.write(fname)
+        cd_size = self.fp.tell() - cd_offset
+        if cd_offset + cd_size >= self._LIMIT:
+            raise _Zip64Required("central directory")
+        n = len(self._entries)
+        self.fp.write(self._END.pack(b"PK\x05\x06", 0, 0, n, n, cd_size, cd_offset, 0))
+
+class DocxPackage:
+    """
+    Transactional view of a .docx package.
+
+    Stages read parts with read()/xml() and register modifications with
+    write()/touch()/delete(); nothing reaches the disk until commit(), which
+    rewrites the archive exactly once. Parts nobody modified are streamed
+    through without being parsed. The template is opened the same way and
+    simply closed without committing.
+    """
+    COPY_CHUNK = 1 << 20
+
+    def __init__(self, path, raw_copy=True):
+        """raw_copy: copy unchanged entries' compressed bytes verbatim instead of recompressing them."""
+        self.path = path
+        self.raw_copy = raw_copy
+        self._open()
+
+    def _open(self):
+        self._zip = zipfile.ZipFile(self.path, "r")
+        self._names = set(self._zip.namelist())
+        self._data = {}       # part name -> replacement bytes
+        self._trees = {}      # part name -> (root, nsdecls), parsed on first xml()
+        self._touched = set() # parts whose cached tree was modified
+        self._deleted = set()
+        self._section_patches = []
+        self._section_cache = {}
+        self.sections_patched = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __contains__(self, name):
+        return name in self._names
+
+    def __iter__(self):
+        return iter(sorted(self._names))
+
+    def close(self):
+        self._zip.close()
+
+    @property
+    def modified(self):
+        return bool(self._data or self._touched or self._deleted or self._section_patches)
+
+    def read(self, name):
+        if name in self._touched:
+            return _serialize_part(*self._trees[name])
+        if name in self._data:
+            return self._data[name]
+        if name not in self._names:
+            raise KeyError(name)
+        return self._zip.read(name)
+
+    def xml(self, name):
+        """Parsed root of an XML part, cached; call touch() after modifying it."""
+        if name not in self._trees:
+            self._trees[name] = _parse_part(self.read(name))
+        return self._trees[name][0]
+
+    def touch(self, name):
+        self._touched.add(name)
+        self._names.add(name)
+        self._deleted.discard(name)
+
+    def write(self, name, data):
+        self._trees.pop(name, None)
+        self._touched.discard(name)
+        self._deleted.discard(name)
+        self._data[name] = data
+        self._names.add(name)
+
+    def set_xml(self, name, root, nsdecls):
+        self._data.pop(name, None)
+        self._trees[name] = (root, nsdecls)
+        self.touch(name)
+
+    def delete(self, name):
+        self._data.pop(name, None)
+        self._trees.pop(name, None)
+        self._touched.discard(name)
+        self._names.discard(name)
+        self._deleted.add(name)
+
+    def patch_sections(self, patch):
+        """
+        Register patch(sectpr, index) for the streaming w:sectPr pass over
+        document.xml that commit() runs (see _stream_sectprs). read()/xml()
+        keep returning the unpatched part until then.
+        """
+        self._section_patches.append(patch)
+
+    def _patch_section(self, sectpr, index):
+        if index is not None:
+            self.sections_patched += 1
+        changed = False
+        for patch in self._section_patches:
+            changed = patch(sectpr, index) or changed
+        return changed
+
+    def _part_chunks(self, name):
+        """The (possibly modified) bytes of a part as an iterable of chunks."""
+        if name in self._touched or name in self._data:
+            chunks = (self.read(name),)
+        else:
+            chunks = self._stream_entry(name)
+        if name == DOCUMENT_PART and self._section_patches:
+            chunks = _stream_sectprs(chunks, self._patch_section)
+        return chunks
+
+    def _stream_entry(self, name):
+        with self._zip.open(name) as src:
+            while True:
+                chunk = src.read(self.COPY_CHUNK)
+                if not chunk:
+                    return
+                yield chunk
+
+    def section_properties(self, first_only=False):
+        """
+        Live w:sectPr elements of document.xml in Word's Sections order, read
+        with the streaming scanner so only the sectPr fragments are parsed.
+        first_only stops reading at Sections(1). Cached.
+        """
+        key = "first" if first_only else "all"
+        if key not in self._section_cache:
+            if "all" in self._section_cache:
+                return self._section_cache["all"][:1]
+            sections = []
+            for token in _iter_sectpr_fragments(self._stream_entry(DOCUMENT_PART)):
+                if token[0] == "sectPr" and token[2] is not None:
+                    sections.append(_parse_fragment(token[1], token[3]))
+                    if first_only:
+                        break
+            self._section_cache[key] = sections
+        return self._section_cache[key]
+
+    def final_section_properties(self):
+        """The body-level (last) w:sectPr, found by a tail scan of document.xml; None if absent."""
+        if "final" not in self._section_cache:
+            found, sectpr = _tail_final_sectpr(self._stream_entry(DOCUMENT_PART))
+            if not found:
+                # Oversized final sectPr: scan the whole part, still fragment by fragment
+                last, trailing = None, b""
+                for token in _iter_sectpr_fragments(self._stream_entry(DOCUMENT_PART)):
+                    if token[0] == "sectPr" and token[2] is not None:
+                        last, trailing = token, b""
+                    elif token[0] == "raw" and last is not None and len(trailing) < 64:
+                        trailing += token[1][:64]
+                if last is not None and trailing.lstrip().startswith(b"</" + _w_prefix(last[3]) + b"body>"):
+                    sectpr = _parse_fragment(last[1], last[3])
+            self._section_cache["final"] = sectpr
+        return self._section_cache["final"]
+
+    def relationships(self, part):
+        """Root of part's .rels; an empty one is created (and written on touch) if missing."""
+        rels = _rels_name(part)
+        if rels not in self._trees and rels not in self:
+            self._trees[rels] = _empty_rels()
+        return self.xml(rels)
+
+    def related_parts(self, part):
+        """{rId: part name} of the internal relationships of `part`."""
+        if _rels_name(part) not in self:
+            return {}
+        return {
+            rel.get("Id"): _resolve_target(part, rel.get("Target", ""))
+            for rel in self.relationships(part).findall(f"{PR_NS}Relationship")
+            if rel.get("TargetMode") != "External"
+        }
+
+    def commit(self):
+        """Write every registered modification in a single rewrite of the archive."""
+        if not self.modified:
+            return False
+        new_path = self.path + ".tmp"
+        changed = self._touched | set(self._data)
+        if self._section_patches:
+            changed.add(DOCUMENT_PART)
+        try:
+            written = False
+            if self.raw_copy:
+                try:
+                    self._write_raw(new_path, changed)
+                    written = True
+                except _Zip64Required:
+                    pass
+            if not written:
+                self._write_recompressed(new_path, changed)
+            self._zip.close()
+            os.replace(new_path, self.path)
+        except BaseException:
+            try: os.remove(new_path)
+            except OSError: pass
+            raise
+        self._open()
+        return True
+
+    def _new_entries(self, changed):
+        for name in sorted(changed - set(self._zip.namelist())):
+            info = zipfile.ZipInfo(name, time.localtime()[:6])
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.external_attr = 0o600 << 16
+            yield info
+
+    def _write_raw(self, new_path, changed):
+        self.sections_patched = 0
+        with open(self.path, "rb") as src_fp, open(new_path, "wb") as out_fp:
+            zout = _RawZipWriter(out_fp)
+            for item in self._zip.infolist():
+                name = item.filename
+                if name in self._deleted:
+                    continue
+                if name in changed:
+                    zout.write(item, self._part_chunks(name))
+                else:
+                    zout.copy_raw(src_fp, item, self.COPY_CHUNK)
+            for info in self._new_entries(changed):
+                zout.write(info, self._part_chunks(info.filename))
+            zout.close()
+
+    def _write_recompressed(self, new_path, changed):
+        self.sections_patched = 0
+        with zipfile.ZipFile(new_path, "w", zipfile.ZIP_DEFLATED) as zout:
+            for item in self._zip.infolist():
+                name = item.filename
+                if name in self._deleted:
+                    continue
+                if name in changed:
+                    chunks = self._part_chunks(name)
+                else:
+                    chunks = self._stream_entry(name)
+                with zout.open(_clone_zipinfo(item), "w", force_zip64=item.file_size > (1 << 30)) as dst:
+                    for chunk in chunks:
+                        dst.write(chunk)
+            for info in self._new_entries(changed):
+                with zout.open(info, "w") as dst:
+                    for chunk in self._part_chunks(info.filename):
+                        dst.write(chunk)
+
+def _copy_part_tree(src_pkg, name, dst_pkg, memo):
+    """
+    Copy part `name` and every internal part it references (media, embeddings,
+    charts...) into dst_pkg, renaming on collision and rewriting relationship
+    targets. A source part already in `memo` is not copied again.
+    Returns the destination part name.
+    """
+    if name in memo:
+        return memo[name]
+    new_name = _unique_part_name(dst_pkg, name)
+    memo[name] = new_name
+    dst_pkg.write(new_name, src_pkg.read(name))
+    _ensure_content_type(dst_pkg.xml(CONTENT_TYPES_PART), new_name,
+                         _content_type(src_pkg.xml(CONTENT_TYPES_PART), name))
+    dst_pkg.touch(CONTENT_TYPES_PART)
+
+    rels_name = _rels_name(name)
+    if rels_name in src_pkg:
+        rels_root, rels_ns = _parse_part(src_pkg.read(rels_name))
+        for rel in rels_root.findall(f"{PR_NS}Relationship"):
+            if rel.get("TargetMode") == "External":
+                continue
+            target = _resolve_target(name, rel.get("Target", ""))
+            if target not in src_pkg:
+                continue
+            copied = _copy_part_tree(src_pkg, target, dst_pkg, memo)
+            rel.set("Target", _relative_target(new_name, copied))
+        dst_pkg.set_xml(_rels_name(new_name), rels_root, rels_ns)
+    return new_name
 
 # --- OpenXML helpers for artistic page borders ---
 def _deepcopy(elem):
@@ -139,87 +905,1850 @@ def _deepcopy(elem):
     new.tail = elem.tail
     return new
 
-def _extract_pgBorders_from_source(source_docx):
-    with zipfile.ZipFile(source_docx, "r") as z:
-        xml = z.read("word/document.xml")
-    root = ET.fromstring(xml)
-    # Last body-level sectPr preferred
-    sectprs = root.findall(f".//{W_NS}body/{W_NS}sectPr")
-    if sectprs:
-        pg = sectprs[-1].find(f"{W_NS}pgBorders")
+def _extract_pgBorders_from_source(src_pkg):
+    # Last body-level sectPr preferred (tail scan; the rest of the part is never kept)
+    body_sectpr = src_pkg.final_section_properties()
+    if body_sectpr is not None:
+        pg = body_sectpr.find(f"{W_NS}pgBorders")
         if pg is not None:
             return pg
     # Fallback: last paragraph-level sectPr
-    sectprs = root.findall(f".//{W_NS}p/{W_NS}pPr/{W_NS}sectPr")
+    sectprs = src_pkg.section_properties()
+    if body_sectpr is not None:
+        sectprs = sectprs[:-1]
     if sectprs:
         pg = sectprs[-1].find(f"{W_NS}pgBorders")
         if pg is not None:
             return pg
     return None
 
-def _insert_pgBorders_schema_order(sectpr, pgBorders_elem):
+# CT_SectPr / CT_Settings child sequences (ECMA-376 Part 1, 17.6.17 and 17.15.1.78)
+SECTPR_CHILD_ORDER = (
+    "headerReference", "footerReference", "footnotePr", "endnotePr", "type", "pgSz", "pgMar",
+    "paperSrc", "pgBorders", "lnNumType", "pgNumType", "cols", "formProt", "vAlign", "noEndnote",
+    "titlePg", "textDirection", "bidi", "rtlGutter", "docGrid", "printerSettings", "sectPrChange",
+)
+SETTINGS_CHILD_ORDER = (
+    "writeProtection", "view", "zoom", "removePersonalInformation", "removeDateAndTime",
+    "doNotDisplayPageBoundaries", "displayBackgroundShape", "printPostScriptOverText",
+    "printFractionalCharacterWidth", "printFormsData", "embedTrueTypeFonts", "embedSystemFonts",
+    "saveSubsetFonts", "saveFormsData", "mirrorMargins", "alignBordersAndEdges",
+    "bordersDoNotSurroundHeader", "bordersDoNotSurroundFooter", "gutterAtTop", "hideSpellingErrors",
+    "hideGrammaticalErrors", "activeWritingStyle", "proofState", "formsDesign", "attachedTemplate",
+    "linkStyles", "stylePaneFormatFilter", "stylePaneSortMethod", "documentType", "mailMerge",
+    "revisionView", "trackRevisions", "doNotTrackMoves", "doNotTrackFormatting", "documentProtection",
+    "autoFormatOverride", "styleLockTheme", "styleLockQFSet", "defaultTabStop", "autoHyphenation",
+    "consecutiveHyphenLimit", "hyphenationZone", "doNotHyphenateCaps", "showEnvelope", "summaryLength",
+    "clickAndTypeStyle", "defaultTableStyle", "evenAndOddHeaders", "bookFoldRevPrinting",
+    "bookFoldPrinting", "bookFoldPrintingSheets", "drawingGridHorizontalSpacing",
+    "drawingGridVerticalSpacing", "displayHorizontalDrawingGridEvery", "displayVerticalDrawingGridEvery",
+    "doNotUseMarginsForDrawingGridOrigin", "drawingGridHorizontalOrigin", "drawingGridVerticalOrigin",
+    "doNotShadeFormData", "noPunctuationKerning", "characterSpacingControl", "printTwoOnOne",
+    "strictFirstAndLastChars", "noLineBreaksAfter", "noLineBreaksBefore", "savePreviewPicture",
+    "doNotValidateAgainstSchema", "saveInvalidXml", "ignoreMixedContent", "alwaysShowPlaceholderText",
+    "doNotDemarcateInvalidXml", "saveXmlDataOnly", "useXSLTWhenSaving", "saveThroughXslt",
+    "showXMLTags", "alwaysMergeEmptyNamespace", "updateFields", "hdrShapeDefaults", "footnotePr",
+    "endnotePr", "compat", "docVars", "rsids", "mathPr", "attachedSchema", "themeFontLang",
+    "clrSchemeMapping", "doNotIncludeSubdocsInStats", "doNotAutoCompressPictures", "forceUpgrade",
+    "captions", "readModeInkLockDown", "smartTagType", "schemaLibrary", "shapeDefaults",
+    "doNotEmbedSmartTags", "decimalSymbol", "listSeparator",
+)
+
+@functools.lru_cache(maxsize=None)
+def _schema_rank(order):
+    """{qualified tag: position} for a child sequence such as SECTPR_CHILD_ORDER."""
+    return {f"{W_NS}{tag}": i for i, tag in enumerate(order)}
+
+def _merge_schema_children(parent, replacements, order):
     """
-    Insert <w:pgBorders> in schema-valid position:
-      AFTER  last of:  w:type, w:pgSz, w:pgMar, w:paperSrc
-      BEFORE first of: w:lnNumType, w:pgNumType, w:cols, w:docGrid
+    Apply {qualified tag: new element or None} to parent's children in one
+    linear pass: each named child is replaced by its new element (None removes
+    it) and new elements land in schema-valid position - after every child
+    that precedes them in `order`, before every child that follows. Children
+    not in `order` (extensions) keep their place relative to their neighbours.
     """
-    existing = sectpr.find(f"{W_NS}pgBorders")
-    if existing is not None:
-        sectpr.remove(existing)
-
-    children = list(sectpr)
-
-    after_tags  = {f"{W_NS}type", f"{W_NS}pgSz", f"{W_NS}pgMar", f"{W_NS}paperSrc"}
-    before_tags = {f"{W_NS}lnNumType", f"{W_NS}pgNumType", f"{W_NS}cols", f"{W_NS}docGrid"}
+    rank = _schema_rank(order)
+    pending = sorted(((rank[tag], el) for tag, el in replacements.items() if el is not None),
+                     key=lambda item: item[0])
+    kept = [child for child in parent if child.tag not in replacements]
+    # An unknown child ranks with the known one after it, so new elements go
+    # right after their last predecessor
+    ranks, following = [], len(order)
+    for child in reversed(kept):
+        following = rank.get(child.tag, following)
+        ranks.append(following)
+    merged = []
+    k = 0
+    for child, r in zip(kept, reversed(ranks)):
+        while k < len(pending) and pending[k][0] < r:
+            merged.append(pending[k][1])
+            k += 1
+        merged.append(child)
+    merged.extend(el for _, el in pending[k:])
+    parent[:] = merged
+
+def _insert_schema_order(parent, elem, order):
+    """Insert elem (replacing an existing child with the same tag) in schema-valid position."""
+    _merge_schema_children(parent, {elem.tag: elem}, order)
+
+def _set_pgBorders_in_all_sections(pkg, pgBorders_elem):
+    """Schedule <w:pgBorders> for every body- and paragraph-level w:sectPr of the package."""
+    def patch(sectpr, index):
+        if index is None:
+            return False
+        _insert_schema_order(sectpr, _deepcopy(pgBorders_elem), SECTPR_CHILD_ORDER)
+        return True
+    pkg.patch_sections(patch)
+    return True
 
-    after_idx = -1
-    for i, ch in enumerate(children):
-        if ch.tag in after_tags and i > after_idx:
-            after_idx = i
+# --- Streaming w:sectPr rewriter for document.xml ---
+_ROOT_TAG_RE = re.compile(rb"<([A-Za-z_][\w.:-]*)(\s[^>]*)?>")
+_NSDECL_RE = re.compile(rb'xmlns(?::([\w.-]+))?\s*=\s*"([^"]*)"')
+_SCAN_TAIL = 64  # bytes held back between chunks so a tag split across them is still seen
+
+def _root_namespaces(start_tag):
+    """[(prefix, uri), ...] declared on a root start tag (prefix '' for the default namespace)."""
+    return [((p or b"").decode(), uri.decode()) for p, uri in _NSDECL_RE.findall(start_tag)]
+
+def _w_prefix(nsdecls):
+    """Tag prefix (b"w:", or b"" for a default namespace) WordprocessingML uses in a part."""
+    prefix = next((p for p, uri in nsdecls if uri == W_NS[1:-1]), "w")
+    return (prefix + ":").encode() if prefix else b""
+
+def _sectpr_tag_re(nsdecls):
+    return re.compile(rb"<(/?)" + re.escape(_w_prefix(nsdecls)) + rb"(sectPr|pPrChange)(?=[\s/>])")
+
+def _sectpr_fragment_end(buf, tag_re):
+    """End offset of the w:sectPr element starting at buf[0], or None if buf does not hold all of it yet."""
+    depth = 0
+    for m in tag_re.finditer(buf):
+        if m.group(2) != b"sectPr":
+            continue
+        end = buf.find(b">", m.end())
+        if end < 0:
+            return None
+        if m.group(1):
+            depth -= 1
+        elif buf[end - 1:end] != b"/":
+            depth += 1
+        if depth == 0:
+            return end + 1
+    return None
 
-    before_idx = len(children)
-    for i, ch in enumerate(children):
-        if ch.tag in before_tags:
-            before_idx = i
+def _parse_fragment(frag, nsdecls):
+    decls = b"".join(
+        b' xmlns%s="%s"' % ((b":" + p.encode()) if p else b"", uri.encode()) for p, uri in nsdecls
+    )
+    return ET.fromstring(b"<fragment" + decls + b">" + frag + b"</fragment>")[0]
+
+def _serialize_fragment(elem, nsdecls):
+    """Serialize a parsed fragment back without repeating the root's namespace declarations."""
+    for prefix, uri in nsdecls:
+        if prefix and not re.match(r"ns\d+$", prefix):
+            ET.register_namespace(prefix, uri)
+    xml = ET.tostring(elem, encoding="utf-8")
+    for prefix, uri in nsdecls:
+        if prefix:
+            xml = xml.replace(b' xmlns:%s="%s"' % (prefix.encode(), uri.encode()), b"", 1)
+    return xml
+
+def _iter_sectpr_fragments(chunks):
+    """
+    Tokenize the byte chunks of a document.xml part into
+      ("raw", bytes)                          - everything outside w:sectPr
+      ("sectPr", bytes, index, nsdecls)       - one complete top-level w:sectPr
+    index is the section's 1-based position in Word's Sections order, or None
+    for old section properties kept inside a tracked w:pPrChange.
+    """
+    it = iter(chunks)
+    buf = b""
+    while True:
+        m = _ROOT_TAG_RE.search(buf)
+        if m:
             break
+        chunk = next(it, None)
+        if chunk is None:
+            if buf:
+                yield ("raw", buf)
+            return
+        buf += chunk
+    nsdecls = _root_namespaces(m.group(0))
+    tag_re = _sectpr_tag_re(nsdecls)
+    yield ("raw", buf[:m.end()])
+    buf = buf[m.end():]
+
+    index, tracked, eof = 0, 0, False
+    while True:
+        m = tag_re.search(buf)
+        end = buf.find(b">", m.end()) if m else -1
+        if m is None or end < 0:
+            if eof:
+                if buf:
+                    yield ("raw", buf)
+                return
+            keep = len(buf) - max(m.start() if m else len(buf) - _SCAN_TAIL, 0)
+            if len(buf) > keep:
+                yield ("raw", buf[:len(buf) - keep])
+                buf = buf[len(buf) - keep:]
+            chunk = next(it, None)
+            if chunk is None:
+                eof = True
+            else:
+                buf += chunk
+            continue
+
+        closing, name = m.group(1), m.group(2)
+        if name == b"pPrChange" or closing:
+            if name == b"pPrChange":
+                if closing:
+                    tracked = max(tracked - 1, 0)
+                elif buf[end - 1:end] != b"/":
+                    tracked += 1
+            yield ("raw", buf[:end + 1])
+            buf = buf[end + 1:]
+            continue
+
+        if m.start():
+            yield ("raw", buf[:m.start()])
+            buf = buf[m.start():]
+        frag_end = _sectpr_fragment_end(buf, tag_re)
+        while frag_end is None:
+            chunk = next(it, None)
+            if chunk is None:
+                raise ValueError("Unterminated w:sectPr in document.xml")
+            buf += chunk
+            frag_end = _sectpr_fragment_end(buf, tag_re)
+        if not tracked:
+            index += 1
+        yield ("sectPr", buf[:frag_end], None if tracked else index, nsdecls)
+        buf = buf[frag_end:]
+
+def _stream_sectprs(chunks, patch):
+    """
+    Copy a document.xml byte stream through, parsing only its w:sectPr
+    fragments (body- and paragraph-level). Each is handed to
+    patch(sectpr, index) and re-serialized only if patch returns True;
+    everything else is passed through unchanged. Memory is bounded by the
+    largest sectPr, time is linear in the part size.
+    """
+    for token in _iter_sectpr_fragments(chunks):
+        if token[0] == "raw":
+            yield token[1]
+            continue
+        _, frag, index, nsdecls = token
+        sectpr = _parse_fragment(frag, nsdecls)
+        yield _serialize_fragment(sectpr, nsdecls) if patch(sectpr, index) else frag
 
-    insert_idx = min(after_idx + 1, before_idx)
-    sectpr.insert(insert_idx, _deepcopy(pgBorders_elem))
+TAIL_WINDOW = 256 * 1024
 
-def _set_pgBorders_in_all_sections(target_docx, pgBorders_elem):
-    with zipfile.ZipFile(target_docx, "r") as zin:
-        xml = zin.read("word/document.xml")
-    root = ET.fromstring(xml)
+def _tail_final_sectpr(chunks, window=TAIL_WINDOW):
+    """
+    Final body-level w:sectPr (by schema the last child of w:body) of a
+    document.xml stream, keeping only the root start tag and a bounded
+    trailing window in memory. Returns (found, sectpr): found is False when
+    the window was too small to decide and the caller has to scan the part.
+    """
+    head, tail, nsdecls = b"", b"", None
+    for chunk in chunks:
+        if nsdecls is None:
+            head += chunk
+            m = _ROOT_TAG_RE.search(head)
+            if m is None:
+                continue
+            nsdecls = _root_namespaces(m.group(0))
+            chunk, head = head[m.end():], b""
+        tail = (tail + chunk)[-window:]
+    if nsdecls is None:
+        return True, None
+
+    tag_re = _sectpr_tag_re(nsdecls)
+    prefix = _w_prefix(nsdecls)
+    body_close = tail.rfind(b"</" + prefix + b"body>")
+    if body_close < 0:
+        return False, None
+    before = tail[:body_close].rstrip()
+
+    if not before.endswith(b"</" + prefix + b"sectPr>"):
+        # Either a self-closing final <w:sectPr/> or no body-level sectPr at all
+        start = before.rfind(b"<")
+        if start < 0:
+            return False, None  # the window starts inside the last element's tag
+        m = tag_re.match(before, start)
+        if m and m.group(2) == b"sectPr" and not m.group(1) and before.endswith(b"/>"):
+            return True, _parse_fragment(before[start:], nsdecls)
+        return True, None
+
+    depth = 0
+    for m in reversed([m for m in tag_re.finditer(before) if m.group(2) == b"sectPr"]):
+        end = before.find(b">", m.end())
+        if m.group(1):
+            depth += 1
+        elif before[end - 1:end] != b"/":
+            depth -= 1
+            if depth == 0:
+                return True, _parse_fragment(before[m.start():], nsdecls)
+    return False, None
+
+# --- OpenXML style merge (no Word) ---
+
+def _style_key(style):
+    return (style.get(f"{W_NS}type", "paragraph"), style.get(f"{W_NS}styleId"))
+
+def _style_name(style):
+    name = style.find(f"{W_NS}name")
+    return name.get(f"{W_NS}val", "").lower() if name is not None else None
+
+def _merge_latent_styles(src_latent, dst_latent):
+    """Source latentStyles attributes win; lsdExceptions are merged by w:name."""
+    merged = _deepcopy(src_latent)
+    seen = {e.get(f"{W_NS}name") for e in merged.findall(f"{W_NS}lsdException")}
+    for exc in dst_latent.findall(f"{W_NS}lsdException"):
+        if exc.get(f"{W_NS}name") not in seen:
+            merged.append(_deepcopy(exc))
+    return merged
+
+def _replace_doc_defaults(src_root, dst_root):
+    """Replace the report's w:docDefaults with the template's. Returns False if the template has none."""
+    src_el = src_root.find(f"{W_NS}docDefaults")
+    if src_el is None:
+        return False
+    dst_el = dst_root.find(f"{W_NS}docDefaults")
+    if dst_el is not None:
+        dst_root.insert(list(dst_root).index(dst_el), _deepcopy(src_el))
+        dst_root.remove(dst_el)
+    else:
+        dst_root.insert(0, _deepcopy(src_el))
+    return True
 
-    changed = False
-    for sectpr in root.findall(f".//{W_NS}body/{W_NS}sectPr"):
-        _insert_pgBorders_schema_order(sectpr, pgBorders_elem)
-        changed = True
-    for sectpr in root.findall(f".//{W_NS}p/{W_NS}pPr/{W_NS}sectPr"):
-        _insert_pgBorders_schema_order(sectpr, pgBorders_elem)
-        changed = True
+def _plan_style_ids(src_root, dst_root):
+    """
+    The final styleId of every template style merged into dst_root (see
+    _merge_styles_xml), decided before anything is changed. Returns
+    ({template styleId: final styleId}, [(template style, report style it
+    replaces or None, final styleId), ...]).
+    """
+    dst_by_key = {}
+    dst_by_name = {}
+    taken = set()  # styleIds are unique across all style types
+    for st in dst_root.findall(f"{W_NS}style"):
+        dst_by_key[_style_key(st)] = st
+        dst_by_name.setdefault((st.get(f"{W_NS}type", "paragraph"), _style_name(st)), st)
+        taken.add((st.get(f"{W_NS}styleId") or "").lower())
+    src_styles = src_root.findall(f"{W_NS}style")
+    id_map = {}
+    targets = []
+    claimed = set()
+    for st in src_styles:
+        key = _style_key(st)
+        if not key[1]:
+            continue
+        named = dst_by_name.get((key[0], _style_name(st))) if _style_name(st) else None
+        dst = named if named is not None else dst_by_key.get(key)
+        if dst is not None and id(dst) in claimed:
+            dst = None
+        if dst is not None:
+            claimed.add(id(dst))
+            final_id = dst.get(f"{W_NS}styleId")
+        else:
+            final_id = key[1]
+            n = 1
+            while final_id.lower() in taken:
+                final_id = f"{key[1]}{n}"
+                n += 1
+            taken.add(final_id.lower())
+        id_map[key[1]] = final_id
+        targets.append((st, dst, final_id))
+    return id_map, targets
+
+def _merge_styles_xml(src_root, dst_root, num_map=None):
+    """
+    Merge the template's <w:styles> into the report's, like Organizer does:
+      - docDefaults are replaced, latentStyles merged
+      - every source style replaces the report style of the same type with
+        the same name (keeping the report's id), or else the one with the same
+        styleId unless another report style already has the template style's
+        name; the rest are added, under a fresh id if theirs is taken by a
+        report style of any type
+      - basedOn/link/next are remapped to the final ids; dangling or cyclic
+        references are dropped.
+    num_map: template numId -> report numId (see merge_numbering_openxml),
+    applied to the copied styles' w:numPr.
+    Returns the number of styles copied.
+    """
+    # docDefaults / latentStyles sit before the first w:style, in that order
+    _replace_doc_defaults(src_root, dst_root)
+    src_el = src_root.find(f"{W_NS}latentStyles")
+    if src_el is not None:
+        dst_el = dst_root.find(f"{W_NS}latentStyles")
+        if dst_el is not None:
+            dst_root.insert(list(dst_root).index(dst_el), _merge_latent_styles(src_el, dst_el))
+            dst_root.remove(dst_el)
+        else:
+            defaults = dst_root.find(f"{W_NS}docDefaults")
+            dst_root.insert(list(dst_root).index(defaults) + 1 if defaults is not None else 0, _deepcopy(src_el))
+
+    id_map, targets = _plan_style_ids(src_root, dst_root)
+    copied = 0
+    for st, dst, final_id in targets:
+        new = _deepcopy(st)
+        new.set(f"{W_NS}styleId", final_id)
+        for tag in ("basedOn", "link", "next"):
+            ref = new.find(f"{W_NS}{tag}")
+            if ref is not None and ref.get(f"{W_NS}val") in id_map:
+                ref.set(f"{W_NS}val", id_map[ref.get(f"{W_NS}val")])
+        if num_map:
+            _remap_num_ids(new, num_map)
+        if new.get(f"{W_NS}default") in ("1", "true", "on"):
+            for other in dst_root.findall(f"{W_NS}style"):
+                if other.get(f"{W_NS}type", "paragraph") == new.get(f"{W_NS}type", "paragraph"):
+                    other.attrib.pop(f"{W_NS}default", None)
+        if dst is not None:
+            dst_root.insert(list(dst_root).index(dst), new)
+            dst_root.remove(dst)
+        else:
+            dst_root.append(new)
+        copied += 1
+
+    _resolve_style_references(dst_root)
+    return copied
+
+def _resolve_style_references(styles_root):
+    """Drop basedOn/link/next that point to missing styles, and break basedOn cycles."""
+    by_id = {st.get(f"{W_NS}styleId"): st for st in styles_root.findall(f"{W_NS}style")}
+    for st in by_id.values():
+        for tag in ("basedOn", "link", "next"):
+            ref = st.find(f"{W_NS}{tag}")
+            if ref is not None and ref.get(f"{W_NS}val") not in by_id:
+                st.remove(ref)
+    for st in by_id.values():
+        seen = {st.get(f"{W_NS}styleId")}
+        cur = st
+        while True:
+            ref = cur.find(f"{W_NS}basedOn")
+            if ref is None:
+                break
+            parent_id = ref.get(f"{W_NS}val")
+            if parent_id in seen:
+                cur.remove(ref)
+                break
+            seen.add(parent_id)
+            cur = by_id[parent_id]
+
+def merge_styles_openxml(src_pkg, out_pkg, num_map=None):
+    """COM-free replacement for the Organizer loop: merge word/styles.xml in the package."""
+    if STYLES_PART not in src_pkg or STYLES_PART not in out_pkg:
+        return 0
+    moved = _merge_styles_xml(src_pkg.xml(STYLES_PART), out_pkg.xml(STYLES_PART), num_map)
+    out_pkg.touch(STYLES_PART)
+    return moved
 
-    if not changed:
+# --- OpenXML numbering merge (no Word) ---
+NUMBERING_PART = "word/numbering.xml"
+CT_NUMBERING = "application/vnd.openxmlformats-officedocument.wordprocessingml.numbering+xml"
+NUMBERING_CHILD_RANK = {f"{W_NS}numPicBullet": 0, f"{W_NS}abstractNum": 1, f"{W_NS}num": 2}
+NUMBERING_HASH_SKIP = {f"{W_NS}nsid", f"{W_NS}tmpl"}  # random per document, not part of the definition
+
+def _numbering_digest(el, skip_attrs=()):
+    def canonical(e):
+        attrs = tuple(sorted((k, v) for k, v in e.attrib.items() if k not in skip_attrs))
+        return (e.tag, attrs, (e.text or "").strip(),
+                tuple(canonical(c) for c in e if c.tag not in NUMBERING_HASH_SKIP))
+    return hashlib.sha1(repr(canonical(el)).encode("utf-8")).hexdigest()
+
+def _num_key(num, abstract_id):
+    """A w:num compared by its abstractNum and its level overrides."""
+    return abstract_id, tuple(_numbering_digest(o) for o in num.findall(f"{W_NS}lvlOverride"))
+
+def _int_ids(elements, attr):
+    ids = []
+    for el in elements:
+        try: ids.append(int(el.get(f"{W_NS}{attr}")))
+        except (TypeError, ValueError): pass
+    return ids
+
+def _copy_rel_refs(elem, src_pkg, src_part, dst_pkg, dst_part, memo):
+    """Copy the parts behind elem's r:* attributes (e.g. picture bullet images) and point them at new rIds."""
+    src_rels = {rel.get("Id"): rel for rel in src_pkg.relationships(src_part).findall(f"{PR_NS}Relationship")}
+    dst_rels = dst_pkg.relationships(dst_part)
+    for el in elem.iter():
+        for attr, rid in list(el.attrib.items()):
+            rel = src_rels.get(rid) if attr.startswith(R_NS) else None
+            if rel is None or rel.get("TargetMode") == "External":
+                continue
+            target = _resolve_target(src_part, rel.get("Target", ""))
+            if target not in src_pkg:
+                continue
+            new_rid = _new_rel_id(dst_rels)
+            ET.SubElement(dst_rels, f"{PR_NS}Relationship", {
+                "Id": new_rid, "Type": rel.get("Type"),
+                "Target": _relative_target(dst_part, _copy_part_tree(src_pkg, target, dst_pkg, memo)),
+            })
+            el.set(attr, new_rid)
+            dst_pkg.touch(_rels_name(dst_part))
+
+def _remap_num_ids(root, num_map):
+    """Point every w:numPr/w:numId under root at num_map[old]. Returns the number changed."""
+    changed = 0
+    for el in root.iter(f"{W_NS}numId"):
+        new = num_map.get(el.get(f"{W_NS}val"))
+        if new is not None and new != el.get(f"{W_NS}val"):
+            el.set(f"{W_NS}val", new)
+            changed += 1
+    return changed
+
+def merge_numbering_openxml(src_pkg, out_pkg):
+    """
+    Bring the template's list definitions into the report's numbering part,
+    so template styles and header/footer parts copied by the OpenXML engines
+    keep their numbering. An abstractNum identical to one of the report's
+    (nsid/tmpl aside) is shared, and so is a w:num with the same abstractNum
+    and overrides; the rest are added under fresh ids above the report's. The
+    report's own ids never change, so its body needs no rewriting. The
+    numStyleLink/styleLink of the template's abstractNums follow the styles
+    to the ids they have (or get) in the report (see _plan_style_ids).
+    Returns ({template numId: report numId}, abstractNums added, abstractNums shared).
+    """
+    src_part = _document_part(src_pkg, REL_TYPE_NUMBERING)
+    if src_part is None:
+        return {}, 0, 0
+    src_root = src_pkg.xml(src_part)
+    style_map = {}
+    if STYLES_PART in src_pkg and STYLES_PART in out_pkg:
+        style_map = _plan_style_ids(src_pkg.xml(STYLES_PART), out_pkg.xml(STYLES_PART))[0]
+    dst_part = _document_part(out_pkg, REL_TYPE_NUMBERING)
+    if dst_part is None:
+        dst_part = _unique_part_name(out_pkg, NUMBERING_PART)
+        out_pkg.set_xml(dst_part, ET.Element(f"{W_NS}numbering"), [("w", W_NS[1:-1]), ("r", R_NS[1:-1])])
+        _relate_document_part(out_pkg, REL_TYPE_NUMBERING, dst_part)
+        _ensure_content_type(out_pkg.xml(CONTENT_TYPES_PART), dst_part, CT_NUMBERING)
+        out_pkg.touch(CONTENT_TYPES_PART)
+    dst_root = out_pkg.xml(dst_part)
+    skip_id = {f"{W_NS}abstractNumId"}
+
+    dst_abstracts = dst_root.findall(f"{W_NS}abstractNum")
+    dst_nums = dst_root.findall(f"{W_NS}num")
+    dst_pics = dst_root.findall(f"{W_NS}numPicBullet")
+    abstract_by_digest = {_numbering_digest(a, skip_id): a.get(f"{W_NS}abstractNumId") for a in dst_abstracts}
+    num_by_key = {}
+    for num in dst_nums:
+        ref = num.find(f"{W_NS}abstractNumId")
+        if ref is not None:
+            num_by_key.setdefault(_num_key(num, ref.get(f"{W_NS}val")), num.get(f"{W_NS}numId"))
+    next_abstract = max(_int_ids(dst_abstracts, "abstractNumId"), default=-1) + 1
+    next_num = max(_int_ids(dst_nums, "numId"), default=0) + 1
+    next_pic = max(_int_ids(dst_pics, "numPicBulletId"), default=-1) + 1
+
+    src_pics = {p.get(f"{W_NS}numPicBulletId"): p for p in src_root.findall(f"{W_NS}numPicBullet")}
+    pic_map, memo = {}, {}
+    abstract_map = {}
+    added = shared = 0
+    for abstract in src_root.findall(f"{W_NS}abstractNum"):
+        src_id = abstract.get(f"{W_NS}abstractNumId")
+        new = _deepcopy(abstract)
+        for link in (*new.iter(f"{W_NS}numStyleLink"), *new.iter(f"{W_NS}styleLink")):
+            if link.get(f"{W_NS}val") in style_map:
+                link.set(f"{W_NS}val", style_map[link.get(f"{W_NS}val")])
+        pictures = new.findall(f".//{W_NS}lvlPicBulletId")
+        digest = None if pictures else _numbering_digest(new, skip_id)  # picture ids are per document
+        if digest in abstract_by_digest:
+            abstract_map[src_id] = abstract_by_digest[digest]
+            shared += 1
+            continue
+        new.set(f"{W_NS}abstractNumId", str(next_abstract))
+        for ref in new.iter(f"{W_NS}lvlPicBulletId"):
+            pic_id = ref.get(f"{W_NS}val")
+            if pic_id not in pic_map and pic_id in src_pics:
+                pic = _deepcopy(src_pics[pic_id])
+                pic.set(f"{W_NS}numPicBulletId", str(next_pic))
+                _copy_rel_refs(pic, src_pkg, src_part, out_pkg, dst_part, memo)
+                dst_root.append(pic)
+                pic_map[pic_id] = str(next_pic)
+                next_pic += 1
+            if pic_id in pic_map:
+                ref.set(f"{W_NS}val", pic_map[pic_id])
+        dst_root.append(new)
+        abstract_map[src_id] = str(next_abstract)
+        if digest is not None:
+            abstract_by_digest[digest] = str(next_abstract)
+        next_abstract += 1
+        added += 1
+
+    num_map = {"0": "0"}  # numId 0 means "no numbering"
+    for num in src_root.findall(f"{W_NS}num"):
+        ref = num.find(f"{W_NS}abstractNumId")
+        if ref is None or ref.get(f"{W_NS}val") not in abstract_map:
+            continue
+        key = _num_key(num, abstract_map[ref.get(f"{W_NS}val")])
+        if key not in num_by_key:
+            new = _deepcopy(num)
+            new.set(f"{W_NS}numId", str(next_num))
+            new.find(f"{W_NS}abstractNumId").set(f"{W_NS}val", key[0])
+            dst_root.append(new)
+            num_by_key[key] = str(next_num)
+            next_num += 1
+        num_map[num.get(f"{W_NS}numId")] = num_by_key[key]
+
+    if added or len(num_map) > 1:
+        # numPicBullet, abstractNum and num each stay grouped, in schema order
+        dst_root[:] = sorted(dst_root, key=lambda el: NUMBERING_CHILD_RANK.get(el.tag, 3))
+        out_pkg.touch(dst_part)
+    return num_map, added, shared
+
+# --- OpenXML theme, font table and document defaults (no Word) ---
+THEME_SETTINGS_TAGS = ("themeFontLang", "clrSchemeMapping")
+FONT_EMBED_SETTINGS_TAGS = ("embedTrueTypeFonts", "embedSystemFonts", "saveSubsetFonts")
+
+def _delete_part_tree(pkg, part, keep=()):
+    """
+    Remove `part`, its .rels and the parts it references (theme images,
+    embedded fonts…), except those in `keep` (see _targeted_parts).
+    """
+    if part in keep:
+        return
+    ct_root = pkg.xml(CONTENT_TYPES_PART)
+    for name in [*pkg.related_parts(part).values(), _rels_name(part), part]:
+        if name in keep:
+            continue
+        if name in pkg:
+            pkg.delete(name)
+        _remove_content_type_override(ct_root, name)
+    pkg.touch(CONTENT_TYPES_PART)
+
+def _targeted_parts(pkg, ignore=()):
+    """Parts an internal relationship of the package targets, leaving out the relationships of the parts in `ignore`."""
+    ignored = {_rels_name(part) for part in ignore}
+    return {target for name in pkg if name.endswith(".rels") and name not in ignored
+            for target in pkg.related_parts(_rels_source(name)).values()}
+
+def _drop_rel_refs(elem, pkg, part):
+    """Remove the relationships behind elem's r:* attributes, and their parts (the reverse of _copy_rel_refs)."""
+    rels = pkg.relationships(part)
+    by_id = {rel.get("Id"): rel for rel in rels.findall(f"{PR_NS}Relationship")}
+    ct_root = pkg.xml(CONTENT_TYPES_PART)
+    for el in elem.iter():
+        for attr, rid in el.attrib.items():
+            rel = by_id.pop(rid, None) if attr.startswith(R_NS) else None
+            if rel is None:
+                continue
+            rels.remove(rel)
+            target = _resolve_target(part, rel.get("Target", ""))
+            if rel.get("TargetMode") != "External" and target in pkg:
+                pkg.delete(target)
+                _remove_content_type_override(ct_root, target)
+            pkg.touch(_rels_name(part))
+            pkg.touch(CONTENT_TYPES_PART)
+
+def transplant_theme_openxml(src_pkg, out_pkg):
+    """
+    Replace the report's theme part (colors, fonts and effects that styles
+    refer to as +mj-lt, accent1…) with the template's, images included.
+    Returns False when the template has no theme or the report's is the same.
+    """
+    src_part = _document_part(src_pkg, REL_TYPE_THEME)
+    if src_part is None:
         return False
+    dst_part = _document_part(out_pkg, REL_TYPE_THEME)
+    if dst_part is not None:
+        if (_rels_name(src_part) not in src_pkg and _rels_name(dst_part) not in out_pkg
+                and src_pkg.read(src_part) == out_pkg.read(dst_part)):
+            return False
+        _delete_part_tree(out_pkg, dst_part)
+    _relate_document_part(out_pkg, REL_TYPE_THEME, _copy_part_tree(src_pkg, src_part, out_pkg, {}))
+    if SETTINGS_PART in src_pkg and SETTINGS_PART in out_pkg:
+        _copy_schema_children(src_pkg.xml(SETTINGS_PART), out_pkg.xml(SETTINGS_PART),
+                              THEME_SETTINGS_TAGS, SETTINGS_CHILD_ORDER)
+        out_pkg.touch(SETTINGS_PART)
+    return True
 
-    new_docx = target_docx + ".tmp"
-    with zipfile.ZipFile(target_docx, "r") as zin, \
-         zipfile.ZipFile(new_docx, "w", zipfile.ZIP_DEFLATED) as zout:
-        for item in zin.infolist():
-            data = zin.read(item.filename)
-            if item.filename == "word/document.xml":
-                data = ET.tostring(root, encoding="utf-8", xml_declaration=True)
-            zout.writestr(item, data)
-    os.replace(new_docx, target_docx)
+def merge_font_table_openxml(src_pkg, out_pkg):
+    """
+    Merge the template's w:fonts into the report's: template entries replace
+    the report's entries of the same name, the report's other fonts stay.
+    Embedded fonts come along with their parts (and the settings that make
+    Word use them); the replaced entries' embedded fonts are removed.
+    Returns (fonts merged, embedded font parts copied).
+    """
+    src_part = _document_part(src_pkg, REL_TYPE_FONT_TABLE)
+    if src_part is None:
+        return 0, 0
+    fonts = src_pkg.xml(src_part).findall(f"{W_NS}font")
+    memo = {}
+    dst_part = _document_part(out_pkg, REL_TYPE_FONT_TABLE)
+    if dst_part is None:
+        _relate_document_part(out_pkg, REL_TYPE_FONT_TABLE, _copy_part_tree(src_pkg, src_part, out_pkg, memo))
+        del memo[src_part]
+    else:
+        dst_root = out_pkg.xml(dst_part)
+        dst_by_name = {font.get(f"{W_NS}name"): font for font in dst_root.findall(f"{W_NS}font")}
+        for font in fonts:
+            old = dst_by_name.get(font.get(f"{W_NS}name"))
+            new = _deepcopy(font)
+            if old is not None:
+                _drop_rel_refs(old, out_pkg, dst_part)
+            _copy_rel_refs(new, src_pkg, src_part, out_pkg, dst_part, memo)
+            if old is not None:
+                dst_root.insert(list(dst_root).index(old), new)
+                dst_root.remove(old)
+            else:
+                dst_root.append(new)
+        out_pkg.touch(dst_part)
+    if memo and SETTINGS_PART in src_pkg and SETTINGS_PART in out_pkg:
+        src_settings = src_pkg.xml(SETTINGS_PART)
+        for tag in FONT_EMBED_SETTINGS_TAGS:
+            el = src_settings.find(f"{W_NS}{tag}")
+            if el is not None:
+                _insert_schema_order(out_pkg.xml(SETTINGS_PART), _deepcopy(el), SETTINGS_CHILD_ORDER)
+        out_pkg.touch(SETTINGS_PART)
+    return len(fonts), len(memo)
+
+def transfer_look_openxml(src_pkg, out_pkg, doc_defaults=True):
+    """
+    The template's look without Word: its theme, its font table and (unless
+    doc_defaults is False, e.g. when the styles merge replaces them anyway)
+    its w:docDefaults. Returns (theme replaced, fonts merged, embedded fonts
+    copied, docDefaults replaced).
+    """
+    theme = transplant_theme_openxml(src_pkg, out_pkg)
+    fonts, embedded = merge_font_table_openxml(src_pkg, out_pkg)
+    defaults = False
+    if doc_defaults and STYLES_PART in src_pkg and STYLES_PART in out_pkg:
+        defaults = _replace_doc_defaults(src_pkg.xml(STYLES_PART), out_pkg.xml(STYLES_PART))
+        if defaults:
+            out_pkg.touch(STYLES_PART)
+    return theme, fonts, embedded, defaults
+
+# --- Style selection for the Organizer ---
+STYLE_REF_RE = re.compile(rb'<(?:\w+:)?(?:pStyle|rStyle|tblStyle|numStyleLink|styleLink)\b[^>]*?\bval="([^"]*)"')
+STORY_PART_RE = re.compile(r"/(?:header\d*|footer\d*|footnotes|endnotes|comments|numbering)\.xml$")
+STYLE_REF_TAGS = ("basedOn", "link", "next")
+
+def used_style_ids(pkg):
+    """styleIds referenced from the document body and its stories (headers, footers, notes, comments, numbering)."""
+    parts = [DOCUMENT_PART] + sorted(p for p in pkg.related_parts(DOCUMENT_PART).values()
+                                     if STORY_PART_RE.search(p) and p in pkg)
+    used = set()
+    for part in parts:
+        used.update(m.decode("utf-8") for m in STYLE_REF_RE.findall(pkg.read(part)))
+    return used
+
+class StyleIndex:
+    """
+    The styles of one package as the Organizer sees them: keyed by
+    (type, lower-cased w:name), each with a digest of its definition in which
+    ids and rsids are left out and basedOn/link/next point to names, so
+    the same style hashes alike in two documents. used: keys of the styles
+    referenced from the document, plus the default styles.
+    """
+
+    def __init__(self, pkg):
+        root = pkg.xml(STYLES_PART) if STYLES_PART in pkg else None
+        styles = root.findall(f"{W_NS}style") if root is not None else []
+        keys = {st.get(f"{W_NS}styleId"): (st.get(f"{W_NS}type", "paragraph"),
+                                            _style_name(st) or st.get(f"{W_NS}styleId", "").lower())
+                for st in styles}
+        self.digests = {}
+        self.refs = {}
+        for st in styles:
+            key = keys[st.get(f"{W_NS}styleId")]
+            self.digests[key] = hashlib.sha1(repr(self._canonical(st, keys)).encode("utf-8")).hexdigest()
+            self.refs[key] = [keys[ref.get(f"{W_NS}val")] for tag in STYLE_REF_TAGS
+                              for ref in st.findall(f"{W_NS}{tag}") if ref.get(f"{W_NS}val") in keys]
+        self.used = {keys[i] for i in used_style_ids(pkg) if i in keys}
+        self.used.update(keys[st.get(f"{W_NS}styleId")] for st in styles
+                         if st.get(f"{W_NS}default") in ("1", "true", "on"))
+
+    @staticmethod
+    def _canonical(el, keys):
+        if el.tag[len(W_NS):] in STYLE_REF_TAGS:
+            val = el.get(f"{W_NS}val")
+            return (el.tag, keys[val][1] if val in keys else val)
+        attrs = tuple(sorted((k, v) for k, v in el.attrib.items() if k != f"{W_NS}styleId"))
+        children = tuple(StyleIndex._canonical(c, keys) for c in el if c.tag != f"{W_NS}rsid")
+        return (el.tag, attrs, (el.text or "").strip(), children)
+
+def select_styles(src, dst):
+    """
+    Template styles worth copying into the report: in use in either document
+    (with the styles they are based on or linked to, followed through the
+    template) and missing from the report or defined differently there.
+    src, dst: StyleIndex of the template and of the report.
+    Returns the selected style names (lower case).
+    """
+    pending = [key for key in src.used | dst.used if key in src.digests]
+    in_use = set()
+    while pending:
+        key = pending.pop()
+        if key not in in_use:
+            in_use.add(key)
+            pending.extend(src.refs[key])
+    return {key[1] for key in in_use if dst.digests.get(key) != src.digests[key]}
+
+# Built-in styles English Word shows under another name than their w:name
+BUILTIN_STYLE_ALIASES = {
+    "table normal": "normal table", "comment text": "annotation text",
+    "comment reference": "annotation reference", "comment subject": "annotation subject",
+}
+
+def organizer_style_names(com_names, src, selected, defined=None):
+    """
+    The Word style names (NameLocal) to pass to OrganizerCopy for `selected`
+    (see select_styles). Each NameLocal is matched to a w:name on its own,
+    case-insensitively, ignoring aliases, directly or through
+    BUILTIN_STYLE_ALIASES. A name that matches nothing is a built-in that
+    styles.xml does not define - nothing to copy - once every template style
+    has been matched. Otherwise (e.g. a localized Word shows "Überschrift 1"
+    for "heading 1") defined(name) tells whether the template defines it;
+    without `defined` such names are kept, so nothing is dropped on a guess.
+    """
+    xml_names = {key[1] for key in src.digests}
+    matches = []
+    for name in com_names:
+        low = name.split(",")[0].strip().lower()
+        matches.append(low if low in xml_names else BUILTIN_STYLE_ALIASES.get(low))
+    unmatched = xml_names - set(matches)
+    names = []
+    for name, match in zip(com_names, matches):
+        if match is not None:
+            keep = match in selected
+        else:
+            keep = bool(unmatched) and (defined is None or defined(name))
+        if keep:
+            names.append(name)
+    return names
+
+# --- OpenXML page setup (no Word) ---
+# Every section property the template decides; the report keeps its header/footer
+# references (see the hf engines), section break type, paper trays, revisions and,
+# like the COM engine, its page and line numbering and footnote/endnote properties
+PAGE_SETUP_SECTPR_TAGS = (
+    "pgSz", "pgMar", "pgBorders", "cols", "vAlign", "titlePg", "textDirection", "bidi", "rtlGutter",
+    "docGrid",
+)
+PAGE_SETUP_SETTINGS_TAGS = ("mirrorMargins", "evenAndOddHeaders", "printTwoOnOne", "gutterAtTop")
+
+def _source_section_index(i, src_count, section_map):
+    """1-based SOURCE section applied to OUTPUT section i."""
+    return i if (section_map and i <= src_count) else 1
+
+def _copy_schema_children(src_parent, dst_parent, tags, order):
+    """Make dst_parent's `tags` children equal to src_parent's (absent in source means removed), in one pass."""
+    replacements = {}
+    for tag in tags:
+        src_el = src_parent.find(f"{W_NS}{tag}") if src_parent is not None else None
+        replacements[f"{W_NS}{tag}"] = _deepcopy(src_el) if src_el is not None else None
+    _merge_schema_children(dst_parent, replacements, order)
+
+def copy_page_setup_openxml(src_pkg, out_pkg, section_map=False):
+    """
+    COM-free replacement for the COM section loop: every target w:sectPr gets
+    the PAGE_SETUP_SECTPR_TAGS of its template section (page size and margins,
+    borders, columns, vertical alignment, title page, text direction, document
+    grid) in a single merge per section during the one streaming pass, and the
+    document-wide mirrorMargins / evenAndOddHeaders / printTwoOnOne /
+    gutterAtTop settings are copied.
+    Returns the number of template sections available.
+    """
+    src_sects = src_pkg.section_properties(first_only=not section_map)
+    if not src_sects:
+        return 0
+
+    def patch(sectpr, index):
+        if index is None:
+            return False
+        src = src_sects[_source_section_index(index, len(src_sects), section_map) - 1]
+        _copy_schema_children(src, sectpr, PAGE_SETUP_SECTPR_TAGS, SECTPR_CHILD_ORDER)
+        return True
+    out_pkg.patch_sections(patch)
+
+    if SETTINGS_PART in out_pkg:
+        src_settings = src_pkg.xml(SETTINGS_PART) if SETTINGS_PART in src_pkg else None
+        _copy_schema_children(src_settings, out_pkg.xml(SETTINGS_PART),
+                              PAGE_SETUP_SETTINGS_TAGS, SETTINGS_CHILD_ORDER)
+        out_pkg.touch(SETTINGS_PART)
+    return len(src_sects)
+
+# --- Section direction (right-to-left reports) ---
+SECTION_DIRECTION_TAGS = ("bidi", "rtlGutter", "textDirection")
+# Laid out relative to the direction (column order, border sides), so they move with it
+SECTION_DIRECTION_GROUP = ("pgBorders", "cols") + SECTION_DIRECTION_TAGS
+LTR = (False, False, "lrTb")
+
+def _section_direction(sectpr):
+    """(right-to-left, gutter on the right, text flow) of a w:sectPr."""
+    if sectpr is None:
+        return LTR
+    flow = sectpr.find(f"{W_NS}textDirection")
+    return (_on(sectpr.find(f"{W_NS}bidi")), _on(sectpr.find(f"{W_NS}rtlGutter")),
+            flow.get(f"{W_NS}val", "lrTb") if flow is not None else "lrTb")
+
+def describe_direction(direction):
+    rtl, rtl_gutter, flow = direction
+    text = f"{'right-to-left' if rtl else 'left-to-right'}, gutter {'right' if rtl_gutter else 'left'}"
+    return text if flow == "lrTb" else f"{text}, text flow {flow}"
+
+def section_direction_mismatches(src_pkg, dst_pkg, section_map=False):
+    """
+    Report sections whose direction differs from the template section applied
+    to them. Only the w:sectPr elements are read (streamed), nothing is written.
+    Returns [(report section, template section, template direction, report direction)].
+    """
+    src_dirs = [_section_direction(sp) for sp in src_pkg.section_properties(first_only=not section_map)]
+    if not src_dirs:
+        return []
+    mismatches = []
+    for i, sectpr in enumerate(dst_pkg.section_properties(), 1):
+        s_idx = _source_section_index(i, len(src_dirs), section_map)
+        have = _section_direction(sectpr)
+        if have != src_dirs[s_idx - 1]:
+            mismatches.append((i, s_idx, src_dirs[s_idx - 1], have))
+    return mismatches
+
+def copy_section_direction_openxml(src_pkg, out_pkg, section_map=False):
+    """
+    The direction half of copy_page_setup_openxml, for the COM page setup
+    engine (Word sets SectionDirection and GutterPos, but not the columns and
+    borders that depend on them): every target section whose template section
+    is not plain left-to-right, or whose direction differs from it, gets the
+    template's SECTION_DIRECTION_GROUP. Returns the number of sections scheduled.
+    """
+    src_sects = src_pkg.section_properties(first_only=not section_map)
+    if not src_sects:
+        return 0
+    src_dirs = [_section_direction(sp) for sp in src_sects]
+    targets = {}
+    for i, sectpr in enumerate(out_pkg.section_properties(), 1):
+        s_idx = _source_section_index(i, len(src_sects), section_map)
+        if src_dirs[s_idx - 1] != LTR or _section_direction(sectpr) != src_dirs[s_idx - 1]:
+            targets[i] = src_sects[s_idx - 1]
+    if not targets:
+        return 0
+
+    def patch(sectpr, index):
+        if index not in targets:
+            return False
+        _copy_schema_children(targets[index], sectpr, SECTION_DIRECTION_GROUP, SECTPR_CHILD_ORDER)
+        return True
+    out_pkg.patch_sections(patch)
+    return len(targets)
+
+# --- OpenXML header/footer parts (no Word) ---
+HF_REFERENCE_TAGS = (f"{W_NS}headerReference", f"{W_NS}footerReference")
+HF_TYPES = ("default", "first", "even")
+
+def _effective_hf_references(sectprs, rel_targets):
+    """
+    Per section, {(reference tag, type): part name}. A section without a
+    reference of some type inherits the previous section's, as Word does.
+    """
+    current, result = {}, []
+    for sectpr in sectprs:
+        for ref in list(sectpr):
+            if ref.tag in HF_REFERENCE_TAGS:
+                part = rel_targets.get(ref.get(f"{R_NS}id"))
+                if part:
+                    current[(ref.tag, ref.get(f"{W_NS}type", "default"))] = part
+        result.append(dict(current))
+    return result
+
+# Anything that makes a header/footer story visible; a story with none of these is empty
+HF_CONTENT_TAGS = frozenset(f"{W_NS}{tag}" for tag in (
+    "drawing", "pict", "object", "fldSimple", "instrText", "sym", "tab", "ptab",
+    "tbl", "sdt", "pBdr", "shd", "footnoteReference", "endnoteReference"))
+HF_COPY, HF_CLEAR, HF_SKIP = "copy", "clear", "skip"
+
+def _on(el):
+    """A present on/off element (w:titlePg, w:evenAndOddHeaders, …) that is not switched off."""
+    return el is not None and el.get(f"{W_NS}val", "true") not in ("0", "false", "off")
+
+def _drawing_styles(pkg):
+    """
+    styleIds of the paragraph styles that draw something even in an empty
+    paragraph: a border or shading of their own or inherited through basedOn
+    (e.g. a "Header" style with a bottom rule).
+    """
+    if STYLES_PART not in pkg:
+        return frozenset()
+    styles = {st.get(f"{W_NS}styleId"): st for st in pkg.xml(STYLES_PART).findall(f"{W_NS}style")
+              if st.get(f"{W_NS}type", "paragraph") == "paragraph"}
+
+    def draws(style_id, seen):
+        st = styles.get(style_id)
+        if st is None or style_id in seen:
+            return False
+        ppr = st.find(f"{W_NS}pPr")
+        if ppr is not None and (ppr.find(f"{W_NS}pBdr") is not None or ppr.find(f"{W_NS}shd") is not None):
+            return True
+        based_on = st.find(f"{W_NS}basedOn")
+        return based_on is not None and draws(based_on.get(f"{W_NS}val"), seen | {style_id})
+    return frozenset(style_id for style_id in styles if draws(style_id, frozenset()))
+
+def _story_is_empty(root, drawing_styles=frozenset()):
+    """No HF_CONTENT_TAGS, no text and no paragraph in one of drawing_styles (see _drawing_styles)."""
+    for el in root.iter():
+        if el.tag in HF_CONTENT_TAGS or (el.tag == f"{W_NS}t" and el.text):
+            return False
+        if el.tag == f"{W_NS}pStyle" and el.get(f"{W_NS}val") in drawing_styles:
+            return False
     return True
 
-def patch_art_page_borders(source_docx, output_docx):
-    pg = _extract_pgBorders_from_source(source_docx)
-    if pg is None:
+def plan_headers_footers(pkg):
+    """
+    Pre-scan of the template's header/footer stories, one tuple of actions per
+    section aligned with HF_STORIES: HF_SKIP for First/Even stories the section
+    never shows (no w:titlePg / no w:evenAndOddHeaders), HF_CLEAR for stories
+    that are missing or empty (nothing visible, not even a border or shading
+    from the paragraph style), HF_COPY for the rest.
+    """
+    sectprs = pkg.section_properties()
+    refs = _effective_hf_references(sectprs, pkg.related_parts(DOCUMENT_PART))
+    settings = pkg.xml(SETTINGS_PART) if SETTINGS_PART in pkg else None
+    even_pages = settings is not None and _on(settings.find(f"{W_NS}evenAndOddHeaders"))
+    empty = {}
+    plan = []
+    drawing_styles = None
+    for sectpr, section_refs in zip(sectprs, refs):
+        title_page = _on(sectpr.find(f"{W_NS}titlePg"))
+        actions = []
+        for kind, t in HF_STORIES:
+            if (t == 2 and not title_page) or (t == 3 and not even_pages):
+                actions.append(HF_SKIP)
+                continue
+            tag = HF_REFERENCE_TAGS[0] if kind == "Headers" else HF_REFERENCE_TAGS[1]
+            part = section_refs.get((tag, HF_TYPES[t - 1]))
+            if part is not None and part not in empty:
+                if drawing_styles is None:
+                    drawing_styles = _drawing_styles(pkg)
+                empty[part] = part not in pkg or _story_is_empty(pkg.xml(part), drawing_styles)
+            actions.append(HF_CLEAR if part is None or empty[part] else HF_COPY)
+        plan.append(tuple(actions))
+    return plan
+
+def copy_headers_footers_openxml(src_pkg, out_pkg, section_map=False, num_map=None):
+    """
+    COM-free copy_headers_footers: copy the template's header*/footer*.xml parts
+    (with their images and other related parts) into the output package once,
+    and point each target w:sectPr's header/footer references at the shared
+    copies. The report's own header/footer parts are removed, with the images
+    and other parts only they referenced.
+    num_map: as for _merge_styles_xml, applied to the copied parts.
+    Returns the number of header/footer parts copied.
+    """
+    src_refs = _effective_hf_references(src_pkg.section_properties(first_only=not section_map),
+                                        src_pkg.related_parts(DOCUMENT_PART))
+    if not src_refs:
+        return 0
+
+    dst_rels = out_pkg.relationships(DOCUMENT_PART)
+    old_rels = [rel for rel in dst_rels.findall(f"{PR_NS}Relationship")
+                if rel.get("Type") in (REL_TYPE_HEADER, REL_TYPE_FOOTER)]
+    memo, new_rids = {}, {}
+    for refs in src_refs:
+        for (tag, _type), part in refs.items():
+            if part in new_rids or part not in src_pkg:
+                continue
+            new_part = _copy_part_tree(src_pkg, part, out_pkg, memo)
+            if num_map and _remap_num_ids(out_pkg.xml(new_part), num_map):
+                out_pkg.touch(new_part)
+            rid = _new_rel_id(dst_rels)
+            rel_type = REL_TYPE_HEADER if tag == f"{W_NS}headerReference" else REL_TYPE_FOOTER
+            ET.SubElement(dst_rels, f"{PR_NS}Relationship", {
+                "Id": rid, "Type": rel_type, "Target": _relative_target(DOCUMENT_PART, new_part),
+            })
+            new_rids[part] = rid
+
+    def patch(sectpr, index):
+        # Old references go everywhere, including tracked (sectPrChange / pPrChange)
+        # section properties, so the report's parts can be dropped safely.
+        for sp in sectpr.iter(f"{W_NS}sectPr"):
+            for ref in [ch for ch in sp if ch.tag in HF_REFERENCE_TAGS]:
+                sp.remove(ref)
+        if index is not None:
+            refs = src_refs[_source_section_index(index, len(src_refs), section_map) - 1]
+            pos = 0
+            for tag in HF_REFERENCE_TAGS:
+                for hf_type in HF_TYPES:
+                    part = refs.get((tag, hf_type))
+                    if part in new_rids:
+                        sectpr.insert(pos, ET.Element(tag, {f"{W_NS}type": hf_type, f"{R_NS}id": new_rids[part]}))
+                        pos += 1
+        return True
+    out_pkg.patch_sections(patch)
+
+    old_parts = []
+    for rel in old_rels:
+        dst_rels.remove(rel)
+        old_parts.append(_resolve_target(DOCUMENT_PART, rel.get("Target", "")))
+    out_pkg.touch(_rels_name(DOCUMENT_PART))
+    # A part some other relationship still targets (an image the body shows too) stays
+    keep = _targeted_parts(out_pkg, ignore=old_parts)
+    for old_part in old_parts:
+        _delete_part_tree(out_pkg, old_part, keep)
+    return len(new_rids)
+
+# ---------- Word instance pool ----------
+def _com_enter():
+    """
+    Join the COM multithreaded apartment so pooled Word proxies can be used from
+    whichever thread leases them. Returns False when the thread is already an
+    STA (proxies it creates then stay usable in that thread only).
+    """
+    if pythoncom is None:
+        return False
+    try:
+        pythoncom.CoInitializeEx(pythoncom.COINIT_MULTITHREADED)
+        return True
+    except pythoncom.com_error:
+        return False
+
+def _com_leave(entered):
+    if entered:
+        pythoncom.CoUninitialize()
+
+def _dispatch_word():
+    if DispatchEx is None:
+        raise RuntimeError("Microsoft Word automation (pywin32) is not available on this system.")
+    return DispatchEx("Word.Application")
+
+def _word_alive(word):
+    try:
+        word.Version
+        word.Documents.Count
+        return True
+    except Exception:
+        return False
+
+def _quiet_word(word):
+    try:
+        word.DisplayAlerts = 0
+        word.ScreenUpdating = False
+        word.EnableEvents = False
+    except Exception: pass
+
+class _MtaKeepAlive:
+    """
+    A thread that stays in the COM multithreaded apartment until stopped. The
+    MTA only exists while some thread is in it, and proxies created in it die
+    with it; this keeps pooled instances usable between leases made from
+    short-lived threads (each GUI run is a new QThread).
+    """
+
+    def __init__(self):
+        self._stop = threading.Event()
+        ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(ready,), name="WordPool-MTA", daemon=True)
+        self._thread.start()
+        ready.wait()
+
+    def _run(self, ready):
+        entered = _com_enter()
+        ready.set()
+        try:
+            self._stop.wait()
+        finally:
+            _com_leave(entered)
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+class _PooledWord:
+    __slots__ = ("app", "jobs", "saves")
+
+    def __init__(self, app):
+        self.app = app
+        self.jobs = 0
+        self.saves = SaveMethods()
+
+class WordPool:
+    """
+    Long-lived Word.Application instances shared across transfers.
+
+    Up to `size` instances are launched on demand with DispatchEx (a private
+    WINWORD.EXE each, never the user's running Word), health-checked before
+    every lease, and recycled after `max_jobs` jobs or when a job raised.
+    `factory` creates an instance; pass a stand-in object model to use the
+    pool without Word.
+
+    Instances live in the COM multithreaded apartment, which the pool keeps
+    alive (see _MtaKeepAlive) until it is closed and every instance has quit,
+    so lease() works from any thread that is not already a single-threaded
+    apartment, and close() from any thread at all.
+
+        with WordPool(size=2) as pool:
+            transfer_layout(src, tgt, out, pool=pool)
+    """
+
+    def __init__(self, size=1, max_jobs=25, factory=None, log=lambda m: None):
+        if size < 1:
+            raise ValueError("WordPool size must be at least 1")
+        self.size = size
+        self.max_jobs = max_jobs
+        self._factory = factory or _dispatch_word
+        self._log = log
+        self._idle = []
+        self._leased = {}   # id(app) -> _PooledWord
+        self._live = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._mta = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _launch(self):
+        self._log("[INFO] Launching Word instance for the pool…")
+        app = self._factory()
+        app.Visible = False
+        _quiet_word(app)
+        return _PooledWord(app)
+
+    @staticmethod
+    def _healthy(entry):
+        return _word_alive(entry.app)
+
+    def _retire(self, entry):
+        try:
+            for i in range(entry.app.Documents.Count, 0, -1):
+                entry.app.Documents(i).Close(False)
+        except Exception: pass
+        try: entry.app.Quit()
+        except Exception: pass
+        with self._cond:
+            self._live -= 1
+            self._cond.notify()
+        self._release_mta()
+
+    def _hold_mta(self):
+        if pythoncom is None:
+            return
+        with self._cond:
+            if self._mta is None and not self._closed:
+                self._mta = _MtaKeepAlive()
+
+    def _release_mta(self):
+        with self._cond:
+            if not (self._closed and self._live == 0 and self._mta is not None):
+                return
+            mta, self._mta = self._mta, None
+        mta.stop()
+
+    def _retire_all(self, entries):
+        entered = _com_enter()
+        try:
+            for entry in entries:
+                self._retire(entry)
+        finally:
+            _com_leave(entered)
+
+    def _acquire(self, timeout):
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("WordPool is closed")
+                if self._idle:
+                    entry = self._idle.pop()
+                    break
+                if self._live < self.size:
+                    self._live += 1
+                    entry = None
+                    break
+                if not self._cond.wait(timeout):
+                    raise TimeoutError("No Word instance became available")
+        if entry is None:
+            try:
+                return self._launch()
+            except BaseException:
+                with self._cond:
+                    self._live -= 1
+                    self._cond.notify()
+                raise
+        if not self._healthy(entry):
+            self._log("[WARN] Pooled Word instance is unresponsive; replacing it.")
+            self._retire(entry)
+            return self._acquire(timeout)
+        return entry
+
+    def _release(self, entry, failed):
+        entry.jobs += 1
+        if failed or entry.jobs >= self.max_jobs:
+            reason = "after an error" if failed else f"after {entry.jobs} jobs"
+            self._log(f"[INFO] Recycling pooled Word instance {reason}.")
+            self._retire(entry)
+            return
+        try:
+            for i in range(entry.app.Documents.Count, 0, -1):
+                entry.app.Documents(i).Close(False)
+        except Exception:
+            self._retire(entry)
+            return
+        with self._cond:
+            if self._closed:
+                retire = True
+            else:
+                retire = False
+                self._idle.append(entry)
+                self._cond.notify()
+        if retire:
+            self._retire(entry)
+
+    @contextlib.contextmanager
+    def lease(self, timeout=None):
+        """Borrow a healthy Word.Application for one job."""
+        self._hold_mta()
+        entered = _com_enter()
+        try:
+            entry = self._acquire(timeout)
+            with self._cond:
+                self._leased[id(entry.app)] = entry
+            failed = True
+            try:
+                yield entry.app
+                failed = False
+            finally:
+                with self._cond:
+                    self._leased.pop(id(entry.app), None)
+                self._release(entry, failed)
+        finally:
+            _com_leave(entered)
+
+    def save_methods(self, app):
+        """The SaveMethods cache of a leased instance (it lives as long as the instance)."""
+        with self._cond:
+            entry = self._leased.get(id(app))
+        return entry.saves if entry is not None else SaveMethods()
+
+    def close(self):
+        """Quit every idle instance; instances still leased are quit when returned."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        # The proxies belong to the MTA: quit them from a thread in it, whatever
+        # apartment the caller is in (the GUI thread is an STA)
+        worker = threading.Thread(target=self._retire_all, args=(idle,), name="WordPool-close")
+        worker.start()
+        worker.join()
+        self._release_mta()
+
+# ---------- COM call tracing ----------
+COM_LATENCY_BUCKETS_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 1000)
+_PLAIN_TYPES = (type(None), bool, int, float, complex, str, bytes, tuple, list)
+_METHOD_TYPES = (types.FunctionType, types.MethodType, types.BuiltinFunctionType, functools.partial)
+# Generic helpers that only touch COM on behalf of their caller, and the
+# frames comprehensions get before Python 3.12: round trips made inside them
+# are charged to the first frame outside
+_TRACE_TRANSPARENT = frozenset({_read_props.__code__})
+_COMPREHENSION_NAMES = frozenset({"<listcomp>", "<setcomp>", "<dictcomp>", "<genexpr>"})
+
+def _trace_caller(depth=2):
+    """Name of the function `depth` frames up that made a COM round trip, skipping transparent frames."""
+    frame = sys._getframe(depth)
+    while frame.f_back is not None and (frame.f_code in _TRACE_TRANSPARENT
+                                        or frame.f_code.co_name in _COMPREHENSION_NAMES):
+        frame = frame.f_back
+    return frame.f_code.co_name
+
+class ComTrace:
+    """
+    Accounting for every COM round trip made through its proxies: property
+    gets, sets and method calls per calling function and per member, and a
+    latency histogram. Wrap the Word Application with wrap(); everything
+    reached from it is traced too.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.functions = {}   # calling function -> {"get": n, "set": n, "call": n, "seconds": s}
+        self.members = {}     # "get PageWidth" / "call OrganizerCopy" -> {"count": n, "seconds": s}
+        self.buckets = [0] * (len(COM_LATENCY_BUCKETS_MS) + 1)
+
+    def wrap(self, obj):
+        return _Traced(obj, self)
+
+    def record(self, kind, member, seconds, function):
+        fn = self.functions.setdefault(function, {"get": 0, "set": 0, "call": 0, "seconds": 0.0})
+        fn[kind] += 1
+        fn["seconds"] += seconds
+        m = self.members.setdefault(f"{kind} {member}", {"count": 0, "seconds": 0.0})
+        m["count"] += 1
+        m["seconds"] += seconds
+        self.buckets[bisect.bisect_left(COM_LATENCY_BUCKETS_MS, seconds * 1000.0)] += 1
+
+    def summary(self):
+        totals = {k: sum(fn[k] for fn in self.functions.values()) for k in ("get", "set", "call")}
+        seconds = sum(fn["seconds"] for fn in self.functions.values())
+        labels = [f"<={b}" for b in COM_LATENCY_BUCKETS_MS] + [f">{COM_LATENCY_BUCKETS_MS[-1]}"]
+        by_seconds = lambda item: -item[1]["seconds"]
+        return {
+            "round_trips": sum(totals.values()),
+            "gets": totals["get"],
+            "sets": totals["set"],
+            "calls": totals["call"],
+            "seconds": round(seconds, 6),
+            "by_function": {name: dict(fn, seconds=round(fn["seconds"], 6))
+                            for name, fn in sorted(self.functions.items(), key=by_seconds)},
+            "by_member": {name: dict(m, seconds=round(m["seconds"], 6))
+                          for name, m in sorted(self.members.items(), key=by_seconds)},
+            "latency_histogram_ms": dict(zip(labels, self.buckets)),
+        }
+
+    def log_summary(self, log, top=6):
+        s = self.summary()
+        log(f"[INFO] COM round trips: {s['round_trips']} ({s['gets']} gets, {s['sets']} sets, "
+            f"{s['calls']} calls) in {s['seconds']:.3f}s")
+        for name, fn in list(s["by_function"].items())[:top]:
+            log(f"  - {name}: {fn['get']} gets, {fn['set']} sets, {fn['call']} calls, {fn['seconds']:.3f}s")
+        hist = ", ".join(f"{k}ms: {n}" for k, n in s["latency_histogram_ms"].items() if n)
+        log(f"  - latency: {hist}")
+
+    def write_json(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, indent=2)
+
+def _untraced(value):
+    return object.__getattribute__(value, "_obj") if isinstance(value, _Traced) else value
+
+class _Traced:
+    """Transparent proxy over a COM object; see ComTrace."""
+    __slots__ = ("_obj", "_trace")
+
+    def __init__(self, obj, trace):
+        object.__setattr__(self, "_obj", obj)
+        object.__setattr__(self, "_trace", trace)
+
+    def _result(self, value):
+        if isinstance(value, _PLAIN_TYPES) or isinstance(value, _METHOD_TYPES):
+            return value
+        return _Traced(value, self._trace)
+
+    def __getattr__(self, name):
+        obj, trace = object.__getattribute__(self, "_obj"), object.__getattribute__(self, "_trace")
+        caller = _trace_caller()
+        t0 = time.perf_counter()
+        try:
+            value = getattr(obj, name)
+        except Exception:
+            trace.record("get", name, time.perf_counter() - t0, caller)
+            raise
+        if isinstance(value, _METHOD_TYPES):
+            return _TracedMethod(value, name, trace, caller)
+        trace.record("get", name, time.perf_counter() - t0, caller)
+        return self._result(value)
+
+    def __setattr__(self, name, value):
+        caller = _trace_caller()
+        t0 = time.perf_counter()
+        try:
+            setattr(self._obj, name, _untraced(value))
+        finally:
+            self._trace.record("set", name, time.perf_counter() - t0, caller)
+
+    def __call__(self, *args, **kwargs):
+        # Calling a collection is its default member, Item()
+        caller = _trace_caller()
+        t0 = time.perf_counter()
+        try:
+            value = self._obj(*[_untraced(a) for a in args], **{k: _untraced(v) for k, v in kwargs.items()})
+        finally:
+            self._trace.record("call", "Item", time.perf_counter() - t0, caller)
+        return self._result(value)
+
+    def __iter__(self):
+        caller = _trace_caller()
+        it = iter(self._obj)
+        while True:
+            t0 = time.perf_counter()
+            try:
+                value = next(it)
+            except StopIteration:
+                return
+            finally:
+                self._trace.record("call", "_NewEnum.Next", time.perf_counter() - t0, caller)
+            yield self._result(value)
+
+    def __len__(self):
+        return len(self._obj)
+
+    def __eq__(self, other):
+        return self._obj == _untraced(other)
+
+    def __hash__(self):
+        return hash(self._obj)
+
+    def __repr__(self):
+        return f"<traced {self._obj!r}>"
+
+class _TracedMethod:
+    __slots__ = ("_method", "_name", "_trace", "_caller")
+
+    def __init__(self, method, name, trace, caller):
+        self._method, self._name, self._trace, self._caller = method, name, trace, caller
+
+    def __call__(self, *args, **kwargs):
+        t0 = time.perf_counter()
+        try:
+            value = self._method(*[_untraced(a) for a in args], **{k: _untraced(v) for k, v in kwargs.items()})
+        finally:
+            self._trace.record("call", self._name, time.perf_counter() - t0, self._caller)
+        if isinstance(value, _PLAIN_TYPES) or isinstance(value, _METHOD_TYPES):
+            return value
+        return _Traced(value, self._trace)
+
+# ---------- .dotx conversion cache ----------
+def _default_cache_dir():
+    base = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "DocxTools", "dotx-cache")
+
+def _file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+class DotxCache:
+    """
+    Content-addressed store of the .dotx files Word converts templates to for
+    CopyStylesFromTemplate, keyed by the template's SHA-256 and the Word
+    version. Hits refresh the file's mtime; once the directory holds more
+    than max_bytes the least recently used files are evicted.
+    """
+
+    def __init__(self, directory=None, max_bytes=256 << 20):
+        self.directory = directory or _default_cache_dir()
+        self.max_bytes = max_bytes
+
+    def path_for(self, digest, word_version):
+        version = re.sub(r"[^\w.-]", "_", str(word_version))
+        return os.path.join(self.directory, f"{digest}-{version}.dotx")
+
+    def get(self, digest, word_version):
+        path = self.path_for(digest, word_version)
+        try:
+            os.utime(path)
+        except OSError:
+            return None
+        return path
+
+    def put(self, digest, word_version, dotx_path):
+        """Copy a freshly converted .dotx into the cache; returns the cached path."""
+        path = self.path_for(digest, word_version)
+        os.makedirs(self.directory, exist_ok=True)
+        partial = f"{path}.{os.getpid()}.{threading.get_ident()}.partial"
+        try:
+            shutil.copyfile(dotx_path, partial)
+            os.replace(partial, path)
+        finally:
+            try: os.remove(partial)
+            except OSError: pass
+        self._evict(keep=path)
+        return path
+
+    def _evict(self, keep):
+        entries = []
+        with os.scandir(self.directory) as it:
+            for e in it:
+                if e.name.endswith(".dotx"):
+                    try:
+                        st = e.stat()
+                    except OSError:
+                        continue
+                    entries.append((st.st_mtime, st.st_size, e.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass  # in use by another Word; try the next one
+
+_dotx_cache = None
+
+def default_dotx_cache():
+    global _dotx_cache
+    if _dotx_cache is None:
+        _dotx_cache = DotxCache()
+    return _dotx_cache
+
+# ---------- Scratch space ----------
+TEMP_DIR_ENV = "DOCX_LAYOUT_TEMP"
+
+def _remove_tree(path, attempts=5):
+    # Word can hold a file for a moment after Close; whatever still cannot be
+    # removed is retried once more when the process exits
+    for attempt in range(attempts):
+        shutil.rmtree(path, ignore_errors=True)
+        if not os.path.exists(path):
+            return True
+        time.sleep(0.05 * (attempt + 1))
+    atexit.register(shutil.rmtree, path, True)
+    return False
+
+class JobWorkspace:
+    """
+    Private scratch directory of one job, so concurrent transfers never share
+    a temp file name. It is created on the first file() call under base_dir
+    (default: $DOCX_LAYOUT_TEMP, else the system temp dir; point it at a RAM
+    disk to keep intermediate saves off the real disk) and removed with its
+    contents on exit, however the job ends.
+    """
+
+    def __init__(self, base_dir=None, prefix="docx_job_"):
+        self.base_dir = base_dir or os.environ.get(TEMP_DIR_ENV) or None
+        self.prefix = prefix
+        self.path = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cleanup()
+
+    def file(self, name):
+        """Path for `name` inside the workspace (the directory is made on first use)."""
+        if self.path is None:
+            if self.base_dir:
+                os.makedirs(self.base_dir, exist_ok=True)
+            self.path = tempfile.mkdtemp(prefix=self.prefix, dir=self.base_dir)
+        return os.path.join(self.path, name)
+
+    def cleanup(self):
+        if self.path is not None:
+            _remove_tree(self.path)
+            self.path = None
+
+# ---------- Template features ----------
+class TemplateFeatures:
+    """
+    Everything taken from the template, prepared once and shared by every
+    report of a batch: the OpenXML package (parts are parsed once and cached),
+    its artistic page borders and, per Word session, the opened Document, its
+    style names and a .dotx copy for CopyStylesFromTemplate.
+    dotx_cache: a DotxCache reused across runs (None: default_dotx_cache(),
+    False: convert once per TemplateFeatures only).
+    temp_dir: base directory of every JobWorkspace used for this template.
+    """
+
+    def __init__(self, source_docx, dotx_cache=None, temp_dir=None):
+        self.path = os.path.abspath(os.path.expanduser(source_docx))
+        if not os.path.isfile(self.path):
+            raise FileNotFoundError(f"Source not found: {self.path}")
+        self.package = DocxPackage(self.path)
+        self.pg_borders = _extract_pgBorders_from_source(self.package)
+        self.dotx_cache = default_dotx_cache() if dotx_cache is None else dotx_cache
+        self.temp_dir = temp_dir
+        self._digest = None
+        self._hf_plan = None
+        self._style_index = None
+        self.document = None
+        self._style_names = None
+        self._defined = {}
+        self._word = None
+        self._dotx = None
+        self._workspace = JobWorkspace(self.temp_dir, prefix="docx_layout_")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __getstate__(self):
+        # Pickled for worker processes: the template's bytes, not the open zip or any Word state
+        with open(self.path, "rb") as f:
+            data = f.read()
+        return {"path": self.path, "data": data, "pg_borders": self.pg_borders, "temp_dir": self.temp_dir}
+
+    @classmethod
+    def from_state(cls, state):
+        features = cls.__new__(cls)
+        features.__setstate__(state)
+        return features
+
+    def __setstate__(self, state):
+        self.path = state["path"]
+        self.package = DocxPackage(io.BytesIO(state["data"]))
+        self.pg_borders = state["pg_borders"]
+        self.dotx_cache = False  # workers never run Word
+        self.temp_dir = state.get("temp_dir")
+        self._digest = None
+        self._hf_plan = None
+        self._style_index = None
+        self.document = None
+        self._style_names = None
+        self._defined = {}
+        self._word = None
+        self._dotx = None
+        self._workspace = JobWorkspace(self.temp_dir, prefix="docx_layout_")
+
+    @property
+    def digest(self):
+        """SHA-256 of the template file."""
+        if self._digest is None:
+            self._digest = _file_sha256(self.path)
+        return self._digest
+
+    @property
+    def hf_plan(self):
+        """plan_headers_footers() of the template, computed on first use."""
+        if self._hf_plan is None:
+            self._hf_plan = plan_headers_footers(self.package)
+        return self._hf_plan
+
+    @property
+    def style_index(self):
+        """StyleIndex of the template, computed on first use."""
+        if self._style_index is None:
+            self._style_index = StyleIndex(self.package)
+        return self._style_index
+
+    def open_in_word(self, word):
+        """Open the template read-only in `word` (once per Word instance) and return the Document."""
+        if self.document is not None and self._word is word:
+            return self.document
+        self.release_word()
+        self.document = word.Documents.Open(FileName=self.path, ReadOnly=True,
+                                            AddToRecentFiles=False, ConfirmConversions=False,
+                                            Revert=False, Visible=False, OpenAndRepair=False,
+                                            NoEncodingDialog=True)
+        self._word = word
+        return self.document
+
+    @property
+    def style_names(self):
+        """Names of the template's Word styles (see _style_names), listed on first use only."""
+        if self._style_names is None:
+            self._style_names = _style_names(self.document)
+        return self._style_names
+
+    def style_defined(self, name):
+        """
+        Whether the template itself defines the Word style `name`: a custom
+        style, or a built-in it uses or has changed (latent built-ins are not
+        in use). Asked once per name and template.
+        """
+        if name not in self._defined:
+            try:
+                style = self.document.Styles(name)
+                self._defined[name] = not style.BuiltIn or bool(style.InUse)
+            except Exception:
+                self._defined[name] = True
+        return self._defined[name]
+
+    def release_word(self):
+        if self.document is not None:
+            try: self.document.Close(False)
+            except Exception: pass
+        self.document = None
+        self._word = None
+
+    def style_dotx(self, saves=None):
+        """Path of a .dotx converted from the opened template; from the cache, or made on first use."""
+        if self._dotx is None:
+            version = None
+            if self.dotx_cache:
+                try: version = self._word.Version
+                except Exception: pass
+            if version is not None:
+                self._dotx = self.dotx_cache.get(self.digest, version)
+            if self._dotx is None:
+                path = self._workspace.file("style_source.dotx")
+                save_dotx(self.document, path, saves)
+                self._dotx = path
+                if version is not None:
+                    try: self._dotx = self.dotx_cache.put(self.digest, version, path)
+                    except OSError: pass
+        return self._dotx
+
+    def close(self):
+        self.release_word()
+        self.package.close()
+        self._workspace.cleanup()
+        self._dotx = None
+
+STYLE_ENGINES = ("organizer", "openxml")
+PAGE_SETUP_ENGINES = ("com", "openxml")
+HF_ENGINES = ("com", "linked", "openxml")
+
+def _check_engines(style_engine, page_setup_engine, hf_engine):
+    if style_engine not in STYLE_ENGINES:
+        raise ValueError(f"Unknown style engine: {style_engine!r}")
+    if page_setup_engine not in PAGE_SETUP_ENGINES:
+        raise ValueError(f"Unknown page setup engine: {page_setup_engine!r}")
+    if hf_engine not in HF_ENGINES:
+        raise ValueError(f"Unknown header/footer engine: {hf_engine!r}")
+
+def needs_word(style_engine, page_setup_engine, hf_engine):
+    """False when every stage runs on OpenXML, so no Word instance is involved at all."""
+    return not (style_engine == "openxml" and page_setup_engine == "openxml" and hf_engine == "openxml")
+
+FICLONE = 0x40049409  # linux/fs.h
+
+def _clone_file(src, dst):
+    """
+    Copy src to dst as a copy-on-write clone where the filesystem can
+    (Linux FICLONE: btrfs, XFS, …), else as a plain copy. Returns True if cloned.
+    On Windows shutil.copyfile goes through CopyFile2, which block-clones on
+    ReFS / Dev Drive by itself.
+    """
+    if fcntl is not None and sys.platform.startswith("linux"):
+        try:
+            with open(src, "rb") as fs, open(dst, "wb") as fd:
+                fcntl.ioctl(fd.fileno(), FICLONE, fs.fileno())
+            return True
+        except OSError:
+            pass
+    shutil.copyfile(src, dst)
+    return False
+
+def can_copy_working_copy(target_docx):
+    """A .docx report can become the working copy by a file copy; anything else needs Word to convert it."""
+    return target_docx.lower().endswith(".docx") and zipfile.is_zipfile(target_docx)
+
+def make_working_copy(target_docx, output_docx):
+    """Working copy without Word: the report's bytes cloned/copied to the output path. Returns True if cloned."""
+    if not can_copy_working_copy(target_docx):
+        raise ValueError(f"Not a .docx package (Word is needed to convert it): {target_docx}")
+    dir_ = os.path.dirname(output_docx)
+    if dir_ and not os.path.isdir(dir_):
+        os.makedirs(dir_, exist_ok=True)
+    if os.path.normcase(os.path.abspath(target_docx)) == os.path.normcase(os.path.abspath(output_docx)):
         return False
-    return _set_pgBorders_in_all_sections(output_docx, pg)
+    return _clone_file(target_docx, output_docx)
 
-def transfer_layout(source_docx, target_docx, output_docx, visible=False, section_map=False, log=lambda m: None):
+def transfer_layout(source_docx, target_docx, output_docx, visible=False, section_map=False, log=lambda m: None,
+                    style_engine="organizer", page_setup_engine="com", hf_engine="com", pool=None,
+                    trace_path=None, dotx_cache=None, temp_dir=None, look=True):
+    """
+    style_engine: "organizer" copies styles through Word (Organizer, then
+    CopyStylesFromTemplate); "openxml" merges word/styles.xml directly after
+    Word has closed the output.
+    page_setup_engine: "com" sets PageSetup per section through Word; "openxml"
+    rewrites the output's w:sectPr elements instead (see copy_page_setup_openxml).
+    hf_engine: "com" pastes each header/footer story through Word; "linked"
+    pastes a story once and links the following sections that show the same
+    template story to it (LinkToPrevious); "openxml" copies the template's
+    header/footer parts into the output package.
+    pool: a WordPool to lease Word from instead of starting (and quitting) one.
+    With all three engines on "openxml" Word is not used at all; the basic line
+    page borders then come from the template's w:pgBorders like the artistic ones.
+    trace_path: trace every COM round trip (see ComTrace), log the summary and
+    write it to this JSON file.
+    dotx_cache, temp_dir: see TemplateFeatures.
+    look: also give the output the template's theme, fonts and document
+    defaults (see transfer_look_openxml); False keeps the report's own, except
+    for the document defaults style_engine "openxml" brings with the styles.
+    """
+    _check_engines(style_engine, page_setup_engine, hf_engine)
     # Normalize & validate
     source_docx = os.path.abspath(os.path.expanduser(source_docx))
     target_docx = os.path.abspath(os.path.expanduser(target_docx))
@@ -232,86 +2761,494 @@ def transfer_layout(source_docx, target_docx, output_docx, visible=False, sectio
     log(f"[INFO] TARGET: {target_docx}")
     log(f"[INFO] OUTPUT: {output_docx}")
 
-    pythoncom.CoInitialize()
-    word = Dispatch("Word.Application")
-    word.Visible = bool(visible)
-    try:
-        try:
-            word.DisplayAlerts = 0
-            word.ScreenUpdating = False
-            word.EnableEvents = False
-        except Exception: pass
+    trace = ComTrace() if trace_path else None
+    with TemplateFeatures(source_docx, dotx_cache, temp_dir) as features:
+        check_section_directions(features, target_docx, section_map, log)
+        com_args = (features, target_docx, output_docx, section_map, log,
+                    style_engine, page_setup_engine, hf_engine)
+        if not needs_word(style_engine, page_setup_engine, hf_engine):
+            log("[INFO] Creating working copy (Word not needed)…")
+            make_working_copy(target_docx, output_docx)
+        elif pool is not None:
+            with pool.lease() as word:
+                word.Visible = bool(visible)
+                try:
+                    _run_com_stages(trace.wrap(word) if trace else word, *com_args, pool.save_methods(word))
+                finally:
+                    features.release_word()
+        else:
+            if Dispatch is None:
+                raise RuntimeError("Microsoft Word automation (pywin32) is not available on this system.")
+
+            pythoncom.CoInitialize()
+            word = Dispatch("Word.Application")
+            word.Visible = bool(visible)
+            try:
+                _quiet_word(word)
+                _run_com_stages(trace.wrap(word) if trace else word, *com_args)
+            finally:
+                features.release_word()
+                log("[INFO] Quitting Word COM.")
+                try: word.Quit()
+                except Exception: pass
+                pythoncom.CoUninitialize()
 
-        log("[INFO] Opening documents in Word…")
-        src = word.Documents.Open(FileName=source_docx, ReadOnly=True,
-                                  AddToRecentFiles=False, ConfirmConversions=False,
-                                  Revert=False, Visible=False, OpenAndRepair=False,
-                                  NoEncodingDialog=True)
+        if trace is not None:
+            trace.log_summary(log)
+            trace.write_json(trace_path)
+
+        _run_openxml_stages(features, output_docx, section_map, log,
+                            style_engine, page_setup_engine, hf_engine, look)
+    return output_docx
+
+def check_section_directions(features, report, section_map, log):
+    """
+    Warn, before anything is written, about report sections whose direction
+    (right-to-left, gutter side, text flow) differs from their template
+    section: the template's is applied, but the report's paragraphs keep
+    their own direction. Returns the number of such sections.
+    """
+    if not can_copy_working_copy(report):
+        return 0
+    with DocxPackage(report) as pkg:
+        mismatches = section_direction_mismatches(features.package, pkg, section_map)
+    for i, s_idx, want, have in mismatches:
+        log(f"[WARN] Report Section({i}) is {describe_direction(have)}; "
+            f"template Section({s_idx}) is {describe_direction(want)}.")
+    return len(mismatches)
+
+def _run_com_stages(word, features, target_docx, output_docx, section_map, log,
+                    style_engine, page_setup_engine, hf_engine, saves=None):
+    saves = saves or SaveMethods()
+    log("[INFO] Opening documents in Word…")
+    src = features.open_in_word(word)
+
+    # The output is the working copy (so Organizer has a real path). A .docx is
+    # copied on disk and opened once; other formats go through a Word save.
+    if can_copy_working_copy(target_docx):
+        cloned = make_working_copy(target_docx, output_docx)
+        log(f"[INFO] Working copy created ({'reflink' if cloned else 'file copy'}).")
+    else:
         tgt = word.Documents.Open(FileName=target_docx, ReadOnly=False,
                                   AddToRecentFiles=False, ConfirmConversions=False,
                                   Revert=False, Visible=False, OpenAndRepair=False,
                                   NoEncodingDialog=True)
-
-        # Save target as output (so Organizer has a real path)
         log("[INFO] Creating working copy…")
-        save_docx(tgt, output_docx)
-
-        tgt.Close(False)
-        work = word.Documents.Open(FileName=output_docx, ReadOnly=False,
-                                   AddToRecentFiles=False, ConfirmConversions=False,
-                                   Revert=False, Visible=False, OpenAndRepair=False,
-                                   NoEncodingDialog=True)
-
         try:
-            # Styles first
+            save_docx(tgt, output_docx, saves)
+        finally:
+            tgt.Close(False)
+    style_names = None
+    if style_engine == "organizer":
+        style_names = _organizer_selection(features, output_docx, log)
+    work = word.Documents.Open(FileName=output_docx, ReadOnly=False,
+                               AddToRecentFiles=False, ConfirmConversions=False,
+                               Revert=False, Visible=False, OpenAndRepair=False,
+                               NoEncodingDialog=True)
+
+    # Removed only after work is closed: a fallback save leaves Word holding its file
+    scratch = JobWorkspace(features.temp_dir)
+    try:
+        # Styles first
+        if style_engine == "organizer":
             log("[INFO] Copying styles (Organizer)…")
-            moved = try_organizer_copy_all_styles(src, output_docx)
+            moved = try_organizer_copy_all_styles(src, output_docx, style_names)
             log(f"[INFO] Styles moved via Organizer: {moved}")
-            if moved == 0:
+            if moved == 0 and style_names:
                 log("[WARN] Organizer moved 0 styles. Using CopyStylesFromTemplate fallback…")
-                copy_styles_via_template(work, src)
+                copy_styles_via_template(work, src, features.style_dotx(saves))
                 log("[INFO] Styles copied via template.")
 
-            # Layout
-            log("[INFO] Copying layout…")
-            src_count, tgt_count = src.Sections.Count, work.Sections.Count
-            for i in range(1, tgt_count + 1):
-                s_idx = i if (section_map and i <= src_count) else 1
-                log(f"  - Applying SOURCE Section({s_idx}) -> OUTPUT Section({i})")
-                copy_page_setup(src.Sections(s_idx), work.Sections(i))
-                copy_page_borders_basic(src.Sections(s_idx), work.Sections(i))
-                copy_headers_footers(src.Sections(s_idx), work.Sections(i))
-
-            log("[INFO] Saving before XML patch…")
-            try:
-                work.Save()
-            except Exception:
-                tmp = os.path.join(tempfile.gettempdir(), "docx_pre_patch.docx")
-                save_docx(work, tmp)
-                shutil.copy2(tmp, output_docx)
-
-        finally:
-            log("[INFO] Closing COM docs…")
-            try: src.Close(False)
-            except Exception: pass
-            try: work.Close(False)
-            except Exception: pass
+        # Layout: each source section is read once into a SectionLayout snapshot
+        log("[INFO] Copying layout…")
+        src_count, tgt_count = src.Sections.Count, work.Sections.Count
+        # The OpenXML page setup engine rewrites the borders too (w:pgBorders)
+        with_page_setup = page_setup_engine == "com"
+        layouts = {}
+        total_applied = total_skipped = 0
+        shown = None  # template story owners shown by the previous output section ("linked")
+        hf_plan = features.hf_plan if hf_engine != "openxml" else []
+        for i in range(1, tgt_count + 1):
+            s_idx = _source_section_index(i, src_count, section_map)
+            log(f"  - Applying SOURCE Section({s_idx}) -> OUTPUT Section({i})")
+            src_sec = src.Sections(s_idx)
+            if s_idx not in layouts:
+                layouts[s_idx] = SectionLayout.read(src_sec, with_page_setup, hf_engine != "openxml",
+                                                    s_idx, layouts.get(s_idx - 1), borders=with_page_setup)
+            wanted = layouts[s_idx]
+            dst_sec = work.Sections(i)
+            if with_page_setup:
+                applied, skipped = wanted.apply(dst_sec, SectionLayout.read(dst_sec))
+                log(f"    page setup/borders: {applied} applied, {skipped} already matching")
+                total_applied += applied
+                total_skipped += skipped
+            plan = hf_plan[s_idx - 1] if s_idx <= len(hf_plan) else None
+            if hf_engine == "com":
+                copied, cleared, skipped = copy_headers_footers(src_sec, dst_sec, plan)
+                log(f"    headers/footers: {copied} copied, {cleared} cleared, {skipped} unused in template")
+            elif hf_engine == "linked":
+                copied, cleared, linked, shown = link_headers_footers(src_sec, dst_sec, wanted.headers_footers,
+                                                                      shown, plan)
+                log(f"    headers/footers: {copied} copied, {cleared} cleared, {linked} linked to previous")
+        log(f"[INFO] Source sections read: {len(layouts)}; properties applied: {total_applied}, "
+            f"already matching: {total_skipped}")
+
+        log("[INFO] Saving before XML patch…")
+        try:
+            work.Save()
+        except Exception:
+            tmp = scratch.file("pre_patch.docx")
+            save_docx(work, tmp, saves)
+            shutil.copy2(tmp, output_docx)
 
     finally:
-        log("[INFO] Quitting Word COM.")
-        try: word.Quit()
+        log("[INFO] Closing COM docs…")
+        try: work.Close(False)
         except Exception: pass
-        pythoncom.CoUninitialize()
+        scratch.cleanup()
 
-    # OpenXML artistic border patch
-    log("[INFO] Patching artistic page borders via OpenXML…")
-    patched = patch_art_page_borders(source_docx, output_docx)
-    if patched:
-        log("[SUCCESS] Artistic page borders patched.")
-    else:
-        log("[WARN] No w:pgBorders found in source; nothing to patch.")
+def _organizer_selection(features, working_copy, log):
+    """Template style names worth an OrganizerCopy into working_copy (see select_styles)."""
+    try:
+        with DocxPackage(working_copy) as pkg:
+            selected = select_styles(features.style_index, StyleIndex(pkg))
+    except (zipfile.BadZipFile, ET.ParseError, KeyError) as e:
+        log(f"[WARN] Style selection unavailable ({type(e).__name__}); copying every style.")
+        return features.style_names
+    names = organizer_style_names(features.style_names, features.style_index, selected,
+                                  features.style_defined)
+    log(f"[INFO] Styles to copy: {len(names)} of {len(features.style_names)} "
+        f"({len(features.style_names) - len(names)} Organizer calls avoided: unused or unchanged).")
+    return names
+
+def _run_openxml_stages(features, output_docx, section_map, log,
+                        style_engine, page_setup_engine, hf_engine, look=True):
+    # OpenXML stages: registered on one package transaction, written once
+    src_pkg = features.package
+    with DocxPackage(output_docx) as out_pkg:
+        num_map = None
+        if style_engine == "openxml" or hf_engine == "openxml":
+            num_map, added, shared = merge_numbering_openxml(src_pkg, out_pkg)
+            if added or shared:
+                log(f"[INFO] List definitions merged via OpenXML: {added} added, {shared} shared with the report.")
+
+        if page_setup_engine == "openxml":
+            log("[INFO] Copying page setup via OpenXML…")
+            count = copy_page_setup_openxml(src_pkg, out_pkg, section_map=section_map)
+            log(f"[INFO] Page setup scheduled from {count} template section(s).")
+        else:
+            count = copy_section_direction_openxml(src_pkg, out_pkg, section_map=section_map)
+            if count:
+                log(f"[INFO] Section direction, columns and borders scheduled for {count} section(s).")
+
+        if hf_engine == "openxml":
+            log("[INFO] Copying headers/footers via OpenXML…")
+            count = copy_headers_footers_openxml(src_pkg, out_pkg, section_map=section_map, num_map=num_map)
+            log(f"[INFO] Header/footer parts copied: {count}")
+
+        if look:
+            log("[INFO] Copying theme, fonts and document defaults via OpenXML…")
+            theme, fonts, embedded, defaults = transfer_look_openxml(src_pkg, out_pkg,
+                                                                     doc_defaults=style_engine != "openxml")
+            log(f"[INFO] Theme {'replaced' if theme else 'unchanged'}; fonts merged: {fonts} "
+                f"({embedded} embedded){'; docDefaults replaced' if defaults else ''}.")
+
+        if style_engine == "openxml":
+            log("[INFO] Merging styles via OpenXML…")
+            moved = merge_styles_openxml(src_pkg, out_pkg, num_map)
+            log(f"[INFO] Styles merged via OpenXML: {moved}")
+
+        # OpenXML artistic border patch
+        log("[INFO] Patching artistic page borders via OpenXML…")
+        if features.pg_borders is not None:
+            _set_pgBorders_in_all_sections(out_pkg, features.pg_borders)
+            log("[SUCCESS] Artistic page borders patched.")
+        else:
+            log("[WARN] No w:pgBorders found in source; nothing to patch.")
+
+        out_pkg.commit()
+        if out_pkg.sections_patched:
+            log(f"[INFO] Sections rewritten in one streaming pass: {out_pkg.sections_patched}")
+
+# ---------- Batch mode ----------
+DEFAULT_OUTPUT_PATTERN = "{stem}_with_layout.docx"
+
+class _WordLost(Exception):
+    """The leased Word instance stopped responding in the middle of a batch."""
+
+def expand_reports(patterns, exclude=()):
+    """
+    Report paths from a list of files and/or glob patterns ("**" recurses),
+    absolute, de-duplicated and in a stable order. Word lock files (~$*) and
+    the paths in `exclude` (e.g. the template) are skipped.
+    """
+    skip = {os.path.normcase(os.path.abspath(p)) for p in exclude}
+    seen, reports = set(), []
+    for pattern in patterns:
+        pattern = os.path.expanduser(pattern)
+        matches = sorted(glob.glob(pattern, recursive=True)) if glob.has_magic(pattern) else [pattern]
+        for path in matches:
+            path = os.path.abspath(path)
+            key = os.path.normcase(path)
+            if key in seen or key in skip or os.path.basename(path).startswith("~$"):
+                continue
+            if glob.has_magic(pattern) and not os.path.isfile(path):
+                continue
+            seen.add(key)
+            reports.append(path)
+    return reports
+
+def plan_outputs(reports, output_dir=None, pattern=DEFAULT_OUTPUT_PATTERN):
+    """
+    [(report, output), ...]. `pattern` is formatted with {stem}, {name}
+    (file name) and {index} (1-based); outputs go next to each report unless
+    `output_dir` is given. Clashing names get " (2)", " (3)", … appended.
+    """
+    jobs, taken = [], set()
+    for index, report in enumerate(reports, 1):
+        name = os.path.basename(report)
+        out_name = pattern.format(stem=os.path.splitext(name)[0], name=name, index=index)
+        out = os.path.abspath(os.path.join(output_dir or os.path.dirname(report), out_name))
+        base, ext = os.path.splitext(out)
+        n = 1
+        while os.path.normcase(out) in taken or os.path.normcase(out) == os.path.normcase(report):
+            n += 1
+            out = f"{base} ({n}){ext}"
+        taken.add(os.path.normcase(out))
+        jobs.append((report, out))
+    return jobs
+
+def transfer_batch(source_docx, reports, output_dir=None, pattern=DEFAULT_OUTPUT_PATTERN,
+                   visible=False, section_map=False, log=lambda m: None,
+                   style_engine="organizer", page_setup_engine="com", hf_engine="com",
+                   pool=None, summary_path=None, jobs=1, progress=None, trace=False, dotx_cache=None,
+                   temp_dir=None, look=True):
+    """
+    Apply one template to many reports. The template is opened, its styles
+    listed, its page borders extracted and its .dotx saved once per batch;
+    each report then only pays for its own work. A failing report is recorded
+    and the batch carries on (with a fresh Word instance if Word itself died).
+
+    reports: paths and/or glob patterns (see expand_reports).
+    jobs: worker processes for an all-OpenXML batch (see needs_word); batches
+    that need Word run one report at a time.
+    progress: called as progress(done, total, entry) after each report, in
+    report order.
+    trace: trace the COM round trips of every report (see ComTrace); each
+    report's entry then carries them under "com".
+    dotx_cache, temp_dir, look: see TemplateFeatures and transfer_layout.
+    Returns the summary dict, also written as JSON to `summary_path` if given:
+    template, timings in seconds, and one entry per report with its output,
+    status ("ok"/"failed"), seconds, error and direction_mismatches (see
+    check_section_directions).
+    """
+    _check_engines(style_engine, page_setup_engine, hf_engine)
+    started = time.perf_counter()
+    source_docx = os.path.abspath(os.path.expanduser(source_docx))
+    planned = plan_outputs(expand_reports(reports, exclude=[source_docx]), output_dir, pattern)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
 
-    return output_docx
+    summary = {"template": source_docx, "reports": [], "succeeded": 0, "failed": 0}
+    log(f"[INFO] SOURCE: {source_docx}")
+    log(f"[INFO] Reports in batch: {len(planned)}")
+
+    if progress is None:
+        progress = lambda done, total, entry: None
+    options = (section_map, style_engine, page_setup_engine, hf_engine, look)
+    t0 = time.perf_counter()
+    with TemplateFeatures(source_docx, dotx_cache, temp_dir) as features:
+        summary["template_seconds"] = round(time.perf_counter() - t0, 3)
+        if not needs_word(style_engine, page_setup_engine, hf_engine):
+            _batch_openxml(features, planned, options, summary, log, progress, jobs)
+        else:
+            if jobs > 1:
+                log("[WARN] Word stages run one report at a time; --jobs applies to all-OpenXML batches only.")
+            _batch_word(features, planned, options, summary, log, progress, pool, visible, trace)
+
+    summary["succeeded"] = sum(1 for r in summary["reports"] if r["status"] == "ok")
+    summary["failed"] = len(summary["reports"]) - summary["succeeded"]
+    summary["total_seconds"] = round(time.perf_counter() - started, 3)
+    log(f"[INFO] Batch finished: {summary['succeeded']} ok, {summary['failed']} failed "
+        f"in {summary['total_seconds']:.1f}s.")
+    if summary_path:
+        with open(summary_path, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+    return summary
+
+def _batch_word(features, jobs, options, summary, log, progress, pool, visible, trace):
+    own_pool = pool is None
+    if own_pool:
+        pool = WordPool(size=1, log=log)
+    tracer = ComTrace() if trace else None
+    try:
+        pending = list(jobs)
+        while pending:
+            try:
+                with pool.lease() as word:
+                    word.Visible = bool(visible)
+                    saves = pool.save_methods(word)
+                    if tracer is not None:
+                        word = tracer.wrap(word)
+                    try:
+                        t0 = time.perf_counter()
+                        features.open_in_word(word)
+                        summary["template_seconds"] += round(time.perf_counter() - t0, 3)
+                        while pending:
+                            report, output = pending.pop(0)
+                            n = len(jobs) - len(pending)
+                            if tracer is not None:
+                                tracer.reset()
+                            entry = _batch_job(word, features, report, output, n, len(jobs), options, log, saves)
+                            if tracer is not None:
+                                tracer.log_summary(log)
+                                entry["com"] = tracer.summary()
+                            summary["reports"].append(entry)
+                            progress(n, len(jobs), entry)
+                            if entry["status"] != "ok" and not _word_alive(word):
+                                raise _WordLost()
+                    finally:
+                        features.release_word()
+            except _WordLost:
+                log("[WARN] Word stopped responding; restarting it for the remaining reports.")
+            except Exception as e:
+                # Word could not be (re)started or could not open the template:
+                # nothing left can run, but the batch still gets its summary
+                error = f"{type(e).__name__}: {e}"
+                log(f"[ERROR] Word is not available, {len(pending)} report(s) not processed: {error}")
+                while pending:
+                    report, output = pending.pop(0)
+                    entry = _batch_entry(report, output, error)
+                    summary["reports"].append(entry)
+                    progress(len(jobs) - len(pending), len(jobs), entry)
+    finally:
+        if own_pool:
+            pool.close()
+
+def _batch_entry(report, output, error=None):
+    """A report's summary entry; failed with `error` if given."""
+    return {"report": report, "output": output, "status": "failed" if error else "ok", "seconds": 0.0,
+            "error": error, "direction_mismatches": 0}
+
+def _batch_job(word, features, report, output, n, total, options, log, saves=None):
+    """One report of a batch; word=None runs the COM-free pipeline. Never raises."""
+    section_map, style_engine, page_setup_engine, hf_engine, look = options
+    log(f"[INFO] ({n}/{total}) TARGET: {report}")
+    log(f"[INFO] ({n}/{total}) OUTPUT: {output}")
+    entry = _batch_entry(report, output)
+    t0 = time.perf_counter()
+    try:
+        if not os.path.isfile(report):
+            raise FileNotFoundError(f"Target not found: {report}")
+        entry["direction_mismatches"] = check_section_directions(features, report, section_map, log)
+        if word is None:
+            make_working_copy(report, output)
+        else:
+            _run_com_stages(word, features, report, output, section_map, log,
+                            style_engine, page_setup_engine, hf_engine, saves)
+        _run_openxml_stages(features, output, section_map, log,
+                            style_engine, page_setup_engine, hf_engine, look)
+    except Exception as e:
+        entry["status"] = "failed"
+        entry["error"] = f"{type(e).__name__}: {e}"
+        log(f"[ERROR] ({n}/{total}) {report}: {entry['error']}")
+    entry["seconds"] = round(time.perf_counter() - t0, 3)
+    return entry
+
+def _batch_openxml(features, jobs, options, summary, log, progress, workers):
+    total = len(jobs)
+    workers = max(1, min(workers, total))
+    if workers == 1:
+        for n, (report, output) in enumerate(jobs, 1):
+            entry = _batch_job(None, features, report, output, n, total, options, log)
+            summary["reports"].append(entry)
+            progress(n, total, entry)
+        return
+
+    log(f"[INFO] Running {total} report(s) on {workers} worker processes…")
+    tasks = [(n, total, report, output) for n, (report, output) in enumerate(jobs, 1)]
+    done = 0
+    try:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=_init_openxml_worker,
+                                                    initargs=(features.__getstate__(), options)) as ex:
+            # map() yields in submission order, so logs and progress stay in report order
+            for entry, lines in ex.map(_openxml_worker_job, tasks):
+                for line in lines:
+                    log(line)
+                summary["reports"].append(entry)
+                done += 1
+                progress(done, total, entry)
+    except concurrent.futures.process.BrokenProcessPool as e:
+        # A worker died (crash, out of memory): the reports it had not returned yet are lost
+        error = f"{type(e).__name__}: {e}"
+        log(f"[ERROR] A worker process stopped, {total - done} report(s) not processed: {error}")
+        for report, output in jobs[done:]:
+            entry = _batch_entry(report, output, error)
+            summary["reports"].append(entry)
+            done += 1
+            progress(done, total, entry)
+
+# Per-process state of the batch worker pool, set once by the initializer
+_worker_features = None
+_worker_options = None
+
+def _init_openxml_worker(state, options):
+    # Rebuilt from its state even when the worker was forked: an inherited
+    # TemplateFeatures would share the parent's zip file offset
+    global _worker_features, _worker_options
+    _worker_features, _worker_options = TemplateFeatures.from_state(state), options
+
+def _openxml_worker_job(task):
+    n, total, report, output = task
+    lines = []
+    entry = _batch_job(None, _worker_features, report, output, n, total, _worker_options, lines.append)
+    return entry, lines
+
+def cli(argv=None):
+    """Command-line batch mode; returns the process exit code (1 if any report failed)."""
+    ap = argparse.ArgumentParser(
+        prog="docx_layout_copier batch",
+        description="Apply one template's layout, styles and headers/footers to many reports.")
+    ap.add_argument("template", help="template .docx")
+    ap.add_argument("reports", nargs="+", help="report .docx files or glob patterns (quote them; ** recurses)")
+    ap.add_argument("-o", "--output-dir", help="write outputs here instead of next to each report")
+    ap.add_argument("-p", "--pattern", default=DEFAULT_OUTPUT_PATTERN,
+                    help="output file name; {stem}, {name} and {index} are substituted (default: %(default)s)")
+    ap.add_argument("--section-map", action="store_true", help="map template Section i to report Section i")
+    ap.add_argument("--visible", action="store_true", help="show the Word UI while running")
+    ap.add_argument("--style-engine", choices=STYLE_ENGINES, default="organizer")
+    ap.add_argument("--page-setup-engine", choices=PAGE_SETUP_ENGINES, default="com")
+    ap.add_argument("--hf-engine", choices=HF_ENGINES, default="com")
+    ap.add_argument("--no-look", action="store_true",
+                    help="keep each report's theme, fonts and document defaults instead of the template's")
+    ap.add_argument("-j", "--jobs", type=int, default=1,
+                    help="worker processes when all engines are openxml (default: %(default)s)")
+    ap.add_argument("--trace", action="store_true",
+                    help="count every COM round trip per report and add it to the summary")
+    ap.add_argument("--dotx-cache", metavar="DIR",
+                    help="where converted template .dotx files are cached (default: per-user cache)")
+    ap.add_argument("--no-dotx-cache", action="store_true", help="do not reuse .dotx conversions across runs")
+    ap.add_argument("--temp-dir", metavar="DIR",
+                    help="scratch directory for intermediate files, e.g. a RAM disk "
+                         f"(default: ${TEMP_DIR_ENV} or the system temp dir)")
+    ap.add_argument("--summary", help="write the batch summary (timings, failures) as JSON here")
+    ap.add_argument("-q", "--quiet", action="store_true", help="only print errors and the final summary line")
+    args = ap.parse_args(argv)
+
+    def log(msg):
+        if not args.quiet or msg.startswith(("[ERROR]", "[INFO] Batch finished")):
+            print(msg, flush=True)
+
+    summary = transfer_batch(args.template, args.reports, output_dir=args.output_dir, pattern=args.pattern,
+                             visible=args.visible, section_map=args.section_map, log=log,
+                             style_engine=args.style_engine, page_setup_engine=args.page_setup_engine,
+                             hf_engine=args.hf_engine, summary_path=args.summary, jobs=max(1, args.jobs),
+                             trace=args.trace, temp_dir=args.temp_dir, look=not args.no_look,
+                             dotx_cache=False if args.no_dotx_cache else (DotxCache(args.dotx_cache) if args.dotx_cache else None))
+    if not summary["reports"]:
+        print("[ERROR] No reports matched.", file=sys.stderr)
+        return 2
+    return 1 if summary["failed"] else 0
 
 # ---------- Dark MessageBox helper ----------
 class DarkMessageBox(QtWidgets.QMessageBox):
@@ -353,13 +3290,14 @@ class TransferWorker(QtCore.QThread):
     finishedOk = QtCore.Signal(str)
     failed = QtCore.Signal(str)
 
-    def __init__(self, template, report, output, section_map, show_ui, parent=None):
+    def __init__(self, template, report, output, section_map, show_ui, pool=None, parent=None):
         super().__init__(parent)
         self.template = template
         self.report = report
         self.output = output
         self.section_map = section_map
         self.show_ui = show_ui
+        self.pool = pool
 
     def run(self):
         try:
@@ -368,7 +3306,8 @@ class TransferWorker(QtCore.QThread):
                 self.template, self.report, self.output,
                 visible=self.show_ui,
                 section_map=self.section_map,
-                log=log
+                log=log,
+                pool=self.pool
             )
             self.finishedOk.emit(out)
         except Exception as e:
@@ -382,6 +3321,7 @@ class MainWindow(QtWidgets.QMainWindow):
         self.setWindowTitle("DOCX Layout Copier | TF-Dena AI Section | version 1.0")
         self.resize(780, 580)
         self.setMinimumSize(720, 540)
+        self._wordPool = None
 
         # Apply dark palette + styles (no global style/attribute calls here)
         self.apply_dark_theme()
@@ -645,13 +3585,25 @@ class MainWindow(QtWidgets.QMainWindow):
             report=report,
             output=out_path,
             section_map=self.sectionMapChk.isChecked(),
-            show_ui=self.showUiChk.isChecked()
+            show_ui=self.showUiChk.isChecked(),
+            pool=self.word_pool()
         )
         self.worker.progressed.connect(self.appendLog)
         self.worker.finishedOk.connect(self.onDone)
         self.worker.failed.connect(self.onFail)
         self.worker.start()
 
+    def word_pool(self):
+        # One warm Word instance reused across runs; started on the first run
+        if self._wordPool is None and DispatchEx is not None:
+            self._wordPool = WordPool(size=1)
+        return self._wordPool
+
+    def closeEvent(self, event):
+        if self._wordPool is not None:
+            self._wordPool.close()
+        super().closeEvent(event)
+
     @QtCore.Slot(str)
     def appendLog(self, msg):
         self.logView.appendPlainText(msg)
@@ -677,7 +3629,17 @@ class MainWindow(QtWidgets.QMainWindow):
         show_error(self, "Error", "Operation failed.\n\n" + err)
 
 # ---------- entry ----------
+BATCH_COMMAND = "batch"
+
 def main():
+    # A frozen build re-runs this exe for each batch worker process; those
+    # invocations must be handled before anything looks at the arguments
+    multiprocessing.freeze_support()
+    # Batch mode is an explicit subcommand: other arguments (a file dropped on
+    # the exe, Qt's own options) still open the GUI
+    if len(sys.argv) > 1 and sys.argv[1] == BATCH_COMMAND:
+        sys.exit(cli(sys.argv[2:]))
+
     # Create the app FIRST
     app = QtWidgets.QApplication(sys.argv)
 
@@ -0,0 +1,72 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+docx = pytest.importorskip("docx")
+from docx.enum.section import WD_ORIENT, WD_SECTION
+from docx.shared import Cm, Pt
+
+import main
+
+
+def make_template(path):
+    d = docx.Document()
+    style = d.styles.add_style("Corp Title", 1)
+    style.font.size = Pt(30)
+    style.base_style = d.styles["Heading 1"]
+    d.styles["Normal"].font.name = "Tahoma"
+    d.add_paragraph("Hello", style="Corp Title")
+    s = d.sections[0]
+    s.left_margin = Cm(3)
+    s.gutter = Cm(1)
+    s.different_first_page_header_footer = True
+    s.header.paragraphs[0].text = "TEMPLATE HEADER"
+    s.first_page_header.paragraphs[0].text = "FIRST HDR"
+    s.footer.paragraphs[0].text = "TEMPLATE FOOTER"
+    s.header.add_paragraph().add_run().add_picture(os.path.join(ROOT, "app_gui.png"), width=Cm(2))
+    s2 = d.add_section(WD_SECTION.NEW_PAGE)
+    s2.orientation = WD_ORIENT.LANDSCAPE
+    s2.page_width, s2.page_height = s2.page_height, s2.page_width
+    d.add_paragraph("landscape")
+    d.save(path)
+    return str(path)
+
+
+def make_report(path, sections=3, header_image=False):
+    d = docx.Document()
+    for i in range(sections):
+        d.add_paragraph(f"Report para {i}", style="Heading 1" if i % 2 else None)
+        if i < sections - 1:
+            d.add_section(WD_SECTION.NEW_PAGE)
+    header = d.sections[0].header
+    header.paragraphs[0].text = "OLD REPORT HEADER"
+    if header_image:
+        header.add_paragraph().add_run().add_picture(os.path.join(ROOT, "app_gui.png"), width=Cm(1))
+    d.save(path)
+    return str(path)
+
+
+def set_section_children(path, children):
+    """children: {1-based section index: [element, ...]} merged into that w:sectPr."""
+    with main.DocxPackage(path) as pkg:
+        def patch(sectpr, index):
+            for el in children.get(index, ()):
+                main._insert_schema_order(sectpr, el, main.SECTPR_CHILD_ORDER)
+            return index in children
+        pkg.patch_sections(patch)
+        pkg.commit()
+
+
+@pytest.fixture(scope="session")
+def template(tmp_path_factory):
+    return make_template(tmp_path_factory.mktemp("docs") / "template.docx")
+
+
+@pytest.fixture(scope="session")
+def report(tmp_path_factory):
+    return make_report(tmp_path_factory.mktemp("docs") / "report.docx")
@@ -0,0 +1,88 @@
+import json
+import os
+
+import fake_word
+import main
+from conftest import make_report
+
+
+def test_word_that_cannot_start_fails_the_batch_with_a_summary(tmp_path, template):
+    reports = [make_report(tmp_path / f"r{i}.docx") for i in range(2)]
+    summary_path = tmp_path / "summary.json"
+
+    def factory():
+        raise fake_word.FakeComError("Server execution failed")
+
+    with main.WordPool(factory=factory) as pool:
+        summary = main.transfer_batch(template, reports, output_dir=str(tmp_path / "out"), pool=pool,
+                                      summary_path=str(summary_path))
+    assert (summary["succeeded"], summary["failed"]) == (0, 2)
+    assert [r["report"] for r in summary["reports"]] == reports
+    assert all("Server execution failed" in r["error"] for r in summary["reports"])
+    assert json.loads(summary_path.read_text(encoding="utf-8"))["failed"] == 2
+
+
+def test_word_that_cannot_restart_fails_the_remaining_reports(tmp_path, template):
+    reports = [str(tmp_path / "missing.docx")] + [make_report(tmp_path / f"r{i}.docx") for i in range(2)]
+    summary_path = tmp_path / "summary.json"
+
+    class DyingWord(fake_word.FakeWord):
+        dead = False
+
+        @property
+        def Version(self):
+            if self.dead:
+                raise fake_word.FakeComError("RPC_E_DISCONNECTED")
+            return "16.0"
+
+    words = []
+
+    def factory():
+        if words:
+            raise fake_word.FakeComError("Server execution failed")
+        words.append(DyingWord())
+        return words[0]
+
+    def progress(done, total, entry):
+        words[0].dead = True
+
+    with main.WordPool(factory=factory) as pool:
+        summary = main.transfer_batch(template, reports, output_dir=str(tmp_path / "out"), pool=pool,
+                                      summary_path=str(summary_path), progress=progress)
+    assert [r["status"] for r in summary["reports"]] == ["failed"] * 3
+    assert "FileNotFoundError" in summary["reports"][0]["error"]
+    assert all("Server execution failed" in r["error"] for r in summary["reports"][1:])
+    assert json.loads(summary_path.read_text(encoding="utf-8"))["failed"] == 3
+
+
+def test_template_styles_are_listed_once_per_batch(tmp_path, template):
+    reports = [make_report(tmp_path / f"r{i}.docx") for i in range(3)]
+    word = fake_word.FakeWord()
+    with main.WordPool(factory=lambda: word) as pool:
+        summary = main.transfer_batch(template, reports, output_dir=str(tmp_path / "out"), pool=pool)
+    assert summary["failed"] == 0
+    with main.DocxPackage(template) as pkg:
+        defined = len(main.StyleIndex(pkg).digests)
+    assert word.stats()["by_member"]["get NameLocal"] == defined
+
+
+def crashing_worker_job(task):
+    if task[0] == 2:
+        os._exit(1)
+    return main._openxml_worker_job(task)
+
+
+def test_crashed_worker_fails_the_remaining_reports(tmp_path, template, monkeypatch):
+    reports = [make_report(tmp_path / f"r{i}.docx") for i in range(3)]
+    summary_path = tmp_path / "summary.json"
+    monkeypatch.setattr(main, "_openxml_worker_job", crashing_worker_job)
+    seen = []
+    summary = main.transfer_batch(template, reports, output_dir=str(tmp_path / "out"), jobs=2,
+                                  style_engine="openxml", page_setup_engine="openxml", hf_engine="openxml",
+                                  summary_path=str(summary_path),
+                                  progress=lambda done, total, entry: seen.append(done))
+    assert [r["report"] for r in summary["reports"]] == reports
+    assert summary["failed"] >= 2
+    assert all("BrokenProcessPool" in r["error"] for r in summary["reports"][1:])
+    assert seen == [1, 2, 3]
+    assert json.loads(summary_path.read_text(encoding="utf-8"))["failed"] == summary["failed"]
@@ -0,0 +1,112 @@
+import json
+
+import fake_word
+import main
+from conftest import make_report
+
+
+class Obj:
+    def __init__(self, **props):
+        self.__dict__.update(props)
+
+    def Child(self):
+        return Obj(Name="child")
+
+    def __call__(self, index):
+        return Obj(Index=index)
+
+    def __iter__(self):
+        return iter([Obj(Index=1), Obj(Index=2)])
+
+
+def reader(com):
+    return com.Width, com.Height
+
+
+def writer(com):
+    com.Width = 10
+
+
+def caller(com):
+    return com.Child().Name, com(3).Index
+
+
+def iterator(com):
+    return [item.Index for item in com]
+
+
+def via_helper(com):
+    return main._read_props(com, ("Width", "Height", "Missing"))
+
+
+def test_counts_and_attribution():
+    trace = main.ComTrace()
+    com = trace.wrap(Obj(Width=1.0, Height=2.0))
+    assert reader(com) == (1.0, 2.0)
+    writer(com)
+    assert caller(com) == ("child", 3)
+    assert iterator(com) == [1, 2]
+
+    s = trace.summary()
+    fns = s["by_function"]
+    assert {k: fns["reader"][k] for k in ("get", "set", "call")} == {"get": 2, "set": 0, "call": 0}
+    assert {k: fns["writer"][k] for k in ("get", "set", "call")} == {"get": 0, "set": 1, "call": 0}
+    # A method call is one round trip; reading the method is not another
+    assert {k: fns["caller"][k] for k in ("get", "set", "call")} == {"get": 2, "set": 0, "call": 2}
+    assert {k: fns["iterator"][k] for k in ("get", "set", "call")} == {"get": 2, "set": 0, "call": 3}
+    assert {name: m["count"] for name, m in s["by_member"].items()} == {
+        "get Width": 1, "get Height": 1, "set Width": 1, "call Child": 1, "get Name": 1,
+        "call Item": 1, "get Index": 3, "call _NewEnum.Next": 3}
+    assert (s["gets"], s["sets"], s["calls"]) == (6, 1, 5)
+    assert s["round_trips"] == 12 == sum(s["latency_histogram_ms"].values())
+
+
+def test_helper_reads_charged_to_caller():
+    trace = main.ComTrace()
+    com = trace.wrap(Obj(Width=1.234, Height=2.0))
+    assert via_helper(com) == (("Width", 1.23), ("Height", 2.0))
+    fns = trace.summary()["by_function"]
+    assert list(fns) == ["via_helper"]
+    # The failed read is still a round trip
+    assert fns["via_helper"]["get"] == 3
+
+
+def test_latency_buckets():
+    trace = main.ComTrace()
+    for seconds in (0.0, 0.00005, 0.001, 0.0011, 0.3, 2.0):
+        trace.record("get", "Width", seconds, "f")
+    hist = trace.summary()["latency_histogram_ms"]
+    assert list(hist) == [f"<={b}" for b in main.COM_LATENCY_BUCKETS_MS] + [">1000"]
+    assert {k: n for k, n in hist.items() if n} == {"<=0.05": 2, "<=1": 1, "<=2.5": 1, "<=1000": 1, ">1000": 1}
+
+
+def test_reset():
+    trace = main.ComTrace()
+    writer(trace.wrap(Obj()))
+    trace.reset()
+    s = trace.summary()
+    assert s["round_trips"] == 0 and s["by_function"] == {} and s["by_member"] == {}
+    assert not any(s["latency_histogram_ms"].values())
+
+
+def test_transfer_writes_json(tmp_path, template):
+    report = make_report(tmp_path / "report.docx")
+    trace_path = tmp_path / "trace.json"
+    word = fake_word.FakeWord()
+    lines = []
+    with main.WordPool(factory=lambda: word) as pool:
+        main.transfer_layout(template, report, str(tmp_path / "out.docx"), pool=pool,
+                             trace_path=str(trace_path), log=lines.append)
+
+    data = json.loads(trace_path.read_text(encoding="utf-8"))
+    assert set(data) == {"round_trips", "gets", "sets", "calls", "seconds",
+                         "by_function", "by_member", "latency_histogram_ms"}
+    assert data["round_trips"] == data["gets"] + data["sets"] + data["calls"] > 0
+    assert data["round_trips"] == sum(data["latency_histogram_ms"].values())
+    assert data["gets"] == sum(fn["get"] for fn in data["by_function"].values())
+    # Every round trip the fake saw went through the proxy
+    assert data["by_member"]["set LeftMargin"]["count"] == word.stats()["by_member"]["set LeftMargin"]
+    # Section reads show up under SectionLayout.read, not the property helper
+    assert "_read_props" not in data["by_function"]
+    assert data["by_function"]["read"]["get"] >= 3 * len(main.PAGE_SETUP_PROPS)
+    assert any(line.startswith("[INFO] COM round trips: ") for line in lines)
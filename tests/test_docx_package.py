@@ -0,0 +1,233 @@
+import os
+import random
+import zipfile
+
+import pytest
+
+import main
+
+ET = main.ET
+W = main.W_NS
+ORDER = main.SECTPR_CHILD_ORDER
+EXT = "{urn:example:ext}ext"
+
+
+def chunked(data, rng, max_size=97):
+    i = 0
+    while i < len(data):
+        n = rng.randint(1, max_size)
+        yield data[i:i + n]
+        i += n
+
+
+# --- _merge_schema_children ---
+
+def test_merge_schema_children_random_layouts():
+    rng = random.Random(1)
+    for _ in range(3000):
+        tags = sorted(rng.sample(ORDER, rng.randint(0, 8)), key=ORDER.index)
+        qualified = [W + t for t in tags]
+        if rng.random() < 0.3:
+            qualified.insert(rng.randint(0, len(qualified)), EXT)
+        parent = ET.Element(f"{W}sectPr")
+        for tag in qualified:
+            ET.SubElement(parent, tag)
+        replacements = {W + t: (ET.Element(W + t, {"new": "1"}) if rng.random() < 0.7 else None)
+                        for t in rng.sample(main.PAGE_SETUP_SECTPR_TAGS, rng.randint(1, 5))}
+        kept = [child for child in parent if child.tag not in replacements]
+
+        main._merge_schema_children(parent, replacements, ORDER)
+
+        result = list(parent)
+        assert [c for c in result if c.get("new") is None] == kept
+        assert sorted(c.tag for c in result if c.get("new")) == \
+            sorted(tag for tag, el in replacements.items() if el is not None)
+        ranks = [ORDER.index(c.tag[len(W):]) for c in result if c.tag != EXT]
+        assert ranks == sorted(ranks)
+        if EXT in qualified:
+            # The extension stays right before the known child that followed it
+            pos = qualified.index(EXT)
+            after = next((t for t in qualified[pos + 1:] if t not in replacements), None)
+            if after is not None:
+                tags_out = [c.tag for c in result]
+                assert tags_out[tags_out.index(EXT) + 1] == after
+
+
+# --- streaming w:sectPr scanner ---
+
+def random_document(rng):
+    """(document.xml bytes, live sectPr count, tracked sectPr count, has final body sectPr)."""
+    p = rng.choice(["w", "ns0", "wx"])
+    uri = W[1:-1]
+
+    def sectpr(n):
+        attrs = f' {p}:rsidR="00{n:06d}"' if rng.random() < 0.5 else ""
+        if rng.random() < 0.2:
+            return f"<{p}:sectPr{attrs}/>"
+        kids = "".join(f'<{p}:{t} {p}:val="{n}"/>' for t in sorted(rng.sample(ORDER, rng.randint(1, 4)), key=ORDER.index))
+        if rng.random() < 0.2:
+            kids += f'<{p}:headerReference {p}:type="default" r:id="rId{n}">  </{p}:headerReference>'
+        return f"<{p}:sectPr{attrs}>{kids}</{p}:sectPr>"
+
+    body, live, tracked = [], 0, 0
+    for i in range(rng.randint(0, 12)):
+        kind = rng.random()
+        text = "x" * rng.randint(0, 200)
+        if kind < 0.3:
+            live += 1
+            body.append(f"<{p}:p><{p}:pPr>{sectpr(i)}</{p}:pPr><{p}:r><{p}:t>{text}</{p}:t></{p}:r></{p}:p>")
+        elif kind < 0.4:
+            tracked += 1
+            body.append(f'<{p}:p><{p}:pPr><{p}:pPrChange {p}:id="{i}"><{p}:pPr>{sectpr(i)}</{p}:pPr>'
+                        f"</{p}:pPrChange></{p}:pPr></{p}:p>")
+        elif kind < 0.45:
+            body.append(f'<{p}:p><{p}:pPr><{p}:pPrChange {p}:id="{i}"/></{p}:pPr></{p}:p>')
+        else:
+            body.append(f"<{p}:p><{p}:r><{p}:t>{text} sectPr &lt;{p}:sectPr&gt;</{p}:t></{p}:r></{p}:p>")
+    final = rng.random() < 0.8
+    if final:
+        live += 1
+        body.append(sectpr(99))
+    doc = (f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+           f'<{p}:document xmlns:{p}="{uri}" xmlns:r="{main.R_NS[1:-1]}"><{p}:body>'
+           + "".join(body) + f"\n</{p}:body></{p}:document>")
+    return doc.encode("utf-8"), live, tracked, final
+
+
+def reference_sectprs(data):
+    root = ET.fromstring(data)
+    tracked = {id(s) for change in root.iter(f"{W}pPrChange") for s in change.iter(f"{W}sectPr")}
+    live = [s for s in root.iter(f"{W}sectPr") if id(s) not in tracked]
+    return live, len(tracked)
+
+
+def same(a, b):
+    return a.tag == b.tag and a.attrib == b.attrib and len(a) == len(b) and all(map(same, a, b))
+
+
+def test_stream_sectprs_random_documents():
+    rng = random.Random(2)
+    for _ in range(500):
+        data, live_n, tracked_n, final = random_document(rng)
+        live, tracked = reference_sectprs(data)
+        assert (len(live), tracked) == (live_n, tracked_n)
+
+        assert b"".join(main._stream_sectprs(chunked(data, rng), lambda s, i: False)) == data
+
+        seen = []
+
+        def patch(sectpr, index):
+            seen.append(index)
+            sectpr.set("idx", str(index))
+            return True
+
+        out = b"".join(main._stream_sectprs(chunked(data, rng), patch))
+        assert sorted(i for i in seen if i is not None) == list(range(1, live_n + 1))
+        assert seen.count(None) == tracked_n
+        patched, _ = reference_sectprs(out)
+        assert [s.get("idx") for s in patched] == [str(i) for i in range(1, live_n + 1)]
+        for before, after in zip(live, patched):
+            del after.attrib["idx"]
+            assert same(before, after)
+
+        found, sectpr = main._tail_final_sectpr(chunked(data, rng), window=len(data))
+        assert found
+        assert (sectpr is not None) == final
+        if final:
+            assert same(sectpr, live[-1])
+        for window in (16, 40, rng.randint(16, 400)):
+            found, sectpr = main._tail_final_sectpr(chunked(data, rng), window=window)
+            if found:
+                assert (sectpr is not None) == final
+                if final:
+                    assert same(sectpr, live[-1])
+
+
+def test_section_properties_read_from_package(tmp_path):
+    rng = random.Random(3)
+    for n in range(20):
+        data, live_n, _, final = random_document(rng)
+        path = str(tmp_path / f"doc{n}.docx")
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as z:
+            z.writestr(main.DOCUMENT_PART, data)
+        live, _ = reference_sectprs(data)
+        with main.DocxPackage(path) as pkg:
+            sections = pkg.section_properties()
+            assert len(sections) == live_n
+            assert all(map(same, sections, live))
+            final_sectpr = pkg.final_section_properties()
+            assert (final_sectpr is not None) == final
+            if final:
+                assert same(final_sectpr, live[-1])
+
+
+# --- DocxPackage.commit / _RawZipWriter ---
+
+def random_archive(path, rng):
+    parts = {}
+    with zipfile.ZipFile(path, "w") as z:
+        for i in range(rng.randint(1, 15)):
+            name = rng.choice(["word/", "word/media/", "customXml/", "dïr/"]) + f"part{i}.bin"
+            data = os.urandom(rng.randint(0, 5000)) if rng.random() < 0.5 else b"abc" * rng.randint(0, 3000)
+            method = rng.choice([zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED])
+            z.writestr(zipfile.ZipInfo(name, (2020, 1, 2, 3, 4, 6)), data, compress_type=method)
+            parts[name] = data
+    return parts
+
+
+@pytest.mark.parametrize("raw_copy", [True, False])
+def test_commit_random_round_trip(tmp_path, raw_copy):
+    rng = random.Random(4 + raw_copy)
+    for n in range(100):
+        path = str(tmp_path / f"pkg{n}.docx")
+        expected = random_archive(path, rng)
+        with zipfile.ZipFile(path) as z:
+            before = {i.filename: (i.CRC, i.compress_size, i.compress_type) for i in z.infolist()}
+        pkg = main.DocxPackage(path, raw_copy=raw_copy)
+        for name in list(expected):
+            action = rng.random()
+            if action < 0.2:
+                pkg.delete(name)
+                del expected[name]
+            elif action < 0.4:
+                expected[name] = os.urandom(rng.randint(0, 3000))
+                pkg.write(name, expected[name])
+        for i in range(rng.randint(0, 3)):
+            name = f"word/new{i}.xml"
+            expected[name] = b"<x>%d</x>" % i
+            pkg.write(name, expected[name])
+        changed = pkg.modified
+        assert pkg.commit() == changed
+        pkg.close()
+
+        with zipfile.ZipFile(path) as z:
+            assert z.testzip() is None
+            assert sorted(z.namelist()) == sorted(expected)
+            assert {name: z.read(name) for name in z.namelist()} == expected
+            if raw_copy:
+                for info in z.infolist():
+                    if info.filename in before and expected[info.filename] is not None \
+                            and before[info.filename][0] == info.CRC:
+                        # Untouched entries are copied without recompressing
+                        assert (info.CRC, info.compress_size, info.compress_type) == before[info.filename]
+
+
+def test_commit_patches_sections_and_parts(tmp_path, report):
+    path = str(tmp_path / "report.docx")
+    with open(report, "rb") as src, open(path, "wb") as dst:
+        dst.write(src.read())
+    with main.DocxPackage(path) as pkg:
+        styles = pkg.xml("word/styles.xml")
+        styles.set("marker", "1")
+        pkg.touch("word/styles.xml")
+
+        def patch(sectpr, index):
+            sectpr.set("idx", str(index))
+            return True
+
+        pkg.patch_sections(patch)
+        assert pkg.commit()
+        assert [s.get("idx") for s in pkg.section_properties()] == ["1", "2", "3"]
+        assert pkg.xml("word/styles.xml").get("marker") == "1"
+    with zipfile.ZipFile(path) as z:
+        assert z.testzip() is None
@@ -0,0 +1,81 @@
+import os
+import time
+
+import fake_word
+import main
+
+DIGEST = "ab" * 32
+
+
+def dotx(tmp_path, name, size):
+    path = tmp_path / name
+    path.write_bytes(b"x" * size)
+    return str(path)
+
+
+def age(path, seconds_ago):
+    t = time.time() - seconds_ago
+    os.utime(path, (t, t))
+
+
+def cached(cache):
+    return sorted(name for name in os.listdir(cache.directory) if name.endswith(".dotx"))
+
+
+def test_put_and_get_by_digest_and_word_version(tmp_path):
+    cache = main.DotxCache(str(tmp_path / "cache"))
+    assert cache.get(DIGEST, "16.0") is None
+    path = cache.put(DIGEST, "16.0", dotx(tmp_path, "a.dotx", 10))
+    assert cache.get(DIGEST, "16.0") == path
+    assert open(path, "rb").read() == b"x" * 10
+    # Another Word version converts the template itself
+    assert cache.get(DIGEST, "15.0") is None
+    assert cache.get("cd" * 32, "16.0") is None
+    assert not [n for n in os.listdir(cache.directory) if n.endswith(".partial")]
+
+
+def test_hit_refreshes_mtime(tmp_path):
+    cache = main.DotxCache(str(tmp_path / "cache"))
+    path = cache.put(DIGEST, "16.0", dotx(tmp_path, "a.dotx", 10))
+    age(path, 3600)
+    before = os.stat(path).st_mtime
+    cache.get(DIGEST, "16.0")
+    assert os.stat(path).st_mtime > before + 3000
+
+
+def test_least_recently_used_are_evicted_by_size(tmp_path):
+    cache = main.DotxCache(str(tmp_path / "cache"), max_bytes=250)
+    paths = [cache.put(f"{i:064d}", "16.0", dotx(tmp_path, f"{i}.dotx", 100)) for i in range(2)]
+    age(paths[0], 300)
+    age(paths[1], 600)
+    cache.get(f"{1:064d}", "16.0")  # a hit makes entry 1 the most recently used
+    newest = cache.put(f"{2:064d}", "16.0", dotx(tmp_path, "2.dotx", 100))
+    assert cached(cache) == sorted(os.path.basename(p) for p in (paths[1], newest))
+
+
+def test_entry_just_written_is_kept(tmp_path):
+    cache = main.DotxCache(str(tmp_path / "cache"), max_bytes=150)
+    old = cache.put(f"{1:064d}", "16.0", dotx(tmp_path, "1.dotx", 100))
+    # Larger than the limit on its own: everything else goes, it stays
+    path = cache.put(DIGEST, "16.0", dotx(tmp_path, "big.dotx", 400))
+    assert cached(cache) == [os.path.basename(path)]
+    assert not os.path.exists(old)
+
+
+def test_template_features_reuse_the_cache_per_word_version(tmp_path, template):
+    cache = main.DotxCache(str(tmp_path / "cache"))
+
+    def convert(version):
+        word = fake_word.FakeWord(version=version)
+        with main.TemplateFeatures(template, cache, str(tmp_path)) as features:
+            features.open_in_word(word)
+            path = features.style_dotx()
+        return path, word.stats()["by_member"].get("call SaveAs2", 0) + \
+            word.stats()["by_member"].get("call SaveCopyAs", 0)
+
+    path, saves = convert("16.0")
+    assert saves == 1 and os.path.dirname(path) == cache.directory
+    assert convert("16.0") == (path, 0)
+    other, saves = convert("15.0")
+    assert saves == 1 and other != path
+    assert len(cached(cache)) == 2
@@ -0,0 +1,45 @@
+import os
+
+import main
+from conftest import ROOT, docx, make_report
+from docx.shared import Cm
+
+
+def orphans(path):
+    """Parts no relationship of the package targets."""
+    with main.DocxPackage(path) as pkg:
+        targeted = main._targeted_parts(pkg)
+        return [name for name in pkg
+                if not name.endswith(".rels") and name != main.CONTENT_TYPES_PART and name not in targeted]
+
+
+def transfer(template, report, output):
+    main.transfer_layout(template, report, output, style_engine="openxml",
+                         page_setup_engine="openxml", hf_engine="openxml")
+    return docx.Document(output)
+
+
+def test_report_header_media_is_removed(tmp_path, template):
+    report = make_report(tmp_path / "report.docx", header_image=True)
+    output = str(tmp_path / "out.docx")
+    assert orphans(report) == []
+    out = transfer(template, report, output)
+    assert out.sections[0].header.paragraphs[0].text == "TEMPLATE HEADER"
+    assert orphans(output) == []
+    with main.DocxPackage(output) as pkg:
+        media = [name for name in pkg if name.startswith("word/media/")]
+    assert len(media) == 1  # the template header's picture only
+
+
+def test_media_shared_with_the_body_is_kept(tmp_path, template):
+    path = make_report(tmp_path / "report.docx", header_image=True)
+    d = docx.Document(path)
+    d.add_paragraph().add_run().add_picture(os.path.join(ROOT, "app_gui.png"), width=Cm(3))
+    d.save(path)
+    output = str(tmp_path / "out.docx")
+    transfer(template, path, output)
+    assert orphans(output) == []
+    with main.DocxPackage(output) as pkg:
+        body_media = [part for part in pkg.related_parts(main.DOCUMENT_PART).values()
+                      if part.startswith("word/media/")]
+        assert body_media and all(part in pkg for part in body_media)
@@ -0,0 +1,41 @@
+import main
+from conftest import docx
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
+
+W = main.W_NS
+
+
+def bordered_template(path):
+    d = docx.Document()
+    header_style = d.styles["Header"]
+    header_style.element.get_or_add_pPr().append(parse_xml(
+        f'<w:pBdr {nsdecls("w")}><w:bottom w:val="single" w:sz="4" w:space="1" w:color="auto"/></w:pBdr>'))
+    ruled = d.styles.add_style("Ruled Header", 1)
+    ruled.base_style = header_style
+    s = d.sections[0]
+    s.header.paragraphs[0].style = ruled       # empty, but the inherited rule shows
+    s.footer.paragraphs[0].style = d.styles["Footer"]  # empty and undecorated
+    d.add_paragraph("body")
+    d.save(path)
+    return str(path)
+
+
+def test_style_border_makes_a_story_visible(tmp_path):
+    path = bordered_template(tmp_path / "template.docx")
+    with main.DocxPackage(path) as pkg:
+        (plan,) = main.plan_headers_footers(pkg)
+        drawing = main._drawing_styles(pkg)
+    primary_header = main.HF_STORIES.index(("Headers", 1))
+    primary_footer = main.HF_STORIES.index(("Footers", 1))
+    assert plan[primary_header] == main.HF_COPY
+    assert plan[primary_footer] == main.HF_CLEAR
+    assert {"Header", "RuledHeader"} <= drawing
+    assert "Footer" not in drawing
+
+
+def test_empty_story_without_style_is_empty():
+    root = main.ET.fromstring(f'<w:hdr xmlns:w="{W[1:-1]}"><w:p><w:pPr><w:pStyle w:val="Header"/></w:pPr>'
+                              '</w:p></w:hdr>')
+    assert main._story_is_empty(root)
+    assert not main._story_is_empty(root, frozenset({"Header"}))
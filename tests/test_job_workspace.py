@@ -0,0 +1,87 @@
+import os
+import threading
+
+import pytest
+
+import fake_word
+import main
+from conftest import make_report
+
+
+def test_each_job_gets_its_own_files(tmp_path):
+    paths = []
+    lock = threading.Lock()
+
+    def job():
+        with main.JobWorkspace(str(tmp_path)) as ws:
+            path = ws.file("pre_patch.docx")
+            with open(path, "w") as f:
+                f.write("x")
+            with lock:
+                paths.append(path)
+
+    threads = [threading.Thread(target=job) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(set(paths)) == 8
+    assert all(os.path.dirname(os.path.dirname(p)) == str(tmp_path) for p in paths)
+    assert os.listdir(tmp_path) == []
+
+
+def test_created_on_first_use_and_removed_on_exit(tmp_path):
+    base = tmp_path / "scratch"
+    with main.JobWorkspace(str(base)) as ws:
+        assert ws.path is None and not base.exists()
+        path = ws.file("a.docx")
+        assert ws.file("b.docx") == os.path.join(os.path.dirname(path), "b.docx")
+        open(path, "w").close()
+    assert not os.path.exists(os.path.dirname(path))
+    assert os.listdir(base) == []
+
+
+def test_removed_when_the_job_fails(tmp_path):
+    with pytest.raises(RuntimeError):
+        with main.JobWorkspace(str(tmp_path)) as ws:
+            open(ws.file("a.docx"), "w").close()
+            raise RuntimeError("job failed")
+    assert os.listdir(tmp_path) == []
+
+
+def test_base_dir_from_environment(tmp_path, monkeypatch):
+    monkeypatch.setenv(main.TEMP_DIR_ENV, str(tmp_path / "ram"))
+    ws = main.JobWorkspace()
+    try:
+        assert os.path.dirname(os.path.dirname(ws.file("a.docx"))) == str(tmp_path / "ram")
+    finally:
+        ws.cleanup()
+    explicit = main.JobWorkspace(str(tmp_path / "fast"))
+    assert explicit.base_dir == str(tmp_path / "fast")
+
+
+def test_transfer_uses_and_empties_the_configured_directory(tmp_path, template, monkeypatch):
+    fast = tmp_path / "fast"
+    created = []
+    mkdtemp = main.tempfile.mkdtemp
+
+    def record(*args, **kwargs):
+        created.append(mkdtemp(*args, **kwargs))
+        return created[-1]
+
+    def save(self):
+        raise fake_word.FakeComError("The document is locked for editing.")
+
+    monkeypatch.setattr(main.tempfile, "mkdtemp", record)
+    # A failing Save makes the COM stages go through their scratch copy
+    monkeypatch.setattr(fake_word.Document, "Save", save)
+    reports = [make_report(tmp_path / f"report{i}.docx") for i in range(2)]
+    word = fake_word.FakeWord()
+    with main.WordPool(factory=lambda: word) as pool:
+        main.transfer_layout(template, reports[0], str(tmp_path / "out.docx"), pool=pool, temp_dir=str(fast))
+        summary = main.transfer_batch(template, reports, output_dir=str(tmp_path / "out"), pool=pool,
+                                      temp_dir=str(fast))
+    assert summary["failed"] == 0
+    assert len(created) == 3
+    assert all(os.path.dirname(path) == str(fast) for path in created)
+    assert os.listdir(fast) == []
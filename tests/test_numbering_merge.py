@@ -0,0 +1,159 @@
+import zipfile
+
+import main
+
+ET = main.ET
+W = main.W_NS
+W_URI = W[1:-1]
+R_URI = main.R_NS[1:-1]
+REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+NS = f'xmlns:w="{W_URI}" xmlns:r="{R_URI}" xmlns:v="urn:schemas-microsoft-com:vml"'
+PNG = b"\x89PNG\r\n\x1a\n" + b"\0" * 32
+
+
+def abstract(aid, fmt="bullet", nsid="1", extra=""):
+    return (f'<w:abstractNum w:abstractNumId="{aid}"><w:nsid w:val="{nsid}"/>{extra}'
+            f'<w:lvl w:ilvl="0"><w:numFmt w:val="{fmt}"/></w:lvl></w:abstractNum>')
+
+
+def num(nid, aid):
+    return f'<w:num w:numId="{nid}"><w:abstractNumId w:val="{aid}"/></w:num>'
+
+
+def make_docx(path, numbering=None, styles="", numbering_rels=None, header=None, extra_parts=()):
+    """A minimal package; numbering/styles/header are the inner XML of those parts."""
+    rels = [f'<Relationship Id="rId1" Type="{REL}/styles" Target="styles.xml"/>']
+    overrides = ['<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-'
+                 'officedocument.wordprocessingml.document.main+xml"/>']
+    parts = {"word/styles.xml": f"<w:styles {NS}>{styles}</w:styles>"}
+    sectpr = "<w:sectPr/>"
+    if numbering is not None:
+        rels.append(f'<Relationship Id="rId2" Type="{REL}/numbering" Target="numbering.xml"/>')
+        parts["word/numbering.xml"] = f"<w:numbering {NS}>{numbering}</w:numbering>"
+        overrides.append(f'<Override PartName="/word/numbering.xml" ContentType="{main.CT_NUMBERING}"/>')
+    if numbering_rels:
+        parts["word/_rels/numbering.xml.rels"] = (
+            f'<Relationships xmlns="{main.PR_NS[1:-1]}">{numbering_rels}</Relationships>')
+    if header is not None:
+        rels.append(f'<Relationship Id="rId3" Type="{main.REL_TYPE_HEADER}" Target="header1.xml"/>')
+        parts["word/header1.xml"] = f"<w:hdr {NS}>{header}</w:hdr>"
+        sectpr = '<w:sectPr><w:headerReference w:type="default" r:id="rId3"/></w:sectPr>'
+    parts["word/document.xml"] = f"<w:document {NS}><w:body><w:p/>{sectpr}</w:body></w:document>"
+    parts["word/_rels/document.xml.rels"] = f'<Relationships xmlns="{main.PR_NS[1:-1]}">{"".join(rels)}</Relationships>'
+    parts[main.CONTENT_TYPES_PART] = (
+        f'<Types xmlns="{main.CT_NS[1:-1]}"><Default Extension="xml" ContentType="application/xml"/>'
+        f'<Default Extension="png" ContentType="image/png"/>{"".join(overrides)}</Types>')
+    with zipfile.ZipFile(path, "w") as z:
+        for name, data in {**parts, **dict(extra_parts)}.items():
+            z.writestr(name, data)
+    return str(path)
+
+
+def numbering_of(pkg):
+    root = pkg.xml(main._document_part(pkg, main.REL_TYPE_NUMBERING))
+    return ([a.get(f"{W}abstractNumId") for a in root.findall(f"{W}abstractNum")],
+            {n.get(f"{W}numId"): n.find(f"{W}abstractNumId").get(f"{W}val") for n in root.findall(f"{W}num")})
+
+
+def test_identical_abstract_num_is_shared(tmp_path):
+    src = make_docx(tmp_path / "t.docx", abstract(0, nsid="AAAA") + num(1, 0))
+    dst = make_docx(tmp_path / "r.docx", abstract(5, nsid="BBBB") + num(7, 5))
+    with main.DocxPackage(src) as s, main.DocxPackage(dst) as d:
+        num_map, added, shared = main.merge_numbering_openxml(s, d)
+        assert (added, shared) == (0, 1)
+        assert num_map == {"0": "0", "1": "7"}
+        assert numbering_of(d) == (["5"], {"7": "5"})
+
+
+def test_new_definitions_get_fresh_ids(tmp_path):
+    src = make_docx(tmp_path / "t.docx", abstract(0, "decimal") + abstract(1, "lowerRoman") + num(1, 0) + num(2, 1))
+    dst = make_docx(tmp_path / "r.docx", abstract(0) + abstract(3, "upperLetter") + num(1, 0) + num(2, 3))
+    with main.DocxPackage(src) as s, main.DocxPackage(dst) as d:
+        num_map, added, shared = main.merge_numbering_openxml(s, d)
+        assert (added, shared) == (2, 0)
+        assert num_map == {"0": "0", "1": "3", "2": "4"}
+        assert numbering_of(d) == (["0", "3", "4", "5"], {"1": "0", "2": "3", "3": "4", "4": "5"})
+        d.commit()
+    with main.DocxPackage(dst) as d:
+        assert numbering_of(d)[1]["4"] == "5"
+
+
+def test_picture_bullets_are_copied(tmp_path):
+    pic = ('<w:numPicBullet w:numPicBulletId="{}"><w:pict><v:shape><v:imagedata r:id="{}"/>'
+           '</v:shape></w:pict></w:numPicBullet>')
+    src = make_docx(tmp_path / "t.docx",
+                    pic.format(0, "rId1") + abstract(0).replace(
+                        '<w:numFmt w:val="bullet"/>', '<w:numFmt w:val="bullet"/><w:lvlPicBulletId w:val="0"/>')
+                    + num(1, 0),
+                    numbering_rels=f'<Relationship Id="rId1" Type="{REL}/image" Target="media/image1.png"/>',
+                    extra_parts=[("word/media/image1.png", PNG)])
+    dst = make_docx(tmp_path / "r.docx", pic.format(0, "rId9") + abstract(0, "decimal") + num(1, 0),
+                    numbering_rels=f'<Relationship Id="rId9" Type="{REL}/image" Target="media/image1.png"/>',
+                    extra_parts=[("word/media/image1.png", b"report image")])
+    with main.DocxPackage(src) as s, main.DocxPackage(dst) as d:
+        num_map, added, _ = main.merge_numbering_openxml(s, d)
+        assert added == 1 and num_map["1"] == "2"
+        d.commit()
+    with main.DocxPackage(dst) as d:
+        root = d.xml("word/numbering.xml")
+        assert [el.tag[len(W):] for el in root] == ["numPicBullet", "numPicBullet", "abstractNum", "abstractNum",
+                                                     "num", "num"]
+        new_pic = root.findall(f"{W}numPicBullet")[1]
+        assert new_pic.get(f"{W}numPicBulletId") == "1"
+        assert root.findall(f"{W}abstractNum")[1].find(f".//{W}lvlPicBulletId").get(f"{W}val") == "1"
+        rid = new_pic.find(f".//{{urn:schemas-microsoft-com:vml}}imagedata").get(f"{main.R_NS}id")
+        image = d.related_parts("word/numbering.xml")[rid]
+        assert image != "word/media/image1.png"
+        assert d.read(image) == PNG
+        assert d.read("word/media/image1.png") == b"report image"
+
+
+def test_numbering_part_is_created(tmp_path):
+    src = make_docx(tmp_path / "t.docx", abstract(0) + num(1, 0))
+    dst = make_docx(tmp_path / "r.docx")
+    with main.DocxPackage(src) as s, main.DocxPackage(dst) as d:
+        assert main.merge_numbering_openxml(s, d)[:2] == ({"0": "0", "1": "1"}, 1)
+        d.commit()
+    with main.DocxPackage(dst) as d:
+        part = main._document_part(d, main.REL_TYPE_NUMBERING)
+        assert part == "word/numbering.xml"
+        assert main._content_type(d.xml(main.CONTENT_TYPES_PART), part) == main.CT_NUMBERING
+        assert numbering_of(d) == (["0"], {"1": "0"})
+
+
+def test_num_map_reaches_copied_styles_and_headers(tmp_path):
+    styles = ('<w:style w:type="paragraph" w:styleId="ListPara"><w:name w:val="list para"/>'
+              '<w:pPr><w:numPr><w:numId w:val="1"/></w:numPr></w:pPr></w:style>')
+    header = '<w:p><w:pPr><w:numPr><w:ilvl w:val="0"/><w:numId w:val="1"/></w:numPr></w:pPr></w:p>'
+    src = make_docx(tmp_path / "t.docx", abstract(0, "decimal") + num(1, 0), styles=styles, header=header)
+    dst = make_docx(tmp_path / "r.docx", abstract(0) + num(1, 0))
+    with main.DocxPackage(src) as s, main.DocxPackage(dst) as d:
+        num_map, _, _ = main.merge_numbering_openxml(s, d)
+        assert num_map["1"] == "2"
+        main.merge_styles_openxml(s, d, num_map)
+        assert main.copy_headers_footers_openxml(s, d, num_map=num_map) == 1
+        d.commit()
+    with main.DocxPackage(dst) as d:
+        style = d.xml("word/styles.xml").find(f"{W}style")
+        assert style.find(f".//{W}numId").get(f"{W}val") == "2"
+        (header_part,) = set(d.related_parts(main.DOCUMENT_PART).values()) - {"word/styles.xml", "word/numbering.xml"}
+        assert d.xml(header_part).find(f".//{W}numId").get(f"{W}val") == "2"
+
+
+def test_style_links_follow_renamed_styles(tmp_path):
+    src_styles = ('<w:style w:type="numbering" w:styleId="Bullets"><w:name w:val="corp bullets"/>'
+                  '<w:pPr><w:numPr><w:numId w:val="1"/></w:numPr></w:pPr></w:style>')
+    dst_styles = '<w:style w:type="paragraph" w:styleId="Bullets"><w:name w:val="bullets"/></w:style>'
+    src = make_docx(tmp_path / "t.docx",
+                    abstract(0, extra='<w:styleLink w:val="Bullets"/>') + num(1, 0)
+                    + abstract(1, "decimal", extra='<w:numStyleLink w:val="Bullets"/>') + num(2, 1),
+                    styles=src_styles)
+    dst = make_docx(tmp_path / "r.docx", "", styles=dst_styles)
+    with main.DocxPackage(src) as s, main.DocxPackage(dst) as d:
+        num_map, _, _ = main.merge_numbering_openxml(s, d)
+        main.merge_styles_openxml(s, d, num_map)
+        ids = {st.get(f"{W}styleId"): st.get(f"{W}type") for st in d.xml("word/styles.xml").findall(f"{W}style")}
+        assert ids == {"Bullets": "paragraph", "Bullets1": "numbering"}
+        root = d.xml("word/numbering.xml")
+        assert root.find(f".//{W}styleLink").get(f"{W}val") == "Bullets1"
+        assert root.find(f".//{W}numStyleLink").get(f"{W}val") == "Bullets1"
@@ -0,0 +1,50 @@
+import fake_word
+import main
+from conftest import make_report
+
+LATENT = ("Heading 10", "Quote 2", "Plain Table 1")
+
+
+def organizer_run(template, report, tmp_path, **word_options):
+    word = fake_word.FakeWord(**word_options)
+    copied = []
+    organizer_copy = word.OrganizerCopy
+
+    def record(Source, Destination, Name, Object):
+        copied.append(Name)
+        return organizer_copy(Source, Destination, Name, Object)
+
+    word.__dict__["OrganizerCopy"] = record
+    with main.WordPool(factory=lambda: word) as pool:
+        main.transfer_layout(template, report, str(tmp_path / "out.docx"), pool=pool)
+    return sorted(copied), word.stats()["by_member"]
+
+
+def test_names_are_matched_one_by_one(template, tmp_path):
+    report = make_report(tmp_path / "report.docx")
+    expected, _ = organizer_run(template, report, tmp_path)
+    assert expected == ["Corp Title", "Normal"]
+
+    # English Word: "Table Normal" is the alias of "Normal Table", the rest is latent
+    copied, members = organizer_run(template, report, tmp_path, latent_styles=LATENT,
+                                    local_names={"Normal Table": "Table Normal"})
+    assert copied == expected
+    assert "get BuiltIn" not in members
+
+
+def test_localized_names_only_keep_styles_the_template_defines(template, tmp_path):
+    report = make_report(tmp_path / "report.docx")
+    copied, members = organizer_run(template, report, tmp_path, latent_styles=LATENT,
+                                    local_names={"Normal Table": "Table Normal", "heading 1": "Überschrift 1"})
+    # The unmatched localized name is defined in the template, the latent built-ins are not
+    assert copied == ["Corp Title", "Normal", "Überschrift 1"]
+    assert members["get BuiltIn"] == len(LATENT) + 1
+
+
+def test_unmatched_names_without_defined_are_kept(template):
+    with main.DocxPackage(template) as pkg:
+        index = main.StyleIndex(pkg)
+    com_names = ["Normal", "Table Normal", "Überschrift 1", "Quote 2"]
+    assert main.organizer_style_names(com_names, index, {"normal"}) == ["Normal", "Überschrift 1", "Quote 2"]
+    assert main.organizer_style_names(com_names, index, {"normal"}, lambda name: name != "Quote 2") == \
+        ["Normal", "Überschrift 1"]
@@ -0,0 +1,39 @@
+import shutil
+
+import main
+from conftest import make_report, set_section_children
+
+ET = main.ET
+W = main.W_NS
+
+
+def child(sectpr, tag):
+    el = sectpr.find(f"{W}{tag}")
+    return None if el is None else dict(el.attrib)
+
+
+def test_numbering_and_notes_stay_with_each_report_section(tmp_path, template):
+    styled = str(tmp_path / "template.docx")
+    shutil.copy(template, styled)
+    set_section_children(styled, {1: [ET.Element(f"{W}pgNumType", {f"{W}start": "1"}),
+                                      ET.Element(f"{W}lnNumType", {f"{W}countBy": "5"})]})
+    report = make_report(tmp_path / "report.docx", sections=3)
+    set_section_children(report, {
+        1: [ET.Element(f"{W}pgNumType", {f"{W}fmt": "lowerRoman"}),
+            ET.Element(f"{W}footnotePr", {f"{W}numRestart": "eachSect"})],
+        2: [ET.Element(f"{W}pgNumType", {f"{W}fmt": "decimal", f"{W}start": "1"})],
+    })
+    output = str(tmp_path / "out.docx")
+    main.transfer_layout(styled, report, output, style_engine="openxml",
+                         page_setup_engine="openxml", hf_engine="openxml")
+
+    with main.DocxPackage(styled) as pkg:
+        template_margins = child(pkg.section_properties()[0], "pgMar")
+    with main.DocxPackage(output) as pkg:
+        sections = pkg.section_properties()
+    assert len(sections) == 3
+    assert all(child(s, "pgMar") == template_margins for s in sections)
+    assert [child(s, "pgNumType") for s in sections] == [
+        {f"{W}fmt": "lowerRoman"}, {f"{W}fmt": "decimal", f"{W}start": "1"}, None]
+    assert child(sections[0], "footnotePr") == {f"{W}numRestart": "eachSect"}
+    assert all(child(s, "lnNumType") is None for s in sections)
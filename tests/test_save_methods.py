@@ -0,0 +1,92 @@
+import fake_word
+import main
+
+
+class Doc:
+    """A document whose save entry points fail as told: {name: exception or None}."""
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.calls = []
+
+    def __getattr__(self, name):
+        if name not in main.SaveMethods.ORDER:
+            raise AttributeError(name)
+        if self.failures.get(name) == "missing":
+            raise AttributeError(name)
+
+        def method(**kwargs):
+            self.calls.append(name)
+            error = self.failures.get(name)
+            if error is not None:
+                raise error
+        return method
+
+
+def missing():
+    return fake_word.FakeComError("Unknown name.", hresult=fake_word.DISP_E_MEMBERNOTFOUND)
+
+
+def test_missing_member_is_written_off_once():
+    saves = main.SaveMethods()
+    doc = Doc({"SaveCopyAs": missing()})
+    assert saves.save(doc, "a.docx") == "SaveAs2"
+    assert saves.save(doc, "b.docx") == "SaveAs2"
+    assert saves.save(doc, "c.dotx", main.WD_FORMAT_DOTX) == "SaveAs2"
+    assert doc.calls == ["SaveCopyAs", "SaveAs2", "SaveAs2", "SaveAs2"]
+    assert saves.missing == {"SaveCopyAs"}
+
+    doc = Doc({"SaveCopyAs": "missing", "SaveAs2": "missing"})
+    saves = main.SaveMethods()
+    assert saves.save(doc, "a.docx") == "SaveAs"
+    assert saves.missing == {"SaveCopyAs", "SaveAs2"}
+
+
+def test_other_errors_fall_through_and_are_not_cached():
+    saves = main.SaveMethods()
+    locked = fake_word.FakeComError("The file is in use.")
+    doc = Doc({"SaveCopyAs": locked})
+    assert saves.save(doc, "a.docx") == "SaveAs2"
+    assert saves.missing == set()
+    doc.failures = {}
+    assert saves.save(doc, "b.dotx", main.WD_FORMAT_DOTX) == "SaveCopyAs"
+    assert doc.calls == ["SaveCopyAs", "SaveAs2", "SaveCopyAs"]
+
+
+def test_last_error_is_raised_when_nothing_works():
+    doc = Doc({name: fake_word.FakeComError(f"{name} failed") for name in main.SaveMethods.ORDER})
+    try:
+        main.SaveMethods().save(doc, "a.docx")
+    except fake_word.FakeComError as e:
+        assert e.strerror == "SaveAs failed"
+    else:
+        raise AssertionError("save did not raise")
+
+
+def test_working_method_is_tried_first_per_format():
+    saves = main.SaveMethods()
+    doc = Doc({"SaveCopyAs": fake_word.FakeComError("busy")})
+    assert saves.save(doc, "a.docx") == "SaveAs2"
+    doc.failures = {}
+    assert saves.save(doc, "b.docx") == "SaveAs2"   # the one that worked for .docx comes first
+    assert saves.save(doc, "c.dotx", main.WD_FORMAT_DOTX) == "SaveCopyAs"  # no history for .dotx
+    assert doc.calls == ["SaveCopyAs", "SaveAs2", "SaveAs2", "SaveCopyAs"]
+    assert saves.working == {main.WD_FORMAT_DOCX: "SaveAs2", main.WD_FORMAT_DOTX: "SaveCopyAs"}
+
+
+def test_pool_keeps_one_cache_per_word_instance():
+    words = []
+
+    def factory():
+        words.append(fake_word.FakeWord())
+        return words[-1]
+
+    with main.WordPool(factory=factory, max_jobs=1) as pool:
+        with pool.lease() as word:
+            first = pool.save_methods(word)
+            assert pool.save_methods(word) is first
+            first.missing.add("SaveCopyAs")
+        with pool.lease() as word:  # max_jobs=1: a fresh instance
+            assert word is words[1]
+            assert pool.save_methods(word) is not first
+            assert pool.save_methods(word).missing == set()
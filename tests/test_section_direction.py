@@ -0,0 +1,65 @@
+import shutil
+
+import pytest
+
+import fake_word
+import main
+from conftest import make_report, set_section_children
+
+ET = main.ET
+W = main.W_NS
+
+
+def rtl_elements():
+    return [ET.Element(f"{W}bidi"), ET.Element(f"{W}rtlGutter"),
+            ET.Element(f"{W}cols", {f"{W}num": "2", f"{W}space": "720"})]
+
+
+def direction(sectpr):
+    cols = sectpr.find(f"{W}cols")
+    return (main._section_direction(sectpr), cols.get(f"{W}num") if cols is not None else None)
+
+
+def run(template, report, output, page_setup_engine):
+    lines = []
+    word = fake_word.FakeWord()
+    with main.WordPool(factory=lambda: word) as pool:
+        main.transfer_layout(template, report, output, pool=pool, log=lines.append,
+                             page_setup_engine=page_setup_engine)
+    with main.DocxPackage(output) as pkg:
+        return [direction(sp) for sp in pkg.section_properties()], [l for l in lines if l.startswith("[WARN] Report")]
+
+
+@pytest.mark.parametrize("page_setup_engine", main.PAGE_SETUP_ENGINES)
+def test_rtl_template_on_ltr_report(tmp_path, template, page_setup_engine):
+    rtl = str(tmp_path / "template.docx")
+    shutil.copy(template, rtl)
+    set_section_children(rtl, {1: rtl_elements()})
+    report = make_report(tmp_path / "report.docx", sections=2)
+
+    sections, warnings = run(rtl, report, str(tmp_path / "out.docx"), page_setup_engine)
+    assert sections == [((True, True, "lrTb"), "2")] * 2
+    assert warnings == [f"[WARN] Report Section({i}) is left-to-right, gutter left; "
+                        "template Section(1) is right-to-left, gutter right." for i in (1, 2)]
+
+
+@pytest.mark.parametrize("page_setup_engine", main.PAGE_SETUP_ENGINES)
+def test_ltr_template_on_rtl_report(tmp_path, template, page_setup_engine):
+    report = make_report(tmp_path / "report.docx", sections=2)
+    set_section_children(report, {2: rtl_elements()})
+
+    sections, warnings = run(template, report, str(tmp_path / "out.docx"), page_setup_engine)
+    assert [d for d, _ in sections] == [main.LTR, main.LTR]
+    assert sections[1][1] is None  # the template section has no w:cols
+    assert warnings == ["[WARN] Report Section(2) is right-to-left, gutter right; "
+                        "template Section(1) is left-to-right, gutter left."]
+
+
+def test_batch_summary_counts_direction_mismatches(tmp_path, template):
+    plain = make_report(tmp_path / "plain.docx", sections=2)
+    rtl = make_report(tmp_path / "rtl.docx", sections=3)
+    set_section_children(rtl, {1: rtl_elements(), 3: rtl_elements()})
+    summary = main.transfer_batch(template, [plain, rtl], output_dir=str(tmp_path / "out"),
+                                  style_engine="openxml", page_setup_engine="openxml", hf_engine="openxml")
+    assert [r["direction_mismatches"] for r in summary["reports"]] == [0, 2]
+    assert summary["failed"] == 0
@@ -0,0 +1,116 @@
+import fake_word
+import main
+from conftest import make_report
+
+PORTRAIT, LANDSCAPE = 0, 1
+
+
+def layout(**page):
+    return main.SectionLayout(tuple(page.items()), (), (), ())
+
+
+class Recorder:
+    """A section whose PageSetup and Borders record the order of every write."""
+
+    def __init__(self):
+        self.writes = []
+        self.PageSetup = self.Borders = self
+
+    def __setattr__(self, name, value):
+        if name in ("writes", "PageSetup", "Borders"):
+            object.__setattr__(self, name, value)
+        else:
+            self.writes.append((name, value))
+
+    def __call__(self, index):
+        return self
+
+
+def test_orientation_swap_with_matching_dimensions():
+    want = layout(PageWidth=792.0, PageHeight=612.0, Orientation=LANDSCAPE)
+    have = layout(PageWidth=612.0, PageHeight=792.0, Orientation=PORTRAIT)
+    # Setting Orientation alone swaps the report's page to the template's size
+    assert want.changes(have) == ([("Orientation", LANDSCAPE)], [], [])
+
+
+def test_orientation_swap_with_other_dimensions():
+    want = layout(PageWidth=842.0, PageHeight=595.0, Orientation=LANDSCAPE)
+    have = layout(PageWidth=612.0, PageHeight=792.0, Orientation=PORTRAIT)
+    assert want.changes(have)[0] == [("Orientation", LANDSCAPE), ("PageWidth", 842.0), ("PageHeight", 595.0)]
+
+
+def test_same_orientation_compares_dimensions_unswapped():
+    want = layout(PageWidth=792.0, PageHeight=612.0, Orientation=PORTRAIT)
+    have = layout(PageWidth=612.0, PageHeight=792.0, Orientation=PORTRAIT)
+    assert want.changes(have)[0] == [("PageWidth", 792.0), ("PageHeight", 612.0)]
+
+
+def test_unreadable_properties_count_as_different():
+    want = layout(PageWidth=612.0, Orientation=PORTRAIT, MirrorMargins=0)
+    have = layout(PageWidth=612.0)
+    assert want.changes(have)[0] == [("Orientation", PORTRAIT), ("MirrorMargins", 0)]
+
+
+def test_apply_order_and_counts():
+    # Read in PAGE_SETUP_PROPS order; written in PAGE_SETUP_APPLY_ORDER
+    want = main.SectionLayout(
+        (("LeftMargin", 85.0), ("Gutter", 28.0), ("PageWidth", 842.0), ("PageHeight", 595.0),
+         ("Orientation", LANDSCAPE), ("GutterPos", 2), ("TopMargin", 72.0)),
+        (("Enable", -1), ("ArtStyle", 0)),
+        ((1, (("LineStyle", 1), ("LineWidth", 4))),),
+        ())
+    have = main.SectionLayout(
+        (("LeftMargin", 90.0), ("Gutter", 0.0), ("PageWidth", 612.0), ("PageHeight", 792.0),
+         ("Orientation", PORTRAIT), ("GutterPos", 0), ("TopMargin", 72.0)),
+        (("Enable", -1), ("ArtStyle", 5)),
+        ((1, (("LineStyle", 1), ("LineWidth", 8))),),
+        ())
+    section = Recorder()
+    assert want.apply(section, have) == (8, 3)
+    assert section.writes == [("Orientation", LANDSCAPE), ("PageWidth", 842.0), ("PageHeight", 595.0),
+                              ("LeftMargin", 85.0), ("GutterPos", 2), ("Gutter", 28.0),
+                              ("ArtStyle", 0), ("LineWidth", 4)]
+
+    # Without a snapshot everything is written
+    section = Recorder()
+    assert want.apply(section) == (11, 0)
+    assert [name for name, _ in section.writes][:3] == ["Orientation", "PageWidth", "PageHeight"]
+
+
+def test_apply_survives_the_swap(tmp_path, template):
+    word = fake_word.FakeWord()
+    src = word.Documents.Open(template)
+    dst = word.Documents.Open(make_report(tmp_path / "report.docx", sections=1))
+    landscape = main.SectionLayout.read(src.Sections(2))
+    section = dst.Sections(1)
+    applied, skipped = landscape.apply(section, main.SectionLayout.read(section))
+    assert (applied, skipped) == (4, len(landscape.page_setup) + len(landscape.borders)
+                                  + sum(len(props) for _, props in landscape.sides) - 4)
+    assert main.SectionLayout.read(section) == landscape
+    assert word.stats()["by_member"].get("set PageWidth") is None
+
+
+def test_counts_logged_per_section(tmp_path, template):
+    report = make_report(tmp_path / "report.docx", sections=3)
+    word = fake_word.FakeWord()
+    lines = []
+    with main.WordPool(factory=lambda: word) as pool:
+        main.transfer_layout(template, report, str(tmp_path / "out.docx"), pool=pool,
+                             section_map=True, log=lines.append)
+
+    src = word.Documents.Open(template)
+    totals = []
+    for s_idx in (1, 2, 1):
+        wanted = main.SectionLayout.read(src.Sections(s_idx))
+        totals.append(len(wanted.page_setup) + len(wanted.borders)
+                      + sum(len(props) for _, props in wanted.sides))
+    # LeftMargin, Gutter, DifferentFirstPageHeaderFooter; plus Orientation for
+    # the landscape section, whose page size then already matches
+    applied = [3, 4, 3]
+    assert [line for line in lines if "page setup/borders" in line] == [
+        f"    page setup/borders: {a} applied, {t - a} already matching" for a, t in zip(applied, totals)]
+    assert (f"[INFO] Source sections read: 2; properties applied: {sum(applied)}, "
+            f"already matching: {sum(totals) - sum(applied)}") in lines
+    members = word.stats()["by_member"]
+    assert members["set Orientation"] == 1
+    assert "set PageWidth" not in members and "set PageHeight" not in members
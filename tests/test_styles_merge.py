@@ -0,0 +1,67 @@
+import xml.etree.ElementTree as ET
+
+import main
+
+W = main.W_NS
+W_URI = W[1:-1]
+
+
+def styles(*defs):
+    """defs: (type, styleId, name[, basedOn]) tuples -> a <w:styles> root."""
+    root = ET.Element(f"{W}styles")
+    for d in defs:
+        st = ET.SubElement(root, f"{W}style", {f"{W}type": d[0], f"{W}styleId": d[1]})
+        ET.SubElement(st, f"{W}name", {f"{W}val": d[2]})
+        if len(d) > 3:
+            ET.SubElement(st, f"{W}basedOn", {f"{W}val": d[3]})
+    return root
+
+
+def listing(root):
+    return [(st.get(f"{W}type"), st.get(f"{W}styleId"), st.find(f"{W}name").get(f"{W}val"),
+             st.find(f"{W}basedOn").get(f"{W}val") if st.find(f"{W}basedOn") is not None else None)
+            for st in root.findall(f"{W}style")]
+
+
+def assert_unique(root):
+    ids = [st.get(f"{W}styleId").lower() for st in root.findall(f"{W}style")]
+    names = [(st.get(f"{W}type"), st.find(f"{W}name").get(f"{W}val").lower()) for st in root.findall(f"{W}style")]
+    assert len(ids) == len(set(ids))
+    assert len(names) == len(set(names))
+
+
+def test_same_id_and_name_replaces():
+    dst = styles(("paragraph", "Heading1", "heading 1"))
+    assert main._merge_styles_xml(styles(("paragraph", "Heading1", "heading 1")), dst) == 1
+    assert len(dst.findall(f"{W}style")) == 1
+
+
+def test_same_name_keeps_report_id_and_remaps_references():
+    src = styles(("paragraph", "Titre", "Title"), ("paragraph", "Sub", "Subtitle", "Titre"))
+    dst = styles(("paragraph", "Title", "Title"))
+    main._merge_styles_xml(src, dst)
+    assert listing(dst) == [("paragraph", "Title", "Title", None), ("paragraph", "Sub", "Subtitle", "Title")]
+
+
+def test_id_taken_by_other_type_gets_fresh_id():
+    src = styles(("character", "Quote", "Quote Char"), ("character", "Em", "Em", "Quote"))
+    dst = styles(("paragraph", "Quote", "Quote"))
+    main._merge_styles_xml(src, dst)
+    assert_unique(dst)
+    assert listing(dst) == [("paragraph", "Quote", "Quote", None),
+                            ("character", "Quote1", "Quote Char", None),
+                            ("character", "Em", "Em", "Quote1")]
+
+
+def test_id_match_with_other_name_does_not_duplicate_names():
+    src = styles(("paragraph", "Foo", "x"))
+    dst = styles(("paragraph", "Foo", "y"), ("paragraph", "Bar", "x"))
+    main._merge_styles_xml(src, dst)
+    assert_unique(dst)
+    assert listing(dst) == [("paragraph", "Foo", "y", None), ("paragraph", "Bar", "x", None)]
+
+
+def test_id_match_with_other_name_replaces_when_name_is_free():
+    dst = styles(("paragraph", "Foo", "y"))
+    main._merge_styles_xml(styles(("paragraph", "Foo", "x")), dst)
+    assert listing(dst) == [("paragraph", "Foo", "x", None)]
@@ -0,0 +1,74 @@
+import itertools
+import shutil
+import zipfile
+
+import pytest
+
+import fake_word
+import main
+from conftest import docx, make_report
+
+THEME_PART = "word/theme/theme1.xml"
+ENGINES = list(itertools.product(main.STYLE_ENGINES, main.PAGE_SETUP_ENGINES, main.HF_ENGINES))
+
+
+@pytest.mark.parametrize("style_engine,page_setup_engine,hf_engine", ENGINES)
+def test_transfer_layout_through_pool(tmp_path, template, style_engine, page_setup_engine, hf_engine):
+    report = make_report(tmp_path / "report.docx")
+    output = str(tmp_path / "out.docx")
+    word = fake_word.FakeWord()
+    with main.WordPool(factory=lambda: word) as pool:
+        assert main.transfer_layout(template, report, output, pool=pool, style_engine=style_engine,
+                                    page_setup_engine=page_setup_engine, hf_engine=hf_engine) == output
+
+    with zipfile.ZipFile(output) as z:
+        assert z.testzip() is None
+    out = docx.Document(output)
+    assert len(out.sections) == 3
+    assert [p.text for p in out.paragraphs if p.text] == [f"Report para {i}" for i in range(3)]
+
+    members = word.stats()["by_member"]
+    if not main.needs_word(style_engine, page_setup_engine, hf_engine):
+        assert members == {}
+    else:
+        assert word.quit_called
+
+    # The fake keeps COM edits in memory, so only the OpenXML stages show in the file
+    if style_engine == "openxml":
+        assert "Corp Title" in [s.name for s in out.styles]
+        assert "get NameLocal" not in members
+    else:
+        assert members.get("call OrganizerCopy")
+    if page_setup_engine == "openxml":
+        first = docx.Document(template).sections[0]
+        assert all((s.left_margin, s.gutter) == (first.left_margin, first.gutter) for s in out.sections)
+        # Nothing the OpenXML pass rewrites anyway is read or written through Word
+        assert not [m for m in members if m.split()[1] in main.PAGE_SETUP_PROPS + main.BORDERS_PROPS
+                    + main.BORDER_PROPS + ("PageSetup", "Borders")]
+    else:
+        assert members.get("set LeftMargin") == 3
+    if hf_engine == "openxml":
+        assert out.sections[0].header.paragraphs[0].text == "TEMPLATE HEADER"
+        assert out.sections[0].first_page_header.paragraphs[0].text == "FIRST HDR"
+    else:
+        assert members.get("set FormattedText") == (9 if hf_engine == "com" else 3)
+
+
+@pytest.mark.parametrize("look", [True, False])
+def test_look_is_optional(tmp_path, template, look):
+    styled = str(tmp_path / "template.docx")
+    shutil.copy(template, styled)
+    with main.DocxPackage(styled) as pkg:
+        theme = pkg.xml(THEME_PART)
+        theme.set("name", "Template Theme")
+        pkg.touch(THEME_PART)
+        pkg.commit()
+    report = make_report(tmp_path / "report.docx")
+    output = str(tmp_path / "out.docx")
+    lines = []
+    main.transfer_layout(styled, report, output, log=lines.append, look=look, style_engine="openxml",
+                         page_setup_engine="openxml", hf_engine="openxml")
+
+    with main.DocxPackage(output) as pkg:
+        assert (pkg.xml(THEME_PART).get("name") == "Template Theme") == look
+    assert any(line.startswith("[INFO] Theme ") for line in lines) == look
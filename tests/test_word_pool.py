@@ -0,0 +1,141 @@
+import threading
+
+import pytest
+
+import fake_word
+import main
+
+
+class FakePythoncom:
+    """pythoncom stand-in tracking the multithreaded apartment: it is torn down when its last thread leaves."""
+    COINIT_MULTITHREADED = 0
+
+    class com_error(Exception):
+        pass
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.members = 0
+        self.generation = 0
+
+    def mark_sta(self):
+        self._local.sta = True
+
+    def in_mta(self):
+        return getattr(self._local, "mta", False)
+
+    def CoInitializeEx(self, flags):
+        if getattr(self._local, "sta", False):
+            raise self.com_error("RPC_E_CHANGED_MODE")
+        with self._lock:
+            self.members += 1
+        self._local.mta = True
+
+    def CoUninitialize(self):
+        self._local.mta = False
+        with self._lock:
+            self.members -= 1
+            if self.members == 0:
+                self.generation += 1
+
+
+@pytest.fixture
+def com(monkeypatch):
+    com = FakePythoncom()
+    monkeypatch.setattr(main, "pythoncom", com)
+    return com
+
+
+def apartment_word_factory(com, created, quit_from):
+    class ApartmentWord(fake_word.FakeWord):
+        """A proxy that dies with the apartment it was created in."""
+
+        def __init__(self):
+            super().__init__()
+            assert com.in_mta()
+            self.__dict__["_generation"] = com.generation
+
+        @property
+        def Version(self):
+            if com.generation != self.__dict__["_generation"]:
+                raise fake_word.FakeComError("RPC_E_DISCONNECTED")
+            return "16.0"
+
+        def Quit(self, SaveChanges=0, **kwargs):
+            quit_from.append(com.in_mta())
+            super().Quit(SaveChanges, **kwargs)
+
+    def factory():
+        app = ApartmentWord()
+        created.append(app)
+        return app
+    return factory
+
+
+def _lease_in_thread(pool, seen):
+    def run():
+        with pool.lease() as word:
+            seen.append(word)
+    t = threading.Thread(target=run)
+    t.start()
+    t.join()
+
+
+def test_instance_stays_warm_across_lease_threads(com):
+    created, quit_from, seen = [], [], []
+    pool = main.WordPool(factory=apartment_word_factory(com, created, quit_from))
+    _lease_in_thread(pool, seen)
+    _lease_in_thread(pool, seen)
+    assert len(created) == 1
+    assert seen[0] is seen[1]
+    pool.close()
+    assert quit_from == [True]
+    assert com.members == 0
+
+
+def test_close_from_single_threaded_apartment(com):
+    created, quit_from, seen = [], [], []
+    pool = main.WordPool(factory=apartment_word_factory(com, created, quit_from))
+    _lease_in_thread(pool, seen)
+    com.mark_sta()  # like the GUI thread calling closeEvent
+    pool.close()
+    assert quit_from == [True]
+    assert com.members == 0
+
+
+def test_instance_leased_at_close_is_quit_on_return(com):
+    created, quit_from = [], []
+    pool = main.WordPool(factory=apartment_word_factory(com, created, quit_from))
+    leased, release = threading.Event(), threading.Event()
+
+    def run():
+        with pool.lease():
+            leased.set()
+            release.wait()
+    t = threading.Thread(target=run)
+    t.start()
+    leased.wait()
+    pool.close()
+    assert quit_from == []
+    release.set()
+    t.join()
+    assert quit_from == [True]
+    assert com.members == 0
+
+
+def test_pool_reuses_and_recycles_without_com():
+    pool = main.WordPool(factory=fake_word.FakeWord, max_jobs=2)
+    apps = []
+    for _ in range(3):
+        with pool.lease() as word:
+            apps.append(word)
+    assert apps[0] is apps[1] and apps[2] is not apps[0]
+    assert apps[0].quit_called
+    with pytest.raises(ValueError):
+        with pool.lease():
+            raise ValueError("job failed")
+    pool.close()
+    with pytest.raises(RuntimeError):
+        with pool.lease():
+            pass